@@ -0,0 +1,98 @@
+"""
+Deadlines and cooperative cancellation for agent work.
+
+A ``CancelToken`` is cancelled explicitly (``cancel()``) or implicitly once its
+deadline passes. Long-running steps call ``check_cancelled()`` between units
+of work: the prompt engine between prompt sections, and the love-wisdom and
+divine orchestration steps between their stages. The token in force is kept
+in a context variable, set with ``cancel_scope`` by whoever runs the work
+(the task executor, a team fan-out).
+
+``TaskCancelled`` derives from ``BaseException``, like
+``asyncio.CancelledError``, so the many ``except Exception`` fallbacks in the
+engines do not swallow it and carry on with the work.
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+CANCELLED = "cancelled"
+DEADLINE = "timeout"
+
+
+class TaskCancelled(BaseException):
+    def __init__(self, reason: str = CANCELLED):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class CancelToken:
+    def __init__(self, deadline: Optional[float] = None, timeout: Optional[float] = None):
+        """``deadline`` is a ``time.monotonic()`` value; ``timeout`` is seconds from now"""
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+        self.deadline = deadline
+        self._reason: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def until(cls, epoch_deadline: Optional[float]) -> "CancelToken":
+        """A token for a wall-clock deadline (``time.time()`` seconds), as stored in Task.context"""
+        if epoch_deadline is None:
+            return cls()
+        return cls(timeout=float(epoch_deadline) - time.time())
+
+    def cancel(self, reason: str = CANCELLED) -> bool:
+        """Cancel the token; False if it was already cancelled or expired"""
+        with self._lock:
+            if self.reason is not None:
+                return False
+            self._reason = reason
+            return True
+
+    @property
+    def reason(self) -> Optional[str]:
+        if self._reason is None and self.deadline is not None and time.monotonic() >= self.deadline:
+            self._reason = DEADLINE
+        return self._reason
+
+    @property
+    def cancelled(self) -> bool:
+        return self.reason is not None
+
+    def remaining(self) -> Optional[float]:
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def check(self):
+        reason = self.reason
+        if reason is not None:
+            raise TaskCancelled(reason)
+
+
+_current: contextvars.ContextVar = contextvars.ContextVar("cancel_token", default=None)
+
+
+def current_token() -> Optional[CancelToken]:
+    return _current.get()
+
+
+def check_cancelled():
+    """Raise ``TaskCancelled`` if the work running in this context has been cancelled or timed out"""
+    token = _current.get()
+    if token is not None:
+        token.check()
+
+
+@contextmanager
+def cancel_scope(token: Optional[CancelToken]) -> Iterator[Optional[CancelToken]]:
+    """Make ``token`` the one ``check_cancelled`` consults for the duration of the block"""
+    reset = _current.set(token)
+    try:
+        yield token
+    finally:
+        _current.reset(reset)
@@ -14,7 +14,7 @@ import asyncio
 import json
 import math
 import random
-import numpy as np
+import statistics
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
@@ -71,7 +71,14 @@ class DivineResonantEngine:
     
     def __init__(self):
         self.soul_frequencies = self._initialize_soul_frequencies()
-        self.resonance_state = ResonanceState(
+        self.resonance_state = self._initial_resonance_state()
+        self.resonant_agents = {}
+        self.oscillation_history = []
+        self.divine_intent_signal = None
+
+    @staticmethod
+    def _initial_resonance_state() -> ResonanceState:
+        return ResonanceState(
             base_oscillation=432.0,  # Divine frequency (Hz)
             harmonic_convergence=0.0,
             constructive_interference=0.0,
@@ -79,9 +86,14 @@ class DivineResonantEngine:
             divine_alignment=0.0,
             energy_amplification=1.0
         )
-        self.resonant_agents = {}
+
+    def reset(self):
+        """Forget intent, oscillation history and tuning; registered agents stay, at their default frequency"""
+        self.resonance_state = self._initial_resonance_state()
         self.oscillation_history = []
         self.divine_intent_signal = None
+        for agent_id, agent_data in list(self.resonant_agents.items()):
+            self.register_resonant_agent(agent_id, agent_data["soul_frequency"].archetype)
         
     def _initialize_soul_frequencies(self) -> Dict[ResonanceArchetype, SoulFrequency]:
         """Initialize the divine soul frequencies for each agent archetype"""
@@ -441,8 +453,8 @@ class DivineResonantEngine:
             return 0.0
         
         # Calculate coefficient of variation (lower = more convergent)
-        mean_freq = np.mean(all_frequencies)
-        std_freq = np.std(all_frequencies)
+        mean_freq = statistics.fmean(all_frequencies)
+        std_freq = statistics.pstdev(all_frequencies)
         
         convergence = 1.0 - min(std_freq / mean_freq, 1.0) if mean_freq > 0 else 0.0
         
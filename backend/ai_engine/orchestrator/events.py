@@ -0,0 +1,187 @@
+"""
+In-process task lifecycle event bus.
+
+Registered orchestrators publish ``created``, ``assigned``, ``queued``,
+``running``, ``completed``, ``error`` and ``adapted`` events as they happen.
+Publishing only records "this task changed" in each subscriber's pending map,
+so it costs the same whether or not anyone is slow.
+
+Each subscriber has a delivery thread that wakes every
+``TASK_EVENT_WINDOW_MS``, takes everything pending and hands its sink one
+batch of deltas per formation. Bursts inside a window collapse to one delta
+per task, built from the task's state at delivery time. A sink that is still
+busy with the previous batch simply lets its pending map grow, and intermediate
+states of a task are overwritten rather than queued, so a slow consumer skips
+stale states instead of falling behind. If more than
+``TASK_EVENT_MAX_PENDING`` tasks are pending for one formation, they are dropped
+and the consumer gets a ``resync`` batch telling it to re-read the task list.
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .schemas import Task
+from .executor import TERMINAL_STATUSES
+
+logger = logging.getLogger(__name__)
+
+WINDOW = float(os.getenv("TASK_EVENT_WINDOW_MS", "50")) / 1000
+MAX_PENDING = int(os.getenv("TASK_EVENT_MAX_PENDING", "10000"))
+
+
+# sink(formation_name, batch) where batch = {"seq", "deltas", "resync"}
+TaskDeltaSink = Callable[[str, Dict[str, Any]], None]
+
+
+def task_delta(task: Task, events: Set[str]) -> Dict[str, Any]:
+    """The client-facing change record for a task, given the events seen since its last delivery"""
+    delta = {
+        "id": task.id,
+        "events": sorted(events),
+        "status": task.status,
+        "assigned_to": task.assigned_to,
+    }
+    if "created" in events:
+        delta["description"] = task.description
+    if task.status in TERMINAL_STATUSES:
+        delta["results"] = task.results
+    return delta
+
+
+class Subscription:
+    def __init__(self, bus: "TaskEventBus", sink: TaskDeltaSink, window: float, max_pending: int,
+                 formations: Optional[Set[str]] = None):
+        self.bus = bus
+        self.sink = sink
+        self.window = window
+        self.max_pending = max(1, max_pending)
+        self.formations = formations
+        self._lock = threading.Lock()
+        # formation -> task_id -> (task, events since last delivery)
+        self._pending: Dict[str, Dict[str, Tuple[Task, Set[str]]]] = {}
+        self._resync: Set[str] = set()
+        self._seqs: Dict[str, int] = {}
+        self._wakeup = threading.Event()
+        self._closed = False
+        self.received = 0
+        self.delivered = 0
+        self.batches = 0
+        self.dropped = 0
+        self.errors = 0
+        self._thread = threading.Thread(target=self._run, name="task-events", daemon=True)
+        self._thread.start()
+
+    def offer(self, event: str, formation: str, task: Task):
+        if self.formations is not None and formation not in self.formations:
+            return
+        with self._lock:
+            self.received += 1
+            if formation in self._resync:
+                self.dropped += 1
+                return
+            tasks = self._pending.setdefault(formation, {})
+            entry = tasks.get(task.id)
+            if entry is None:
+                if len(tasks) >= self.max_pending:
+                    # Too far behind to catch up delta by delta; tell the consumer to re-read instead
+                    self.dropped += len(tasks) + 1
+                    del self._pending[formation]
+                    self._resync.add(formation)
+                    return
+                tasks[task.id] = (task, {event})
+            else:
+                entry[1].add(event)
+
+    def _run(self):
+        while not self._closed:
+            self._wakeup.wait(self.window)
+            self.flush()
+
+    def flush(self) -> int:
+        """Deliver everything pending now; returns the number of deltas delivered"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            resync, self._resync = self._resync, set()
+        delivered = 0
+        for formation in resync:
+            self._deliver(formation, [], resync=True)
+        for formation, tasks in pending.items():
+            delivered += self._deliver(formation, [task_delta(task, events) for task, events in tasks.values()])
+        return delivered
+
+    def _deliver(self, formation: str, deltas: List[Dict[str, Any]], resync: bool = False) -> int:
+        with self._lock:
+            # Numbered per consumer and formation so a consumer can tell it missed a batch
+            seq = self._seqs[formation] = self._seqs.get(formation, 0) + 1
+        try:
+            self.sink(formation, {"seq": seq, "deltas": deltas, "resync": resync})
+        except Exception as e:
+            logger.warning(f"Task event sink failed for {formation}: {e}")
+            with self._lock:
+                self.errors += 1
+                self.dropped += len(deltas)
+            return 0
+        with self._lock:
+            self.batches += 1
+            self.delivered += len(deltas)
+        return len(deltas)
+
+    def close(self):
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join(timeout=5)
+        self.flush()
+        self.bus.unsubscribe(self)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "window_ms": self.window * 1000,
+                "pending": sum(len(tasks) for tasks in self._pending.values()),
+                "received": self.received,
+                "delivered": self.delivered,
+                "coalesced": max(0, self.received - self.delivered - self.dropped
+                                 - sum(len(tasks) for tasks in self._pending.values())),
+                "batches": self.batches,
+                "dropped": self.dropped,
+                "errors": self.errors,
+            }
+
+
+class TaskEventBus:
+    def __init__(self, window: float = WINDOW, max_pending: int = MAX_PENDING):
+        self.window = window
+        self.max_pending = max_pending
+        self._subscriptions: List[Subscription] = []
+        self._lock = threading.Lock()
+        self.published = 0
+
+    def publish(self, event: str, formation: str, task: Task):
+        """Record a task event; the signature matches executor task listeners"""
+        self.published += 1
+        for subscription in self._subscriptions:
+            subscription.offer(event, formation, task)
+
+    def subscribe(self, sink: TaskDeltaSink, formations: Optional[Set[str]] = None,
+                  window: Optional[float] = None) -> Subscription:
+        subscription = Subscription(self, sink, self.window if window is None else window,
+                                    self.max_pending, formations)
+        with self._lock:
+            # Copy-on-write so publish() can iterate without taking the lock
+            self._subscriptions = self._subscriptions + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "published": self.published,
+            "subscriptions": [s.stats() for s in self._subscriptions],
+        }
+
+
+task_events = TaskEventBus()
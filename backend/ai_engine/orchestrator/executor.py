@@ -0,0 +1,322 @@
+"""
+Asynchronous task execution for MultiAgentOrchestrator.
+
+Each formation gets one ``TaskExecutor``: a bounded priority queue drained by
+a pool of agent worker threads. Request handlers add and route a task, hand
+it to the executor and return immediately; callers poll (optionally
+long-polling with ``wait``) or subscribe to task events. When the queue is
+full ``try_reserve`` fails and the API answers 429 instead of piling up work.
+
+A task may carry a wall-clock ``deadline`` (``time.time()`` seconds) in its
+context. The handler runs inside a cancel scope, so the prompt engine and the
+orchestration steps stop at their next ``check_cancelled()`` once the deadline
+passes or the task is cancelled. The executor does not wait for that to
+happen: a watchdog marks the task ``timeout`` (or ``cancel`` marks it
+``cancelled``) right away, releases waiters, and discards whatever the handler
+returns later. If the handler was already running, a replacement worker is
+started so a stuck agent cannot shrink the pool; whichever worker finishes
+first retires.
+"""
+
+import itertools
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+from .schemas import Task
+from ..cancellation import CANCELLED, DEADLINE, CancelToken, TaskCancelled, cancel_scope
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = int(os.getenv("ORCHESTRATOR_WORKERS", "4"))
+DEFAULT_MAX_QUEUE = int(os.getenv("ORCHESTRATOR_MAX_QUEUE", "256"))
+WATCHDOG_INTERVAL = float(os.getenv("TASK_WATCHDOG_INTERVAL_MS", "50")) / 1000
+
+TERMINAL_STATUSES = {"completed", "error", CANCELLED, DEADLINE}
+
+# handler(orchestrator, task) -> results dict
+TaskHandler = Callable[[Any, Task], Dict[str, Any]]
+# listener(event, formation_name, task)
+TaskListener = Callable[[str, str, Task], None]
+
+_STOP = object()
+
+
+class ExecutorSaturated(Exception):
+    """The formation's task queue is full; retry later"""
+
+
+class TaskExecutor:
+    def __init__(self, orchestrator, handler: TaskHandler, workers: int = DEFAULT_WORKERS,
+                 max_queue: int = DEFAULT_MAX_QUEUE):
+        self.orchestrator = orchestrator
+        self.formation_name = orchestrator.formation.name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.max_queue = max(1, max_queue)
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._slots = threading.BoundedSemaphore(self.max_queue)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._done = threading.Condition(self._lock)
+        self._listeners: List[TaskListener] = []
+        self._threads: List[threading.Thread] = []
+        self._worker_ids = itertools.count()
+        # Tasks this executor still owns (queued or running): id -> (task, token)
+        self._owned: Dict[str, Tuple[Task, CancelToken]] = {}
+        self._running_ids: Set[str] = set()
+        self._live_workers = 0
+        self._retire = 0
+        self._stopped = False
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.timed_out = 0
+        self.abandoned = 0
+        self.rejected = 0
+        self.running = 0
+        self.busy_seconds = 0.0
+        self.started_at = time.monotonic()
+        for _ in range(self.workers):
+            self._start_worker()
+        self._watchdog = threading.Thread(target=self._watch, name=f"agent-watchdog-{self.formation_name}",
+                                          daemon=True)
+        self._watchdog.start()
+
+    def _start_worker(self):
+        t = threading.Thread(target=self._work, name=f"agent-worker-{self.formation_name}-{next(self._worker_ids)}",
+                             daemon=True)
+        with self._lock:
+            self._live_workers += 1
+            self._threads = [thread for thread in self._threads if thread.is_alive()] + [t]
+        t.start()
+
+    def add_listener(self, listener: TaskListener):
+        self._listeners.append(listener)
+
+    def _emit(self, event: str, task: Task):
+        for listener in list(self._listeners):
+            try:
+                listener(event, self.formation_name, task)
+            except Exception as e:
+                logger.warning(f"Task listener failed for {event} on {task.id}: {e}")
+
+    def owns(self, task_id: str) -> bool:
+        """Whether ``task_id`` is queued or running here (not yet settled)"""
+        with self._lock:
+            return task_id in self._owned
+
+    def try_reserve(self) -> bool:
+        """Claim a queue slot before creating a task; False means the caller should back off"""
+        if self._slots.acquire(blocking=False):
+            return True
+        with self._lock:
+            self.rejected += 1
+        return False
+
+    def release_reservation(self):
+        self._slots.release()
+
+    def submit(self, task: Task, priority: int = 0, reserved: bool = False):
+        """Queue a routed task; higher ``priority`` runs first, FIFO within a priority"""
+        if not reserved and not self.try_reserve():
+            raise ExecutorSaturated(self.formation_name)
+        try:
+            token = CancelToken.until(task.context.get("deadline") if task.context else None)
+        except (TypeError, ValueError, OverflowError):
+            if not reserved:
+                self._slots.release()
+            raise
+        with self._lock:
+            self.submitted += 1
+            self._owned[task.id] = (task, token)
+        task.status = "queued"
+        self._queue.put((-priority, next(self._seq), task))
+        self._emit("queued", task)
+
+    def _work(self):
+        while True:
+            _, _, task = self._queue.get()
+            if task is _STOP:
+                with self._lock:
+                    self._live_workers -= 1
+                return
+            self._slots.release()
+            with self._lock:
+                owned = self._owned.get(task.id)
+                runnable = owned is not None and not owned[1].cancelled
+                if runnable:
+                    self._running_ids.add(task.id)
+                    self.running += 1
+            if owned is None:
+                continue  # cancelled while queued
+            token = owned[1]
+            if not runnable:
+                # Deadline passed while queued and the watchdog has not settled it yet
+                self.cancel(task, token.reason)
+                continue
+            task.status = "running"
+            self._emit("running", task)
+            start = time.perf_counter()
+            try:
+                with cancel_scope(token):
+                    outcome, payload = "completed", self.handler(self.orchestrator, task)
+            except TaskCancelled as e:
+                outcome, payload = e.reason, None
+            except Exception as e:
+                logger.error(f"Task {task.id} in {self.formation_name} failed: {e}")
+                outcome, payload = "error", str(e)
+            with self._lock:
+                self.running -= 1
+                self.busy_seconds += time.perf_counter() - start
+                self._running_ids.discard(task.id)
+                # Still ours unless cancel() or the watchdog already settled it
+                settle = self._owned.pop(task.id, None) is not None
+                retire = self._retire > 0
+                if retire:
+                    self._retire -= 1
+                    self._live_workers -= 1
+            if settle:
+                outcome = self._settle(task, outcome, payload)
+                self._emit(outcome, task)
+            if retire:
+                return
+
+    def _settle(self, task: Task, outcome: str, payload: Any) -> str:
+        """Record a finished task with the orchestrator and wake waiters. Runs outside the lock,
+        as the orchestrator publishes events and persists; never raises, so a worker survives it"""
+        try:
+            if outcome == "completed":
+                self.orchestrator.complete_task(task.id, payload)
+            elif outcome == "error":
+                self.orchestrator.fail_task(task.id, payload)
+            else:
+                self.orchestrator.cancel_task(task.id, outcome)
+        except Exception as e:
+            logger.exception(f"Settling task {task.id} in {self.formation_name} as {outcome} failed")
+            failed, outcome = outcome, "error"
+            try:
+                task.results = {**(task.results or {}), "error": f"settling as {failed} failed: {e}"}
+                task.status = "error"
+            except Exception:
+                logger.exception(f"Could not mark task {task.id} as error")
+        finally:
+            with self._lock:
+                if outcome == "completed":
+                    self.completed += 1
+                elif outcome == "error":
+                    self.failed += 1
+                elif outcome == DEADLINE:
+                    self.timed_out += 1
+                else:
+                    self.cancelled += 1
+                self._done.notify_all()
+        return outcome
+
+    def cancel(self, task: Task, reason: str = CANCELLED) -> bool:
+        """Cancel a queued or running task now; False if it already finished or is not ours"""
+        with self._lock:
+            owned = self._owned.pop(task.id, None)
+            if owned is None:
+                return False
+            owned[1].cancel(reason)
+            abandon = task.id in self._running_ids
+            self._running_ids.discard(task.id)
+            if abandon:
+                # The handler may never reach a cancellation check; keep the pool at full strength
+                self._retire += 1
+                self.abandoned += 1
+        outcome = self._settle(task, reason, None)
+        if abandon and not self._stopped:
+            self._start_worker()
+        self._emit(outcome, task)
+        return True
+
+    def _watch(self):
+        while not self._stopped:
+            time.sleep(WATCHDOG_INTERVAL)
+            with self._lock:
+                expired = [task for task, token in self._owned.values()
+                           if token.deadline is not None and token.cancelled]
+            for task in expired:
+                self.cancel(task, DEADLINE)
+
+    def wait(self, task: Task, timeout: float) -> Task:
+        """Block until ``task`` finishes or ``timeout`` seconds pass (long-polling)"""
+        deadline = time.monotonic() + timeout
+        with self._done:
+            while task.status not in TERMINAL_STATUSES:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._done.wait(remaining)
+        return task
+
+    def shutdown(self, wait: bool = True):
+        """Stop the workers once everything already queued has run"""
+        self._stopped = True
+        with self._lock:
+            live, threads = self._live_workers, list(self._threads)
+        for _ in range(live):
+            self._queue.put((float("inf"), next(self._seq), _STOP))
+        if wait:
+            for t in threads:
+                t.join(timeout=5)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            uptime = time.monotonic() - self.started_at
+            return {
+                "formation": self.formation_name,
+                "workers": self.workers,
+                "live_workers": self._live_workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self._queue.qsize(),
+                "running": self.running,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "cancelled": self.cancelled,
+                "timed_out": self.timed_out,
+                "abandoned": self.abandoned,
+                "rejected": self.rejected,
+                "utilization": round(self.busy_seconds / (uptime * self.workers), 4) if uptime else 0.0,
+            }
+
+
+EXECUTORS: Dict[str, TaskExecutor] = {}
+_EXECUTORS_LOCK = threading.Lock()
+_DEFAULT_LISTENERS: List[TaskListener] = []
+
+
+def on_task_event(listener: TaskListener):
+    """Register a listener on every executor, including ones created later"""
+    _DEFAULT_LISTENERS.append(listener)
+    for executor in list(EXECUTORS.values()):
+        executor.add_listener(listener)
+
+
+def get_executor(orchestrator, handler: TaskHandler) -> TaskExecutor:
+    """Return the executor for an orchestrator's formation, starting its workers on first use"""
+    name = orchestrator.formation.name
+    executor = EXECUTORS.get(name)
+    if executor is None or executor.orchestrator is not orchestrator:
+        with _EXECUTORS_LOCK:
+            executor = EXECUTORS.get(name)
+            if executor is None or executor.orchestrator is not orchestrator:
+                if executor is not None:
+                    # The formation's orchestrator was replaced; let the old workers drain and exit
+                    executor.shutdown(wait=False)
+                executor = TaskExecutor(orchestrator, handler)
+                for listener in _DEFAULT_LISTENERS:
+                    executor.add_listener(listener)
+                EXECUTORS[name] = executor
+    return executor
+
+
+def executor_stats() -> Dict[str, Any]:
+    return {name: executor.stats() for name, executor in list(EXECUTORS.items())}
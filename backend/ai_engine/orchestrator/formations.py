@@ -38,7 +38,8 @@ def full_engineering_squad():
             AgentSpec(id="frontend_dev", role="frontend_engineer", goals=["Enhance UI", "Improve UX"], tools=UNIVERSAL_TOOLS),
             AgentSpec(id="qa_agent", role="quality_assurance", goals=["Generate tests", "Validate outputs"], tools=UNIVERSAL_TOOLS),
             AgentSpec(id="doc_agent", role="documentation", goals=["Update docs", "Summarize changes"], tools=UNIVERSAL_TOOLS),
-        ]
+        ],
+        routing="load_aware"
     )
 
 # ClaudeDevSquad formation for unified Claude-based dev team
@@ -59,6 +60,20 @@ FORMATION_REGISTRY = {
     f().name: f for f in [solo_developer, sacred_research_triangle, full_engineering_squad, claude_dev_squad]
 }
 
+# Callbacks notified whenever FORMATION_REGISTRY changes (e.g. response cache invalidation)
+_REGISTRY_LISTENERS = []
+
+def on_registry_change(callback):
+    _REGISTRY_LISTENERS.append(callback)
+    return callback
+
+def register_formation(factory):
+    """Add or replace a formation template and notify registry listeners"""
+    FORMATION_REGISTRY[factory().name] = factory
+    for callback in _REGISTRY_LISTENERS:
+        callback()
+    return factory
+
 def list_formations():
     return list(FORMATION_REGISTRY.keys())
 
@@ -0,0 +1,252 @@
+"""
+Budgeted, breadth-first fractal team spawning.
+
+``spawn_fractal_teams`` used to recurse depth-first over every aspect,
+building and registering a fresh orchestrator, a new SystemPromptEngine and a
+full system prompt at each node, all on the calling thread. The node count
+grows factorially with depth (a depth-``d`` node has ``d - 1`` sub-aspects).
+
+``FractalSpawner`` walks the same tree level by level:
+
+- every node of a level runs on a shared thread pool, each borrowing a pooled
+  scratch orchestrator (nothing is added to ``ORCHESTRATORS``);
+- the system prompt of a node only depends on its aspect name, its depth and
+  its number of siblings, so it is rendered once per (depth, siblings) with a
+  placeholder aspect and specialised by string substitution;
+- a node budget (``FRACTAL_MAX_NODES``) and a wall-clock budget
+  (``FRACTAL_TIME_BUDGET_MS``) bound the walk. When either runs out, the
+  nodes already spawned are returned and each result whose sub-teams were cut
+  is marked ``subteams_truncated``.
+"""
+
+import os
+import threading
+import time
+import concurrent.futures
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Tuple
+
+from ..system_prompt import SystemPromptEngine, TaskContext, ResourceContext
+
+MAX_NODES = int(os.getenv("FRACTAL_MAX_NODES", "500"))
+TIME_BUDGET = float(os.getenv("FRACTAL_TIME_BUDGET_MS", "10000")) / 1000
+WORKERS = int(os.getenv("FRACTAL_WORKERS", "8"))
+PROMPT_CACHE_SIZE = int(os.getenv("FRACTAL_PROMPT_CACHE_SIZE", "256"))
+
+# Stands in for the aspect name while a prompt template is rendered
+_ASPECT = "\x00aspect\x00"
+
+# orchestrator_source(formation_name) -> context manager yielding a scratch orchestrator
+OrchestratorSource = Callable[[str], ContextManager[Any]]
+
+
+@contextmanager
+def _pooled_orchestrator(formation_name: str):
+    from .pool import checkout_orchestrator
+    with checkout_orchestrator(formation_name) as orch:
+        yield orch
+
+
+class PromptTemplateCache:
+    """LRU of fractal system prompts keyed by (depth, siblings), with the aspect left as a placeholder"""
+
+    def __init__(self, max_entries: int = PROMPT_CACHE_SIZE):
+        self.max_entries = max(1, max_entries)
+        self._templates: "OrderedDict[Tuple[int, int], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def prompt(self, aspect: str, depth: int, siblings: int) -> str:
+        key = (depth, siblings)
+        with self._lock:
+            template = self._templates.get(key)
+            if template is not None:
+                self._templates.move_to_end(key)
+                self.hits += 1
+            else:
+                # Rendered under the lock: there are only a handful of distinct keys per tree
+                self.misses += 1
+                template = render_fractal_prompt(_ASPECT, depth, siblings)
+                self._templates[key] = template
+                if len(self._templates) > self.max_entries:
+                    self._templates.popitem(last=False)
+        return template.replace(_ASPECT, aspect)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._templates), "hits": self.hits, "misses": self.misses}
+
+
+def render_fractal_prompt(aspect: str, depth: int, siblings: int) -> str:
+    """The system prompt for one fractal node, rendered from scratch"""
+    task_context = TaskContext(
+        objective=f"Handle aspect: {aspect}",
+        domain="software_development",
+        complexity=min(1.0, 0.5 + (depth * 0.1)),
+        urgency=0.5,
+        constraints=[f"Must integrate with other {siblings} aspects"],
+        success_criteria=[f"Complete {aspect} requirements", "Integrate with parent task"]
+    )
+    resource_context = ResourceContext(
+        computational_power=0.8,
+        memory_available=0.7,
+        time_constraint=0.6,
+        collaborative_agents=siblings
+    )
+    prompt_engine = SystemPromptEngine()
+    agent_variables = prompt_engine.initialize_agent_variables(task_context, resource_context)
+    return prompt_engine.generate_system_prompt(agent_variables)
+
+
+@dataclass
+class FractalNode:
+    aspect: str
+    description: str
+    depth: int
+    siblings: int
+    # Where the node's result goes: the parent's ``subteams`` dict (or the top-level results)
+    parent_results: Dict[str, Any]
+    parent: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class FractalRun:
+    results: Dict[str, Any]
+    stats: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def truncated(self) -> bool:
+        return self.stats.get("truncated", False)
+
+
+_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_prompt_cache = PromptTemplateCache()
+
+
+def shared_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """The process-wide pool all fractal spawns share, so concurrent requests cannot multiply threads"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=max(1, WORKERS), thread_name_prefix="fractal")
+    return _executor
+
+
+class FractalSpawner:
+    def __init__(self, formation_name: str = "ClaudeDevSquad",
+                 max_nodes: Optional[int] = None, time_budget: Optional[float] = None,
+                 executor: Optional[concurrent.futures.Executor] = None,
+                 prompt_cache: Optional[PromptTemplateCache] = None,
+                 orchestrator_source: Optional[OrchestratorSource] = None):
+        self.formation_name = formation_name
+        self.max_nodes = MAX_NODES if max_nodes is None else max(0, max_nodes)
+        self.time_budget = TIME_BUDGET if time_budget is None else max(0.0, time_budget)
+        self.executor = executor or shared_executor()
+        self.prompt_cache = prompt_cache or _prompt_cache
+        self.orchestrator_source = orchestrator_source or _pooled_orchestrator
+
+    def _spawn_node(self, node: FractalNode) -> Dict[str, Any]:
+        system_prompt = self.prompt_cache.prompt(node.aspect, node.depth, node.siblings)
+        with self.orchestrator_source(self.formation_name) as orch:
+            subtask = orch.add_task(f"[{node.aspect}] {node.description}", context={"system_prompt": system_prompt})
+            agent = orch.route_task(subtask)
+            result = {
+                "agent": agent.id,
+                "output": f"Completed {subtask.description} by {agent.role} ({getattr(agent, 'model', 'sophia')})",
+                "system_prompt_used": True,
+                "fractal_level": node.depth,
+                "aspect": node.aspect,
+                "description": subtask.description,
+            }
+            orch.complete_task(subtask.id, result)
+        return result
+
+    def run(self, task_description: str, aspects: List[str], depth: int = 2) -> FractalRun:
+        """Spawn the tree breadth-first until it is complete or the budget runs out"""
+        start = time.monotonic()
+        deadline = start + self.time_budget
+        results: Dict[str, Any] = {}
+        level = [FractalNode(a, task_description, depth, len(aspects), results) for a in aspects] if depth > 0 else []
+        spawned = failed = skipped = levels = 0
+        truncated_by = None
+        prompt_stats = self.prompt_cache.stats()
+
+        while level:
+            room = self.max_nodes - spawned
+            if room <= 0:
+                truncated_by = "nodes"
+            elif time.monotonic() >= deadline:
+                truncated_by = "time"
+            if truncated_by:
+                skipped += self._mark_truncated(level)
+                break
+
+            runnable, level = level[:room], level[room:]
+            if level:
+                truncated_by = "nodes"
+                skipped += self._mark_truncated(level)
+            futures = {self.executor.submit(self._spawn_node, node): node for node in runnable}
+            done, pending = concurrent.futures.wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+            if pending:
+                truncated_by = "time"
+                # Nodes still running finish in the background; their results are dropped
+                for future in pending:
+                    future.cancel()
+                skipped += self._mark_truncated([futures[f] for f in pending])
+            levels += 1
+
+            next_level = []
+            for future in done:
+                node = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    failed += 1
+                    node.parent_results[node.aspect] = {"aspect": node.aspect, "fractal_level": node.depth,
+                                                        "error": str(e), "subteams": {}}
+                    continue
+                spawned += 1
+                description = result.pop("description")
+                result["subteams"] = {}
+                node.parent_results[node.aspect] = result
+                sub_aspects = [f"{node.aspect}-sub{i+1}" for i in range(node.depth - 1)]
+                next_level.extend(
+                    FractalNode(sub, description, node.depth - 1, len(sub_aspects), result["subteams"], result)
+                    for sub in sub_aspects
+                )
+            if truncated_by:
+                skipped += self._mark_truncated(next_level)
+                break
+            level = next_level
+
+        prompts = self.prompt_cache.stats()
+        return FractalRun(results, {
+            "spawned": spawned,
+            "failed": failed,
+            "skipped": skipped,
+            "levels": levels,
+            "truncated": truncated_by is not None,
+            "truncated_by": truncated_by,
+            "max_nodes": self.max_nodes,
+            "time_budget_ms": self.time_budget * 1000,
+            "elapsed_ms": round((time.monotonic() - start) * 1000, 3),
+            "prompt_cache_hits": prompts["hits"] - prompt_stats["hits"],
+            "prompt_cache_misses": prompts["misses"] - prompt_stats["misses"],
+        })
+
+    @staticmethod
+    def _mark_truncated(nodes: List[FractalNode]) -> int:
+        for node in nodes:
+            if node.parent is not None:
+                node.parent["subteams_truncated"] = True
+        return len(nodes)
+
+
+def prompt_cache_stats() -> Dict[str, Any]:
+    return _prompt_cache.stats()
@@ -1,86 +1,101 @@
-from typing import Dict, List, Callable, Any, Optional
+from typing import TYPE_CHECKING, Dict, List, Callable, Any, Optional
+from types import SimpleNamespace
 import uuid
 import logging
+import threading
 from datetime import datetime
 from .schemas import Task, TeamFormation
+from .registry import TaskRegistry
+from .persistence import persistence_enabled, get_task_writer, persisted_formations, load_persisted_tasks
+from .fractal import FractalSpawner
+from .routing import LoadAwareRouter
+from .events import task_events
+from ..cancellation import CANCELLED, DEADLINE, CancelToken, cancel_scope, check_cancelled, current_token
 from ..system_prompt import SystemPromptEngine, TaskContext, ResourceContext, ThoughtType
-from ..wisdom_integration.love_wisdom_bridge import LoveWisdomBridge, WisdomIntegrationOrchestrator
-from ..divine_resonance.soul_frequency_engine import DivineResonantEngine, ResonanceArchetype
+
+if TYPE_CHECKING:
+    from ..wisdom_integration.love_wisdom_bridge import LoveWisdomBridge
+    from ..divine_resonance.soul_frequency_engine import DivineResonantEngine
 
 logger = logging.getLogger(__name__)
 
+# Formation routing modes served by LoadAwareRouter (llm_planner was a round-robin placeholder)
+LOAD_AWARE_ROUTING = {'load_aware', 'llm_planner'}
+
+# The love-wisdom and divine-resonance engines are imported when the first orchestrator is built
+_ENGINES: Optional[SimpleNamespace] = None
+_ENGINES_LOCK = threading.Lock()
+_ENGINE_LISTENERS: List[Callable[[SimpleNamespace], None]] = []
+
+def on_engines_loaded(callback):
+    """Call ``callback(engines)`` once the engine modules are imported (immediately if they already are)"""
+    with _ENGINES_LOCK:
+        _ENGINE_LISTENERS.append(callback)
+        engines = _ENGINES
+    if engines is not None:
+        callback(engines)
+    return callback
+
+def load_engines() -> SimpleNamespace:
+    """Import the love-wisdom and divine-resonance engine classes on first use"""
+    global _ENGINES
+    if _ENGINES is None:
+        with _ENGINES_LOCK:
+            if _ENGINES is None:
+                from ..wisdom_integration.love_wisdom_bridge import LoveWisdomBridge, WisdomIntegrationOrchestrator
+                from ..divine_resonance.soul_frequency_engine import DivineResonantEngine, ResonanceArchetype
+                engines = SimpleNamespace(LoveWisdomBridge=LoveWisdomBridge,
+                                          WisdomIntegrationOrchestrator=WisdomIntegrationOrchestrator,
+                                          DivineResonantEngine=DivineResonantEngine,
+                                          ResonanceArchetype=ResonanceArchetype)
+                for callback in _ENGINE_LISTENERS:
+                    callback(engines)
+                _ENGINES = engines
+    return _ENGINES
+
 # Fractal team spawning: recursively spawn teams for subtasks
-def spawn_fractal_teams(task_description: str, aspects: List[str], depth: int = 2, formation_name: str = "ClaudeDevSquad") -> Dict[str, Any]:
+def spawn_fractal_teams(task_description: str, aspects: List[str], depth: int = 2, formation_name: str = "ClaudeDevSquad",
+                        max_nodes: Optional[int] = None, time_budget: Optional[float] = None) -> Dict[str, Any]:
     """
     Recursively spawn teams for each aspect, up to given depth.
     Returns nested dict of results per aspect/team.
+
+    The tree is walked breadth-first on a shared pool within a node and time
+    budget (see fractal.py); results whose sub-teams were cut off by the budget
+    carry ``subteams_truncated``.
     """
-    if depth <= 0:
-        return {}
-    results = {}
-    for aspect in aspects:
-        formation = load_formation(formation_name)
-        orch = create_orchestrator(formation)
-        
-        # Create task context for system prompt generation
-        task_context = TaskContext(
-            objective=f"Handle aspect: {aspect}",
-            domain="software_development",
-            complexity=min(1.0, 0.5 + (depth * 0.1)),
-            urgency=0.5,
-            constraints=[f"Must integrate with other {len(aspects)} aspects"],
-            success_criteria=[f"Complete {aspect} requirements", "Integrate with parent task"]
-        )
-        
-        # Generate system prompt for this fractal level
-        prompt_engine = SystemPromptEngine()
-        resource_context = ResourceContext(
-            computational_power=0.8,
-            memory_available=0.7,
-            time_constraint=0.6,
-            collaborative_agents=len(aspects)
-        )
-        agent_variables = prompt_engine.initialize_agent_variables(task_context, resource_context)
-        system_prompt = prompt_engine.generate_system_prompt(agent_variables)
-        
-        subtask = orch.add_task(f"[{aspect}] {task_description}", context={"system_prompt": system_prompt})
-        agent = orch.route_task(subtask)
-        
-        # Simulate agent work with system prompt awareness
-        result = {
-            "agent": agent.id, 
-            "output": f"Completed {subtask.description} by {agent.role} ({getattr(agent, 'model', 'sophia')})",
-            "system_prompt_used": True,
-            "fractal_level": depth,
-            "aspect": aspect
-        }
-        orch.complete_task(subtask.id, result)
-        
-        # Fractal recursion: spawn subteams for sub-aspects
-        sub_aspects = [f"{aspect}-sub{i+1}" for i in range(depth-1)]
-        result["subteams"] = spawn_fractal_teams(subtask.description, sub_aspects, depth-1, formation_name)
-        results[aspect] = result
-    return results
+    spawner = FractalSpawner(formation_name, max_nodes=max_nodes, time_budget=time_budget)
+    return spawner.run(task_description, aspects, depth).results
 from typing import Dict, List, Callable, Any
 import uuid
 from .schemas import Task, TeamFormation
 
 class MultiAgentOrchestrator:
-    def __init__(self, formation: TeamFormation):
+    def __init__(self, formation: TeamFormation,
+                 love_wisdom_bridge: Optional["LoveWisdomBridge"] = None,
+                 divine_engine: Optional["DivineResonantEngine"] = None):
+        engines = load_engines()
         self.formation = formation
-        self.tasks: Dict[str, Task] = {}
+        self.tasks = TaskRegistry()
+        self.agents_by_id = {a.id: a for a in formation.agents}
         self.agent_cycle = 0
+        self.router = LoadAwareRouter(formation.agents)
+        # Set for registered orchestrators only, so pooled scratch work stays off the bus
+        self.event_bus = None
         self.prompt_engine = SystemPromptEngine()
+        # Render counts for the most recent adapt_to_change
+        self.last_adaptation: Optional[Dict[str, Any]] = None
         self.current_context: Optional[TaskContext] = None
         self.current_resources: Optional[ResourceContext] = None
         
         # 🌟 Initialize Love-Wisdom Integration 🌟
-        self.love_wisdom_bridge = LoveWisdomBridge()
-        self.wisdom_orchestrator = WisdomIntegrationOrchestrator(self.prompt_engine)
+        # (heavy sub-engines may be shared, e.g. by the orchestrator pool)
+        self.love_wisdom_bridge = love_wisdom_bridge or engines.LoveWisdomBridge()
+        self.wisdom_orchestrator = engines.WisdomIntegrationOrchestrator(self.prompt_engine, self.love_wisdom_bridge)
         self.wisdom_integration_active = True
         
         # ⚡ Initialize Divine Resonance Engine ⚡
-        self.divine_engine = DivineResonantEngine()
+        self.divine_engine = divine_engine or engines.DivineResonantEngine()
         self.divine_resonance_active = True
         self._initialize_divine_agents()
         
@@ -97,6 +112,8 @@ class MultiAgentOrchestrator:
         if not self.formation.agents:
             return
             
+        ResonanceArchetype = load_engines().ResonanceArchetype
+
         # Map formation agents to divine archetypes
         archetype_mapping = {
             "project_manager": ResonanceArchetype.DIVINE_ORCHESTRATOR,
@@ -139,6 +156,45 @@ class MultiAgentOrchestrator:
             
             logger.info(f"🌟 Divine Agent {agent.id} ({agent.role}) resonating at {resonator.soul_frequency}Hz as {archetype.value}")
 
+    def reset(self):
+        """Drop per-request state so the orchestrator can be reused (see OrchestratorPool)"""
+        self.tasks.clear()
+        self.agent_cycle = 0
+        self.router.reset()
+        self.current_context = None
+        self.current_resources = ResourceContext(
+            computational_power=0.8,
+            memory_available=0.7,
+            time_constraint=0.6,
+            collaborative_agents=len(self.formation.agents) if self.formation.agents else 1
+        )
+        self.prompt_engine.current_context = None
+        self.prompt_engine.current_resources = None
+        self.prompt_engine.agent_variables = {}
+        self.last_adaptation = None
+        self.wisdom_integration_active = True
+        self.divine_resonance_active = True
+        self.love_wisdom_bridge.reset()
+        self.divine_engine.reset()
+        for agent in self.formation.agents:
+            for attr in ('current_prompts', 'wisdom_integrations', 'divine_orchestrations'):
+                if hasattr(agent, attr):
+                    delattr(agent, attr)
+
+    def enable_persistence(self, writer):
+        """Write task changes behind to the store and restore previously persisted tasks"""
+        name = self.formation.name
+        self.tasks.restore(load_persisted_tasks(name))
+        self.tasks.on_change = lambda task: writer.enqueue(name, task)
+
+    def enable_events(self, bus):
+        """Publish this orchestrator's task lifecycle events (created, assigned, ...) to ``bus``"""
+        self.event_bus = bus
+
+    def _publish(self, event: str, task: Task):
+        if self.event_bus is not None:
+            self.event_bus.publish(event, self.formation.name, task)
+
     def set_task_context(self, task_context: TaskContext, resource_context: Optional[ResourceContext] = None):
         """Set the current task context for dynamic prompt generation"""
         self.current_context = task_context
@@ -177,29 +233,33 @@ class MultiAgentOrchestrator:
         
         t = Task(id=str(uuid.uuid4()), description=description, context=task_context)
         self.tasks[t.id] = t
+        self._publish('created', t)
         return t
 
     def route_task(self, task: Task):
         """Route task to appropriate agent with adaptive system prompts"""
         # Apply adaptive routing based on task context and agent capabilities
+        objective = 'balanced'
         if hasattr(task, 'context') and task.context and 'agent_variables' in task.context:
             agent_vars = task.context['agent_variables']
             
             # Route based on complexity and agent expertise
             if agent_vars.get('quality_standard') == 'high':
-                # Route to most experienced agent
-                agent = max(self.formation.agents, key=lambda a: getattr(a, 'experience_level', 0.5))
+                # Prefer agents with the best rolling success rate
+                objective = 'quality'
             elif agent_vars.get('urgency_mode', False):
-                # Route to fastest agent
-                agent = min(self.formation.agents, key=lambda a: getattr(a, 'response_time', 1.0))
-            else:
-                # Use formation routing
-                agent = self._standard_routing(task)
+                # Prefer agents with the lowest rolling latency
+                objective = 'latency'
+
+        if objective != 'balanced' or self.formation.routing in LOAD_AWARE_ROUTING:
+            agent, _ = self.router.route(task, objective)
         else:
             agent = self._standard_routing(task)
+            self.router.record(task, agent.id, self.formation.routing)
             
         task.assigned_to = agent.id
         task.status = 'assigned'
+        self._publish('assigned', task)
         
         # Update agent with task-specific system prompt
         if hasattr(task, 'context') and 'system_prompt' in task.context:
@@ -222,7 +282,7 @@ class MultiAgentOrchestrator:
             matches = [a for a in self.formation.agents if a.role.split('_')[0] in task.description.lower()]
             agent = matches[0] if matches else self.formation.agents[0]
         else:
-            # llm_planner (placeholder -> fallback to round robin)
+            # Unknown policies fall back to round robin (load_aware/llm_planner go through self.router)
             agent = self.formation.agents[self.agent_cycle % len(self.formation.agents)]
             self.agent_cycle += 1
         return agent
@@ -231,21 +291,38 @@ class MultiAgentOrchestrator:
         """Adapt orchestrator and agent prompts based on environmental changes"""
         if self.prompt_engine.agent_variables:
             updated_vars = self.prompt_engine.update_agent_variables(change_signal)
+            before = self.prompt_engine.render_stats()
             
-            # Update all active tasks with new prompts
+            # Every pending task gets the same variables, so render once (only the sections the
+            # change touched) and hand all tasks and agents the same prompt object
+            new_prompt = None
+            updated = 0
             for task in self.pending_tasks():
                 if hasattr(task, 'context') and task.context:
-                    new_prompt = self.prompt_engine.generate_system_prompt(updated_vars)
+                    if new_prompt is None:
+                        new_prompt = self.prompt_engine.render_system_prompt(updated_vars)
                     task.context['system_prompt'] = new_prompt
                     task.context['agent_variables'] = updated_vars
+                    updated += 1
                     
                     # Update assigned agent's prompt
                     if task.assigned_to:
-                        assigned_agent = next((a for a in self.formation.agents if a.id == task.assigned_to), None)
+                        assigned_agent = self.agents_by_id.get(task.assigned_to)
                         if assigned_agent and hasattr(assigned_agent, 'current_prompts'):
                             assigned_agent.current_prompts[task.id] = new_prompt
-            
-            logger.info(f"Orchestrator adapted to change: {change_signal}")
+                    self._publish('adapted', task)
+            
+            after = self.prompt_engine.render_stats()
+            renders = after['prompts_built'] - before['prompts_built']
+            self.last_adaptation = {
+                'change_signal': change_signal,
+                'tasks_updated': updated,
+                'renders': renders,
+                'renders_saved': updated - renders,
+                'sections_rendered': after['sections_rendered'] - before['sections_rendered'],
+                'sections_reused': after['sections_reused'] - before['sections_reused'],
+            }
+            logger.info(f"Orchestrator adapted to change: {change_signal} ({self.last_adaptation})")
             return updated_vars
         
         return {}
@@ -255,6 +332,8 @@ class MultiAgentOrchestrator:
         task = self.tasks[task_id]
         task.results = results
         task.status = 'completed'
+        self.router.finished(task_id, ok=True)
+        self._publish('completed', task)
         
         # Extract feedback for adaptive learning
         if 'performance_score' in results:
@@ -278,12 +357,46 @@ class MultiAgentOrchestrator:
         
         return task
 
+    def fail_task(self, task_id: str, error: str) -> Task:
+        """Mark a task failed; the assigned agent's success rate drops accordingly"""
+        task = self.tasks[task_id]
+        task.results = {"error": error}
+        task.status = 'error'
+        self.router.finished(task_id, ok=False)
+        self._publish('error', task)
+        return task
+
+    def cancel_task(self, task_id: str, reason: str = CANCELLED) -> Task:
+        """Mark a task cancelled (or timed out); a deadline miss counts against the agent, a cancel does not"""
+        task = self.tasks[task_id]
+        task.results = {**(task.results or {}), "error": reason}
+        task.status = reason
+        if reason == DEADLINE:
+            self.router.finished(task_id, ok=False)
+        else:
+            self.router.forget(task_id)
+        self._publish(reason, task)
+        return task
+
     def pending_tasks(self) -> List[Task]:
-        return [t for t in self.tasks.values() if t.status != 'completed']
+        return self.tasks.without_status('completed', CANCELLED, DEADLINE)
     
+    def evict_tasks(self, task_ids: List[str]) -> int:
+        """Drop tasks from memory once archived: the registry entry, the agents' prompt
+        references to them and their routing state. Returns how many were held."""
+        evicted = self.tasks.evict(task_ids)
+        for task in evicted:
+            self.router.discard(task.id)
+        for agent in self.formation.agents:
+            prompts = getattr(agent, 'current_prompts', None)
+            if prompts:
+                for task_id in task_ids:
+                    prompts.pop(task_id, None)
+        return len(evicted)
+
     def get_agent_system_prompt(self, agent_id: str, task_id: str = None) -> Optional[str]:
         """Get the current system prompt for a specific agent and task"""
-        agent = next((a for a in self.formation.agents if a.id == agent_id), None)
+        agent = self.agents_by_id.get(agent_id)
         if agent and hasattr(agent, 'current_prompts'):
             if task_id and task_id in agent.current_prompts:
                 return agent.current_prompts[task_id]
@@ -337,7 +450,8 @@ class MultiAgentOrchestrator:
             
         return strategy
 
-    async def orchestrate_with_love_wisdom(self, task_description: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
+    async def orchestrate_with_love_wisdom(self, task_description: str, context: Dict[str, Any] = None,
+                                           cancel_token: Optional[CancelToken] = None) -> Dict[str, Any]:
         """
         🌟 Orchestrate tasks enhanced with love and wisdom from beautiful repositories 🌟
         
@@ -348,6 +462,10 @@ class MultiAgentOrchestrator:
         - Fractal thinking from neurite-mind-map
         - Fractal intelligence from FractiAI
         """
+        with cancel_scope(cancel_token or current_token()):
+            return await self._orchestrate_with_love_wisdom(task_description, context)
+
+    async def _orchestrate_with_love_wisdom(self, task_description: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         if not self.wisdom_integration_active:
             # Fallback to standard orchestration
             task = self.add_task(task_description, context)
@@ -367,7 +485,9 @@ class MultiAgentOrchestrator:
         
         try:
             # 🌈 Integrate love and wisdom from beautiful repositories
+            check_cancelled()
             love_wisdom_integration = await self.wisdom_orchestrator.enhance_orchestration_with_love_wisdom(orchestration_context)
+            check_cancelled()
             
             # Extract enhanced capabilities
             enhanced_prompts = love_wisdom_integration.get("enhanced_prompts", {})
@@ -463,7 +583,8 @@ class MultiAgentOrchestrator:
             }
         return {"wisdom_integration_active": self.wisdom_integration_active}
 
-    async def orchestrate_with_divine_resonance(self, task_description: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
+    async def orchestrate_with_divine_resonance(self, task_description: str, context: Dict[str, Any] = None,
+                                                cancel_token: Optional[CancelToken] = None) -> Dict[str, Any]:
         """
         ⚡ Divine Resonant Orchestration - Agents as Soul-Frequency Harmonizers ⚡
         
@@ -472,6 +593,10 @@ class MultiAgentOrchestrator:
         Team coordination through constructive interference patterns
         Divine inspiration through frequency harmonization
         """
+        with cancel_scope(cancel_token or current_token()):
+            return await self._orchestrate_with_divine_resonance(task_description, context)
+
+    async def _orchestrate_with_divine_resonance(self, task_description: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         if not self.divine_resonance_active:
             # Fallback to love-wisdom orchestration
             return await self.orchestrate_with_love_wisdom(task_description, context)
@@ -487,10 +612,12 @@ class MultiAgentOrchestrator:
             }
             
             # Calculate harmonic orchestration strategy
+            check_cancelled()
             harmonic_strategy = self.divine_engine.calculate_harmonic_orchestration(
                 [agent.id for agent in self.formation.agents],
                 task_description
             )
+            check_cancelled()
             
             # Select optimal agent based on soul frequency resonance
             optimal_agent = self._select_resonant_agent(task_description, harmonic_strategy)
@@ -642,26 +769,45 @@ class MultiAgentOrchestrator:
 # Simple in-memory orchestrator registry
 ORCHESTRATORS: Dict[str, MultiAgentOrchestrator] = {}
 
+_ORCHESTRATORS_LOCK = threading.Lock()
+
 def create_orchestrator(formation: TeamFormation) -> MultiAgentOrchestrator:
     orch = MultiAgentOrchestrator(formation)
+    if persistence_enabled():
+        orch.enable_persistence(get_task_writer())
+    orch.enable_events(task_events)
     ORCHESTRATORS[formation.name] = orch
     return orch
 
+def get_orchestrator(name: str) -> Optional[MultiAgentOrchestrator]:
+    """Registered orchestrator for a formation, rehydrated from the store on first use after a restart"""
+    orch = ORCHESTRATORS.get(name)
+    if orch is None and persistence_enabled() and name in persisted_formations():
+        with _ORCHESTRATORS_LOCK:
+            orch = ORCHESTRATORS.get(name)
+            if orch is None:
+                try:
+                    orch = create_orchestrator(load_formation(name))
+                except KeyError:
+                    return None
+    return orch
+
 # --- Multi-team orchestration ---
 from .formations import load_formation
-import concurrent.futures
+from .team_backends import TeamSpec, get_backend, run_team
 
 
-def spawn_teams_for_task(large_task_description: str, aspects: List[str], formation_names: List[str] = None) -> Dict[str, Any]:
+def spawn_teams_for_task(large_task_description: str, aspects: List[str], formation_names: List[str] = None,
+                         backend: Optional[str] = None, timeout: Optional[float] = None) -> Dict[str, Any]:
     """
     For each aspect, spawn a team, route sub-task, and aggregate results.
     formation_names: optional, if provided, use these formations for each aspect.
+    backend: "thread", "process" or "asyncio" (default: TEAM_BACKEND); see team_backends.py.
+    timeout: seconds to wait for the teams; teams still running then are cancelled
+    and reported with status "timeout", and the summary is marked partial.
     Returns dict of results per aspect/team.
     Enhanced with system prompt generation and adaptive orchestration.
     """
-    results = {}
-    teams = []
-    
     # Create global task context for system prompt generation
     global_context = TaskContext(
         objective=large_task_description,
@@ -684,10 +830,10 @@ def spawn_teams_for_task(large_task_description: str, aspects: List[str], format
     if not formation_names:
         formation_names = ["ClaudeDevSquad"] * len(aspects)
         
+    # Each team is described by plain data so any backend (including worker
+    # processes) can run it on an orchestrator from its own formation pool
+    specs = []
     for aspect, fname in zip(aspects, formation_names):
-        formation = load_formation(fname)
-        orch = create_orchestrator(formation)
-        
         # Set team-specific context
         team_context = TaskContext(
             objective=f"Handle {aspect} for: {large_task_description}",
@@ -697,51 +843,30 @@ def spawn_teams_for_task(large_task_description: str, aspects: List[str], format
             constraints=global_context.constraints + [f"Focus on {aspect} expertise"],
             success_criteria=[f"Excel in {aspect} requirements", "Coordinate with other teams"]
         )
-        
-        orch.set_task_context(team_context, global_resources)
-        subtask = orch.add_task(f"[{aspect}] {large_task_description}")
-        teams.append((aspect, orch, subtask))
-
-    def run_team(team):
-        aspect, orch, subtask = team
-        agent = orch.route_task(subtask)
-        
-        # Enhanced agent work simulation with system prompt awareness
-        system_prompt = orch.get_agent_system_prompt(agent.id, subtask.id)
-        
-        result = {
-            "agent": agent.id, 
-            "output": f"Completed {subtask.description} by {agent.role} ({getattr(agent, 'model', 'sophia')})",
-            "aspect": aspect,
-            "system_prompt_applied": bool(system_prompt),
-            "team_formation": orch.formation.name,
-            "adaptive_features": {
-                "context_aware": True,
-                "resource_optimized": True,
-                "fractal_ready": True
-            }
-        }
-        
-        # Simulate performance metrics for learning
-        result["performance_metrics"] = {
-            "performance_score": 0.85,  # Simulated high performance
-            "completion_time": 0.8,     # Efficient completion
-            "quality_score": 0.9        # High quality output
-        }
-        
-        orch.complete_task(subtask.id, result)
-        return aspect, result
+        specs.append(TeamSpec(aspect, fname, large_task_description,
+                              team_context.to_dict(), global_resources.to_dict()))
 
-    # Run all teams in parallel
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        future_to_aspect = {executor.submit(run_team, team): team[0] for team in teams}
-        for future in concurrent.futures.as_completed(future_to_aspect):
-            aspect, result = future.result()
-            results[aspect] = result
+    unfinished = []
+    if timeout is None:
+        team_results = get_backend(backend).map(run_team, specs)
+    else:
+        token = CancelToken(timeout=timeout)
+        with cancel_scope(token):
+            team_results, unfinished = get_backend(backend).map_partial(run_team, specs, timeout)
+        if unfinished:
+            # Teams still running stop at their next cancellation check
+            token.cancel(DEADLINE)
+    for i in unfinished:
+        team_results[i] = {"aspect": specs[i].aspect, "team_formation": specs[i].formation_name,
+                           "status": DEADLINE}
+    results = dict(zip([spec.aspect for spec in specs], team_results))
             
     # Add global coordination summary
     results["coordination_summary"] = {
         "total_teams": len(aspects),
+        "completed_teams": len(specs) - len(unfinished),
+        "timed_out_teams": [specs[i].aspect for i in unfinished],
+        "partial": bool(unfinished),
         "global_context": global_context.to_dict(),
         "resource_utilization": global_resources.to_dict(),
         "fractal_coordination": True,
@@ -0,0 +1,226 @@
+"""
+Write-behind persistence for orchestrator tasks.
+
+Registered orchestrators report every task insert and status/agent change to
+a shared ``TaskWriter``. The caller only records "this task is dirty" in a
+dict (a few microseconds); a background thread flushes the latest state of
+all dirty tasks to ``storage.save_tasks`` in one transaction every
+``TASK_FLUSH_INTERVAL_MS`` (sooner once ``TASK_FLUSH_BATCH`` tasks are dirty).
+
+Guarantees: a change is durable within one flush interval plus the commit
+time; each flush is a single transaction, so after a crash the store holds
+the complete state as of some flush, never a partial batch. Repeated changes
+to one task between flushes collapse into a single row write. The final flush
+runs at interpreter exit.
+
+A flush that fails on a transient store error (``OSError``, sqlite's
+``OperationalError``: disk full, database locked) keeps the whole batch dirty
+for the next flush. Any other failure means some row cannot be written at
+all, so the rows are retried one at a time: the rest are written and a row
+that fails on its own is quarantined (logged, counted and dropped) instead
+of blocking persistence for every task in the process.
+"""
+
+import atexit
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import storage
+from .schemas import Task
+
+logger = logging.getLogger(__name__)
+
+TASK_PERSISTENCE = os.getenv("TASK_PERSISTENCE", "write_behind").lower()
+FLUSH_INTERVAL = float(os.getenv("TASK_FLUSH_INTERVAL_MS", "50")) / 1000
+FLUSH_BATCH = int(os.getenv("TASK_FLUSH_BATCH", "500"))
+
+# Work that was in flight when the process stopped cannot resume from the queue it was in
+INTERRUPTED_STATUSES = {"queued", "running"}
+
+# Errors that say nothing about the rows themselves; the batch is retried as is
+TRANSIENT_ERRORS = (OSError, sqlite3.OperationalError)
+QUARANTINE_LOG_SIZE = 20
+
+
+class TaskWriter:
+    def __init__(self, flush_interval: float = FLUSH_INTERVAL, batch_size: int = FLUSH_BATCH,
+                 save=None):
+        self.flush_interval = flush_interval
+        self.batch_size = max(1, batch_size)
+        self._save = save or storage.save_tasks
+        self._dirty: Dict[str, Tuple[str, Task, float]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self.enqueued = 0
+        self.written = 0
+        self.batches = 0
+        self.errors = 0
+        self.discarded = 0
+        self.quarantined = 0
+        self._quarantine: "deque[Dict[str, str]]" = deque(maxlen=QUARANTINE_LOG_SIZE)
+        self.last_flush_ms = 0.0
+        self.max_lag_ms = 0.0
+        self._thread = threading.Thread(target=self._run, name="task-write-behind", daemon=True)
+        self._thread.start()
+
+    def enqueue(self, formation: str, task: Task):
+        """Mark a task dirty; its latest state is written on the next flush"""
+        with self._lock:
+            entry = self._dirty.get(task.id)
+            # Keep the first-dirtied time so lag measures the oldest unflushed change
+            self._dirty[task.id] = (formation, task, entry[2] if entry else time.monotonic())
+            self.enqueued += 1
+            full = len(self._dirty) >= self.batch_size
+        if full:
+            self._wakeup.set()
+
+    def discard(self, task_ids):
+        """Drop pending writes for these tasks (archived; a late write would resurrect their rows)"""
+        with self._lock:
+            for task_id in task_ids:
+                if self._dirty.pop(task_id, None) is not None:
+                    self.discarded += 1
+
+    def _run(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """Write every dirty task in one transaction; returns the number of rows written"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty:
+                    return 0
+                batch, self._dirty = self._dirty, {}
+            start = time.perf_counter()
+            # Results are encoded by storage, here on the flusher thread rather than the caller's
+            rows = [_row(formation, task) for formation, task, _ in batch.values()]
+            try:
+                self._save(rows)
+            except TRANSIENT_ERRORS as e:
+                logger.error(f"Write-behind flush of {len(rows)} tasks failed, will retry: {e}")
+                with self._lock:
+                    self.errors += 1
+                    for task_id, entry in batch.items():
+                        self._dirty.setdefault(task_id, entry)
+                return 0
+            except Exception as e:
+                logger.error(f"Write-behind flush of {len(rows)} tasks failed, retrying them one at a time: {e}")
+                with self._lock:
+                    self.errors += 1
+                rows = self._save_each(batch)
+                if not rows:
+                    return 0
+                batch = {row[0]: batch[row[0]] for row in rows}
+            now = time.monotonic()
+            with self._lock:
+                self.written += len(rows)
+                self.batches += 1
+                self.last_flush_ms = (time.perf_counter() - start) * 1000
+                oldest = min(entry[2] for entry in batch.values())
+                self.max_lag_ms = max(self.max_lag_ms, (now - oldest) * 1000)
+            return len(rows)
+
+    def _save_each(self, batch: Dict[str, Tuple[str, Task, float]]) -> List[Tuple]:
+        """Write each row on its own; returns the rows written. Rows that fail alone are quarantined,
+        unless the store itself is failing, in which case they stay dirty"""
+        written = []
+        for task_id, (formation, task, dirtied) in batch.items():
+            row = _row(formation, task)
+            try:
+                self._save([row])
+                written.append(row)
+            except TRANSIENT_ERRORS as e:
+                logger.error(f"Write-behind save of task {task_id} failed, will retry: {e}")
+                with self._lock:
+                    self._dirty.setdefault(task_id, (formation, task, dirtied))
+            except Exception as e:
+                logger.error(f"Quarantining task {task_id} of {formation}: it cannot be persisted: {e}")
+                with self._lock:
+                    self.quarantined += 1
+                    self._quarantine.append({"task_id": task_id, "formation": formation,
+                                             "error": f"{type(e).__name__}: {e}"})
+        return written
+
+    def close(self):
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join(timeout=5)
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "mode": TASK_PERSISTENCE,
+                "dirty": len(self._dirty),
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "coalesced": self.enqueued - self.written - self.discarded - self.quarantined - len(self._dirty),
+                "discarded": self.discarded,
+                "batches": self.batches,
+                "errors": self.errors,
+                "quarantined": self.quarantined,
+                "recent_quarantined": list(self._quarantine),
+                "flush_interval_ms": self.flush_interval * 1000,
+                "last_flush_ms": round(self.last_flush_ms, 3),
+                "max_lag_ms": round(self.max_lag_ms, 3),
+            }
+
+
+def _row(formation: str, task: Task) -> Tuple:
+    return (task.id, formation, task.description, task.assigned_to, task.status, task.results)
+
+
+_writer: Optional[TaskWriter] = None
+_writer_lock = threading.Lock()
+_persisted_formations: Optional[set] = None
+
+
+def persistence_enabled() -> bool:
+    return TASK_PERSISTENCE == "write_behind"
+
+
+def get_task_writer() -> TaskWriter:
+    """The process-wide writer, creating the schema and starting the flusher on first use"""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                storage.init_db()
+                _writer = TaskWriter()
+                atexit.register(_writer.close)
+    return _writer
+
+
+def persisted_formations() -> set:
+    """Formations with stored tasks, read once per process (used to rehydrate lazily)"""
+    global _persisted_formations
+    if _persisted_formations is None:
+        get_task_writer()
+        _persisted_formations = set(storage.list_formations())
+    return _persisted_formations
+
+
+def load_persisted_tasks(formation: str):
+    """Stored tasks for a formation as Task objects; in-flight work is marked interrupted"""
+    tasks = []
+    for row in storage.load_tasks(formation):
+        status = "interrupted" if row["status"] in INTERRUPTED_STATUSES else row["status"]
+        tasks.append(Task(id=row["id"], description=row["description"], status=status,
+                          assigned_to=row["assigned_to"], results=row["results"]))
+    return tasks
+
+
+def writer_stats() -> Dict[str, Any]:
+    if _writer is None:
+        return {"mode": TASK_PERSISTENCE, "started": False}
+    return _writer.stats()
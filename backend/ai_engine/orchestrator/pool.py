@@ -0,0 +1,141 @@
+"""
+Formation-keyed pool of pre-warmed orchestrators.
+
+Building a ``MultiAgentOrchestrator`` constructs a SystemPromptEngine, a
+LoveWisdomBridge, a DivineResonantEngine and registers a resonator for every
+agent. Request handlers that only need a scratch orchestrator check one out of
+the pool instead; it is reset and returned when the request is done.
+
+Each orchestrator owns its bridge and engine (both are cheap to build and
+accumulate per-request state), so reset can clear them without touching an
+orchestrator another request has checked out. An orchestrator whose block
+raised -- including ``run_async`` timing out or the client disconnecting -- is
+discarded rather than reset, since the abandoned coroutine may still be running
+on the loop thread.
+"""
+
+import os
+import queue
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator
+
+from .formations import load_formation
+from .orchestrator import MultiAgentOrchestrator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = int(os.getenv("ORCHESTRATOR_POOL_SIZE", "4"))
+
+
+class OrchestratorPool:
+    """Bounded pool of idle orchestrators for a single formation"""
+
+    def __init__(self, formation_name: str, size: int = DEFAULT_POOL_SIZE, prewarm: bool = True):
+        load_formation(formation_name)  # KeyError for unknown formations, like load_formation itself
+        self.formation_name = formation_name
+        self.size = max(1, size)
+        self._idle: "queue.LifoQueue[MultiAgentOrchestrator]" = queue.LifoQueue(maxsize=self.size)
+        self._lock = threading.Lock()
+        self.created = 0
+        self.checkouts = 0
+        self.misses = 0
+        self.discarded = 0
+        if prewarm:
+            self.warm()
+
+    def _build(self) -> MultiAgentOrchestrator:
+        with self._lock:
+            self.created += 1
+        return MultiAgentOrchestrator(load_formation(self.formation_name))
+
+    def warm(self, count: int = None):
+        """Fill the pool up to ``count`` (default: its size) idle orchestrators"""
+        target = min(self.size, count or self.size)
+        while self._idle.qsize() < target:
+            try:
+                self._idle.put_nowait(self._build())
+            except queue.Full:
+                break
+
+    def acquire(self) -> MultiAgentOrchestrator:
+        """Take an idle orchestrator, building a new one if the pool is empty"""
+        with self._lock:
+            self.checkouts += 1
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                self.misses += 1
+            return self._build()
+
+    def release(self, orch: MultiAgentOrchestrator):
+        """Reset an orchestrator and return it to the pool (dropped if the pool is full)"""
+        try:
+            orch.reset()
+            self._idle.put_nowait(orch)
+        except queue.Full:
+            with self._lock:
+                self.discarded += 1
+        except Exception as e:
+            logger.warning(f"Discarding orchestrator for {self.formation_name} after failed reset: {e}")
+            with self._lock:
+                self.discarded += 1
+
+    def discard(self, orch: MultiAgentOrchestrator):
+        """Drop an orchestrator that may still be in use instead of returning it to the pool"""
+        with self._lock:
+            self.discarded += 1
+
+    @contextmanager
+    def checkout(self) -> Iterator[MultiAgentOrchestrator]:
+        orch = self.acquire()
+        try:
+            yield orch
+        except BaseException:
+            self.discard(orch)
+            raise
+        self.release(orch)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "formation": self.formation_name,
+                "size": self.size,
+                "idle": self._idle.qsize(),
+                "created": self.created,
+                "checkouts": self.checkouts,
+                "misses": self.misses,
+                "discarded": self.discarded,
+            }
+
+
+_POOLS: Dict[str, OrchestratorPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pool(formation_name: str) -> OrchestratorPool:
+    """Return the pool for a formation, creating and pre-warming it on first use"""
+    pool = _POOLS.get(formation_name)
+    if pool is None:
+        with _POOLS_LOCK:
+            pool = _POOLS.get(formation_name)
+            if pool is None:
+                pool = OrchestratorPool(formation_name)
+                _POOLS[formation_name] = pool
+    return pool
+
+
+@contextmanager
+def checkout_orchestrator(formation_name: str) -> Iterator[MultiAgentOrchestrator]:
+    """Borrow a pooled orchestrator for ``formation_name`` for the duration of a block.
+
+    Unlike ``create_orchestrator`` this never touches the ``ORCHESTRATORS`` registry.
+    """
+    with get_pool(formation_name).checkout() as orch:
+        yield orch
+
+
+def pool_stats() -> Dict[str, Any]:
+    return {name: pool.stats() for name, pool in list(_POOLS.items())}
@@ -0,0 +1,244 @@
+"""
+Indexed task registry for MultiAgentOrchestrator.
+
+Behaves like the ``Dict[str, Task]`` it replaces (``tasks[id]``, ``get``,
+``values``, ``clear`` ...) but also keeps secondary indexes by status and by
+assigned agent, plus incremental counters. Every task gets a monotonically
+increasing sequence number; each index is a sorted list of sequence numbers,
+so a filtered, cursor-paginated page costs a bisect and a slice no matter how
+many tasks the orchestrator holds.
+
+Tasks notify their registry when ``status`` or ``assigned_to`` is assigned
+(see ``Task.__setattr__``), so existing code that mutates tasks directly keeps
+the indexes correct.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .schemas import Task
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def _remove(seqs: List[int], seq: int):
+    i = bisect_left(seqs, seq)
+    if i < len(seqs) and seqs[i] == seq:
+        del seqs[i]
+
+
+class TaskRegistry:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._seq = itertools.count(1)
+        self._tasks: Dict[str, Task] = {}
+        self._seq_of: Dict[str, int] = {}
+        self._by_seq: Dict[int, Task] = {}
+        self._all: List[int] = []
+        self._by_status: Dict[str, List[int]] = {}
+        self._by_agent: Dict[str, List[int]] = {}
+        # seq -> time.time() of the task's last status change (or insert), for age-based retention
+        self._status_since: Dict[int, float] = {}
+        self.created_total = 0
+        self.transitions: Counter = Counter()
+        # Called with the task after every insert and status/agent change (write-behind persistence)
+        self.on_change: Optional[Callable[[Task], None]] = None
+
+    # -- dict interface -------------------------------------------------
+
+    def __setitem__(self, task_id: str, task: Task):
+        self._insert(task_id, task)
+        if self.on_change is not None:
+            self.on_change(task)
+
+    def restore(self, tasks: Iterable[Task]):
+        """Insert already-persisted tasks without reporting them as changes"""
+        for task in tasks:
+            self._insert(task.id, task)
+
+    def _insert(self, task_id: str, task: Task):
+        with self._lock:
+            if task_id in self._tasks:
+                self.pop(task_id)
+            seq = next(self._seq)
+            self._tasks[task_id] = task
+            self._seq_of[task_id] = seq
+            self._by_seq[seq] = task
+            self._status_since[seq] = time.time()
+            self._all.append(seq)
+            self._by_status.setdefault(task.status, []).append(seq)
+            if task.assigned_to:
+                self._by_agent.setdefault(task.assigned_to, []).append(seq)
+            self.created_total += 1
+            task.__dict__["_registry_hook"] = self._reindex
+
+    def __getitem__(self, task_id: str) -> Task:
+        return self._tasks[task_id]
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._tasks
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._tasks))
+
+    def get(self, task_id: str, default: Any = None) -> Any:
+        return self._tasks.get(task_id, default)
+
+    def keys(self):
+        return list(self._tasks.keys())
+
+    def values(self):
+        return list(self._tasks.values())
+
+    def items(self):
+        return list(self._tasks.items())
+
+    def pop(self, task_id: str, *default):
+        with self._lock:
+            task = self._tasks.pop(task_id, None)
+            if task is None:
+                if default:
+                    return default[0]
+                raise KeyError(task_id)
+            seq = self._seq_of.pop(task_id)
+            del self._by_seq[seq]
+            self._status_since.pop(seq, None)
+            _remove(self._all, seq)
+            _remove(self._by_status.get(task.status, []), seq)
+            if task.assigned_to:
+                _remove(self._by_agent.get(task.assigned_to, []), seq)
+            task.__dict__.pop("_registry_hook", None)
+            return task
+
+    def evict(self, task_ids: Iterable[str]) -> List[Task]:
+        """Remove many tasks at once, rebuilding each index in one pass (pop per task is O(n) each)"""
+        with self._lock:
+            evicted, gone = [], set()
+            for task_id in task_ids:
+                task = self._tasks.pop(task_id, None)
+                if task is None:
+                    continue
+                seq = self._seq_of.pop(task_id)
+                del self._by_seq[seq]
+                self._status_since.pop(seq, None)
+                task.__dict__.pop("_registry_hook", None)
+                gone.add(seq)
+                evicted.append(task)
+            if gone:
+                self._all = [seq for seq in self._all if seq not in gone]
+                for index in (self._by_status, self._by_agent):
+                    for key in list(index):
+                        kept = [seq for seq in index[key] if seq not in gone]
+                        if kept:
+                            index[key] = kept
+                        else:
+                            del index[key]
+            return evicted
+
+    def clear(self):
+        with self._lock:
+            for task in self._tasks.values():
+                task.__dict__.pop("_registry_hook", None)
+            self._tasks.clear()
+            self._seq_of.clear()
+            self._by_seq.clear()
+            self._status_since.clear()
+            self._all.clear()
+            self._by_status.clear()
+            self._by_agent.clear()
+
+    # -- indexes --------------------------------------------------------
+
+    def _reindex(self, task: Task, field: str, old: Optional[str], new: Optional[str]):
+        with self._lock:
+            seq = self._seq_of.get(task.id)
+            if seq is None or self._by_seq.get(seq) is not task:
+                return
+            index = self._by_status if field == "status" else self._by_agent
+            # Re-read the live value: a concurrent assignment may have run its hook first
+            current = task.__dict__.get(field)
+            for value in {old, new} - {None}:
+                _remove(index.get(value, []), seq)
+            if current is not None:
+                seqs = index.setdefault(current, [])
+                i = bisect_left(seqs, seq)
+                if i == len(seqs) or seqs[i] != seq:
+                    seqs.insert(i, seq)
+            if field == "status":
+                self.transitions[new] += 1
+                self._status_since[seq] = time.time()
+        if self.on_change is not None:
+            self.on_change(task)
+
+    def _merged(self, lists: Iterable[List[int]], after: int, limit: Optional[int]) -> List[int]:
+        slices = []
+        for seqs in lists:
+            start = bisect_right(seqs, after)
+            slices.append(seqs[start:] if limit is None else seqs[start:start + limit])
+        merged = slices[0] if len(slices) == 1 else list(heapq.merge(*slices))
+        return merged if limit is None else merged[:limit]
+
+    def with_status(self, *statuses: str) -> List[Task]:
+        """Tasks currently in any of ``statuses``, in creation order"""
+        with self._lock:
+            lists = [self._by_status.get(s, []) for s in statuses] or [[]]
+            return [self._by_seq[seq] for seq in self._merged(lists, 0, None)]
+
+    def without_status(self, *statuses: str) -> List[Task]:
+        with self._lock:
+            keep = [s for s in self._by_status if s not in statuses]
+        return self.with_status(*keep)
+
+    def status_ages(self, *statuses: str) -> List[Tuple[Task, float]]:
+        """(task, seconds since its last status change) for tasks in ``statuses``, in creation order"""
+        now = time.time()
+        with self._lock:
+            lists = [self._by_status.get(s, []) for s in statuses] or [[]]
+            return [(self._by_seq[seq], now - self._status_since[seq]) for seq in self._merged(lists, 0, None)]
+
+    def for_agent(self, agent_id: str) -> List[Task]:
+        with self._lock:
+            return [self._by_seq[seq] for seq in self._by_agent.get(agent_id, [])]
+
+    def counts(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "total": len(self._tasks),
+                "created_total": self.created_total,
+                "by_status": {s: len(seqs) for s, seqs in self._by_status.items() if seqs},
+                "by_agent": {a: len(seqs) for a, seqs in self._by_agent.items() if seqs},
+                "transitions": dict(self.transitions),
+            }
+
+    def page(self, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+             statuses: Optional[Iterable[str]] = None,
+             agent_id: Optional[str] = None) -> Tuple[List[Task], Optional[str]]:
+        """One page of tasks in creation order after ``cursor``; returns (tasks, next_cursor)"""
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        after = int(cursor) if cursor else 0
+        with self._lock:
+            if statuses:
+                lists = [self._by_status.get(s, []) for s in statuses]
+            elif agent_id:
+                lists = [self._by_agent.get(agent_id, [])]
+            else:
+                lists = [self._all]
+            if statuses and agent_id:
+                # Combined filters: walk the status index lazily, keeping this agent's tasks
+                candidates = heapq.merge(*[seqs[bisect_right(seqs, after):] for seqs in lists])
+                seqs = list(itertools.islice(
+                    (seq for seq in candidates if self._by_seq[seq].assigned_to == agent_id), limit + 1))
+            else:
+                seqs = self._merged(lists, after, limit + 1)
+            tasks = [self._by_seq[seq] for seq in seqs[:limit]]
+            next_cursor = str(seqs[limit - 1]) if len(seqs) > limit else None
+        return tasks, next_cursor
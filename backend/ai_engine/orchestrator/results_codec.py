@@ -0,0 +1,255 @@
+"""
+Compact binary encoding for task ``results``.
+
+Results carry whole system prompts, agent outputs and nested metrics, and the
+same prompt text repeats across every task of a formation. A blob is:
+
+    byte 0   format version (FORMAT_VERSION)
+    byte 1   flags: serializer (bits 0-1) | compression (bits 2-3)
+    rest     [local string table, value], serialized, then maybe compressed
+
+Strings are interned at two levels:
+
+- strings of at least ``RESULTS_INTERN_MIN_CHARS`` that the codec has seen
+  before (system prompts and their sections) are replaced by a 16-byte
+  content digest and stored once in a shared string table kept by the caller
+  (``storage`` keeps it in sqlite), so a prompt used by ten thousand tasks is
+  stored once. A long string seen for the first time (a unique agent output)
+  stays inline, where it is compressed. Decoding hands back the same ``str``
+  object for a digest while it is cached, so loaded tasks share it in memory
+  too;
+- shorter strings that occur more than once in one value (agent IDs, repeated
+  keys' values) go into the blob's local table and are referenced by index.
+
+The serializer is msgpack when installed (references are ext types), else
+compact JSON (references are ``{"\\u0000s": i}`` / ``{"\\u0000r": hex}``
+objects). msgpack cannot hold integers outside the 64-bit range, so a value
+containing one is written with the JSON serializer instead. Payloads above ``RESULTS_COMPRESS_MIN_BYTES`` are compressed with
+zstd when ``zstandard`` is installed, else zlib. The flags byte records
+both choices, so a reader picks the right decoder per blob and a new
+``FORMAT_VERSION`` can be introduced alongside old rows.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import msgpack
+except ImportError:  # optional: compact JSON is used instead
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # optional: zlib is used instead
+    zstandard = None
+
+FORMAT_VERSION = 1
+
+SERIALIZER_JSON = 0
+SERIALIZER_MSGPACK = 1
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+
+INTERN_MIN_CHARS = int(os.getenv("RESULTS_INTERN_MIN_CHARS", "256"))
+LOCAL_INTERN_MIN_CHARS = 8
+COMPRESS_MIN_BYTES = int(os.getenv("RESULTS_COMPRESS_MIN_BYTES", "512"))
+COMPRESSION_LEVEL = int(os.getenv("RESULTS_COMPRESSION_LEVEL", "3"))
+STRING_CACHE_SIZE = int(os.getenv("RESULTS_STRING_CACHE", "1024"))
+# Recently seen long strings, to tell repeated ones (interned) from one-offs (inline)
+SEEN_CACHE_SIZE = int(os.getenv("RESULTS_SEEN_CACHE", "256"))
+
+_MSGPACK_INT_MIN = -2 ** 63
+_MSGPACK_INT_MAX = 2 ** 64 - 1
+
+_EXT_SHARED = 1
+_EXT_LOCAL = 2
+_JSON_SHARED = "\x00r"
+_JSON_LOCAL = "\x00s"
+
+
+def digest(value: str) -> bytes:
+    return hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+
+
+class ResultsCodec:
+    def __init__(self, intern_min_chars: int = INTERN_MIN_CHARS, compress_min_bytes: int = COMPRESS_MIN_BYTES,
+                 level: int = COMPRESSION_LEVEL, serializer: Optional[int] = None,
+                 compression: Optional[int] = None, cache_size: int = STRING_CACHE_SIZE,
+                 seen_size: int = SEEN_CACHE_SIZE):
+        self.intern_min_chars = intern_min_chars
+        self.compress_min_bytes = compress_min_bytes
+        self.level = level
+        self.serializer = serializer if serializer is not None else (
+            SERIALIZER_MSGPACK if msgpack is not None else SERIALIZER_JSON)
+        self.compression = compression if compression is not None else (
+            COMPRESSION_ZSTD if zstandard is not None else COMPRESSION_ZLIB)
+        self.cache_size = max(1, cache_size)
+        # digest -> str, so decoded results share one object per interned string
+        self._strings: "OrderedDict[bytes, str]" = OrderedDict()
+        # long string -> its digest once seen twice (None after the first sighting)
+        self.seen_size = max(1, seen_size)
+        self._seen: "OrderedDict[str, Optional[bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _shared_string(self, key: bytes, resolve: Callable[[bytes], str]) -> str:
+        with self._lock:
+            cached = self._strings.get(key)
+            if cached is not None:
+                self._strings.move_to_end(key)
+                return cached
+        value = resolve(key)
+        with self._lock:
+            # Another thread may have cached it meanwhile; keep one object per digest
+            value = self._strings.setdefault(key, value)
+            if len(self._strings) > self.cache_size:
+                self._strings.popitem(last=False)
+        return value
+
+    def _repeat_digest(self, value: str) -> Optional[bytes]:
+        """Digest of a long string seen before, else None (and remember it for next time).
+        Lookups hash the str, which CPython caches on the object, so shared prompt objects cost O(1)"""
+        with self._lock:
+            if value in self._seen:
+                key = self._seen[value]
+                if key is None:
+                    key = self._seen[value] = digest(value)
+                self._seen.move_to_end(value)
+                return key
+            self._seen[value] = None
+            if len(self._seen) > self.seen_size:
+                self._seen.popitem(last=False)
+            return None
+
+    def _compressor(self):
+        # zstd compressors are reusable but not thread-safe
+        compressor = getattr(self._local, "zstd", None)
+        if compressor is None:
+            compressor = self._local.zstd = zstandard.ZstdCompressor(level=self.level)
+        return compressor
+
+    def _decompress(self, payload: bytes, compression: int) -> bytes:
+        if compression == COMPRESSION_NONE:
+            return payload
+        if compression == COMPRESSION_ZSTD:
+            if zstandard is None:
+                raise RuntimeError("results blob was compressed with zstd, which is not installed")
+            decompressor = getattr(self._local, "unzstd", None)
+            if decompressor is None:
+                decompressor = self._local.unzstd = zstandard.ZstdDecompressor()
+            return decompressor.decompress(payload)
+        return zlib.decompress(payload)
+
+    # --- encode ---
+
+    def encode(self, results: Any) -> Tuple[bytes, Dict[bytes, str]]:
+        """Encode ``results``; returns (blob, {digest: string}) for the shared strings it references"""
+        counts: Dict[str, int] = {}
+        big_ints = self._count(results, counts)
+        serializer = SERIALIZER_JSON if big_ints else self.serializer
+        local = [s for s, n in counts.items() if n > 1 and LOCAL_INTERN_MIN_CHARS <= len(s) < self.intern_min_chars]
+        local_index = {s: i for i, s in enumerate(local)}
+        shared: Dict[bytes, str] = {}
+        value = self._intern(results, local_index, shared, serializer)
+
+        if serializer == SERIALIZER_MSGPACK:
+            payload = msgpack.packb([local, value], use_bin_type=True)
+        else:
+            payload = json.dumps([local, value], separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+        compression = COMPRESSION_NONE
+        if len(payload) >= self.compress_min_bytes:
+            compression = self.compression
+            if compression == COMPRESSION_ZSTD:
+                payload = self._compressor().compress(payload)
+            else:
+                payload = zlib.compress(payload, self.level)
+        return bytes((FORMAT_VERSION, serializer | compression << 2)) + payload, shared
+
+    def _count(self, value: Any, counts: Dict[str, int]) -> bool:
+        """Count string occurrences; True if the value holds an int msgpack cannot encode"""
+        if isinstance(value, str):
+            counts[value] = counts.get(value, 0) + 1
+        elif isinstance(value, dict):
+            return any([self._count(v, counts) for v in value.values()])
+        elif isinstance(value, (list, tuple)):
+            return any([self._count(v, counts) for v in value])
+        elif isinstance(value, int) and not isinstance(value, bool):
+            return not _MSGPACK_INT_MIN <= value <= _MSGPACK_INT_MAX
+        return False
+
+    def _intern(self, value: Any, local_index: Dict[str, int], shared: Dict[bytes, str], serializer: int) -> Any:
+        if isinstance(value, str):
+            if len(value) >= self.intern_min_chars:
+                key = self._repeat_digest(value)
+                if key is None:
+                    return value
+                shared[key] = value
+                return self._ref(_EXT_SHARED, key, serializer)
+            index = local_index.get(value)
+            return value if index is None else self._ref(_EXT_LOCAL, index, serializer)
+        if isinstance(value, dict):
+            return {str(k): self._intern(v, local_index, shared, serializer) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._intern(v, local_index, shared, serializer) for v in value]
+        if serializer == SERIALIZER_MSGPACK and not isinstance(value, (int, float, bool, bytes, type(None))):
+            return str(value)  # what json.dumps(default=str) did for datetimes and the like
+        return value
+
+    def _ref(self, kind: int, key, serializer: int) -> Any:
+        if serializer == SERIALIZER_MSGPACK:
+            data = key if kind == _EXT_SHARED else key.to_bytes(4, "big")
+            return msgpack.ExtType(kind, data)
+        return {_JSON_SHARED: key.hex()} if kind == _EXT_SHARED else {_JSON_LOCAL: key}
+
+    # --- decode ---
+
+    def decode(self, blob: bytes, resolve: Callable[[bytes], str]) -> Any:
+        """Decode a blob; ``resolve(digest)`` fetches shared strings not in this codec's cache"""
+        if len(blob) < 2 or blob[0] != FORMAT_VERSION:
+            raise ValueError(f"unsupported results format version {blob[0] if blob else None}")
+        serializer, compression = blob[1] & 0b11, blob[1] >> 2 & 0b11
+        payload = self._decompress(bytes(blob[2:]), compression)
+
+        def shared(key: bytes) -> str:
+            return self._shared_string(key, resolve)
+
+        if serializer == SERIALIZER_MSGPACK:
+            if msgpack is None:
+                raise RuntimeError("results blob was written with msgpack, which is not installed")
+            local: List[str] = []
+
+            def ext_hook(code: int, data: bytes):
+                if code == _EXT_SHARED:
+                    return shared(data)
+                if code == _EXT_LOCAL:
+                    return local[int.from_bytes(data, "big")]
+                return msgpack.ExtType(code, data)
+
+            unpacker = msgpack.Unpacker(ext_hook=ext_hook, raw=False, strict_map_key=False, max_buffer_size=0)
+            unpacker.feed(payload)
+            # The array header, then the table, which the hook needs before the value is unpacked
+            unpacker.read_array_header()
+            local.extend(unpacker.unpack())
+            return unpacker.unpack()
+
+        local, value = json.loads(payload)
+        return _resolve_json(value, local, shared)
+
+
+def _resolve_json(value: Any, local: List[str], shared: Callable[[bytes], str]) -> Any:
+    if isinstance(value, dict):
+        if len(value) == 1:
+            if _JSON_LOCAL in value:
+                return local[value[_JSON_LOCAL]]
+            if _JSON_SHARED in value:
+                return shared(bytes.fromhex(value[_JSON_SHARED]))
+        return {k: _resolve_json(v, local, shared) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_resolve_json(v, local, shared) for v in value]
+    return value
@@ -0,0 +1,323 @@
+"""
+Retention, archival and compaction of orchestrator task history.
+
+Finished tasks used to stay forever in three places: the orchestrator's
+registry, the ``current_prompts`` of the agents they were routed to (a full
+system prompt per task) and the ``tasks`` table. A ``RetentionPolicy`` per
+formation now bounds all three. A task is eligible once it is in one of the
+policy's ``statuses`` (finished ones by default; only ``RETAINABLE_STATUSES``
+are allowed), and it is archived when
+
+- it has been in that status for longer than ``max_age`` seconds, or
+- more than ``max_tasks`` eligible tasks are in memory (oldest go first).
+
+Stored rows of the formation created more than ``max_age`` ago are archived
+as well, including rows of tasks that were never loaded after a restart.
+
+Archiving flushes the write-behind queue, moves the rows into the
+time-partitioned archive tables of ``storage`` in one transaction, and only
+then evicts the tasks from memory, so a failed archive keeps everything where
+it was. Tasks the formation's executor still owns are never evicted. Without persistence the tasks are evicted without an archive.
+
+``RetentionManager`` applies the policies every ``TASK_RETENTION_INTERVAL_S``
+on a background thread, drops archive partitions beyond
+``TASK_ARCHIVE_KEEP_PARTITIONS``, truncates the WAL and compacts the heap:
+``gc.collect`` and then glibc's ``malloc_trim``, which hands freed pages back
+to the OS (CPython otherwise keeps them mapped). RSS is read before and after
+each run, so every run reports how much memory it reclaimed.
+
+Policies come from ``TASK_RETENTION_*`` defaults, per-formation overrides in
+``TASK_RETENTION_POLICIES`` (JSON, e.g. ``{"ResearchSquad": {"max_age_s":
+600, "max_tasks": 500, "statuses": ["completed"]}}``) and ``set_policy`` at
+runtime. A limit of 0 or null disables it.
+
+Run ``TASK_PERSISTENCE=off python -m ai_engine.orchestrator.retention [tasks]``
+to measure the RSS a run gives back after evicting that many finished tasks.
+"""
+
+import ctypes
+import ctypes.util
+import gc
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from . import storage
+from .executor import EXECUTORS, TERMINAL_STATUSES
+from .persistence import get_task_writer, persistence_enabled
+
+logger = logging.getLogger(__name__)
+
+RETENTION_ENABLED = os.getenv("TASK_RETENTION", "on").lower() not in ("0", "off", "false")
+RETENTION_INTERVAL = float(os.getenv("TASK_RETENTION_INTERVAL_S", "60"))
+DEFAULT_MAX_AGE = float(os.getenv("TASK_RETENTION_MAX_AGE_S", "3600"))
+DEFAULT_MAX_TASKS = int(os.getenv("TASK_RETENTION_MAX_TASKS", "10000"))
+# Work in flight (queued, running, assigned) is never archived
+RETAINABLE_STATUSES = frozenset(TERMINAL_STATUSES | {"interrupted"})
+DEFAULT_STATUSES = tuple(s for s in os.getenv(
+    "TASK_RETENTION_STATUSES", ",".join(sorted(RETAINABLE_STATUSES))).split(",") if s in RETAINABLE_STATUSES)
+ARCHIVE_KEEP_PARTITIONS = int(os.getenv("TASK_ARCHIVE_KEEP_PARTITIONS", "12"))
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    max_age: Optional[float] = DEFAULT_MAX_AGE or None
+    max_tasks: Optional[int] = DEFAULT_MAX_TASKS or None
+    statuses: Tuple[str, ...] = DEFAULT_STATUSES
+
+    def __post_init__(self):
+        invalid = [s for s in self.statuses if s not in RETAINABLE_STATUSES]
+        if invalid:
+            raise ValueError(f"statuses {invalid} are not retainable; expected some of {sorted(RETAINABLE_STATUSES)}")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], base: Optional["RetentionPolicy"] = None) -> "RetentionPolicy":
+        """Policy from {"max_age_s", "max_tasks", "statuses"}; missing keys come from ``base``"""
+        base = base or cls()
+        max_age = data.get("max_age_s", base.max_age)
+        max_tasks = data.get("max_tasks", base.max_tasks)
+        statuses = data.get("statuses", base.statuses)
+        if isinstance(statuses, str):
+            statuses = [s for s in statuses.split(",") if s]
+        if not isinstance(statuses, (list, tuple)):
+            raise ValueError("statuses must be a list")
+        if (max_age is not None and float(max_age) < 0) or (max_tasks is not None and int(max_tasks) < 0):
+            raise ValueError("retention limits must not be negative")
+        return cls(max_age=float(max_age) if max_age else None, max_tasks=int(max_tasks) if max_tasks else None,
+                   statuses=tuple(statuses))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"max_age_s": self.max_age, "max_tasks": self.max_tasks, "statuses": list(self.statuses)}
+
+    def select(self, registry) -> List[Any]:
+        """Tasks in ``registry`` this policy archives, oldest first"""
+        aged = registry.status_ages(*self.statuses)
+        expired = [task for task, age in aged if self.max_age is not None and age >= self.max_age]
+        if self.max_tasks is None:
+            return expired
+        ids = {task.id for task in expired}
+        kept = [task for task, _ in aged if task.id not in ids]
+        return expired + kept[:max(0, len(kept) - self.max_tasks)]
+
+
+def load_policies(raw: Optional[str] = None) -> Dict[str, RetentionPolicy]:
+    """Per-formation policies from ``TASK_RETENTION_POLICIES``"""
+    raw = os.getenv("TASK_RETENTION_POLICIES", "") if raw is None else raw
+    if not raw.strip():
+        return {}
+    try:
+        return {name: RetentionPolicy.from_dict(data) for name, data in json.loads(raw).items()}
+    except (ValueError, TypeError, AttributeError) as e:
+        logger.error(f"Ignoring invalid TASK_RETENTION_POLICIES: {e}")
+        return {}
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size, or None where /proc is unavailable"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+_libc = None
+
+
+def malloc_trim() -> bool:
+    """Return free heap pages to the OS (glibc only); True if anything was released"""
+    global _libc
+    if _libc is None:
+        try:
+            _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6")
+            _libc.malloc_trim.argtypes = [ctypes.c_size_t]
+        except (OSError, AttributeError):
+            _libc = False
+    if not _libc:
+        return False
+    return bool(_libc.malloc_trim(0))
+
+
+class RetentionManager:
+    def __init__(self, interval: float = RETENTION_INTERVAL, policies: Optional[Dict[str, RetentionPolicy]] = None,
+                 default: Optional[RetentionPolicy] = None, keep_partitions: int = ARCHIVE_KEEP_PARTITIONS):
+        self.interval = interval
+        self.default = default or RetentionPolicy()
+        self.policies: Dict[str, RetentionPolicy] = load_policies() if policies is None else dict(policies)
+        self.keep_partitions = keep_partitions
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.runs = 0
+        self.archived = 0
+        self.evicted = 0
+        self.errors = 0
+        self.rss_reclaimed = 0
+        self.last_run: Optional[Dict[str, Any]] = None
+
+    def policy_for(self, formation: str) -> RetentionPolicy:
+        with self._lock:
+            return self.policies.get(formation, self.default)
+
+    def set_policy(self, formation: str, policy: RetentionPolicy):
+        with self._lock:
+            self.policies[formation] = policy
+
+    def apply(self, orchestrator) -> Dict[str, Any]:
+        """Archive and evict one orchestrator's tasks according to its formation's policy"""
+        name = orchestrator.formation.name
+        policy = self.policy_for(name)
+        executor = EXECUTORS.get(name)
+        # A task the executor still owns would be settled after its eviction
+        victims = [task.id for task in policy.select(orchestrator.tasks)
+                   if executor is None or not executor.owns(task.id)]
+        partitions: Dict[str, List[str]] = {}
+        if persistence_enabled():
+            writer = get_task_writer()
+            # The archive must copy each task's latest state
+            writer.flush()
+            if victims:
+                partitions = storage.archive_tasks(victims)
+            if policy.max_age is not None:
+                for table, ids in storage.archive_before(name, time.time() - policy.max_age, policy.statuses).items():
+                    partitions.setdefault(table, []).extend(ids)
+            # Stored rows archived by age may belong to tasks that are still loaded
+            evict = list(dict.fromkeys(victims + [i for ids in partitions.values() for i in ids
+                                                  if executor is None or not executor.owns(i)]))
+            evicted = orchestrator.evict_tasks(evict)
+            writer.discard(evict)
+        else:
+            evicted = orchestrator.evict_tasks(victims)
+        archived = sum(len(ids) for ids in partitions.values())
+        return {"formation": name, "policy": policy.to_dict(), "archived": archived, "evicted": evicted,
+                "partitions": {table: len(ids) for table, ids in partitions.items()}}
+
+    def run(self, orchestrators: Iterable[Any]) -> Dict[str, Any]:
+        """Apply every orchestrator's policy, then compact storage and the heap"""
+        with self._run_lock:
+            start = time.perf_counter()
+            rss_before = rss_bytes()
+            formations, errors = [], 0
+            for orchestrator in list(orchestrators):
+                try:
+                    formations.append(self.apply(orchestrator))
+                except Exception as e:
+                    errors += 1
+                    logger.error(f"Retention for {orchestrator.formation.name} failed, tasks kept: {e}")
+            dropped, wal = [], None
+            if persistence_enabled():
+                try:
+                    dropped = storage.drop_archive_partitions(self.keep_partitions) if self.keep_partitions else []
+                    wal = storage.checkpoint()
+                except Exception as e:
+                    errors += 1
+                    logger.error(f"Archive compaction failed: {e}")
+            collected = gc.collect()
+            trimmed = malloc_trim()
+            rss_after = rss_bytes()
+            reclaimed = rss_before - rss_after if rss_before is not None and rss_after is not None else None
+            report = {
+                "formations": formations,
+                "archived": sum(f["archived"] for f in formations),
+                "evicted": sum(f["evicted"] for f in formations),
+                "dropped_partitions": dropped,
+                "wal": wal,
+                "gc_collected": collected,
+                "malloc_trimmed": trimmed,
+                "rss_before": rss_before,
+                "rss_after": rss_after,
+                "rss_reclaimed": reclaimed,
+                "errors": errors,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                "at": time.time(),
+            }
+            with self._lock:
+                self.runs += 1
+                self.archived += report["archived"]
+                self.evicted += report["evicted"]
+                self.errors += errors
+                self.rss_reclaimed += max(0, reclaimed or 0)
+                self.last_run = report
+            if report["evicted"] or dropped:
+                logger.info(f"Retention archived {report['archived']} and evicted {report['evicted']} tasks, "
+                            f"dropped {len(dropped)} partitions, RSS {rss_before} -> {rss_after}")
+            return report
+
+    def start(self, orchestrators: Callable[[], Iterable[Any]]):
+        """Run every ``interval`` seconds on a daemon thread over ``orchestrators()``"""
+        if self._thread is not None or not RETENTION_ENABLED or self.interval <= 0:
+            return
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.wait(self.interval):
+                self.run(orchestrators())
+
+        self._thread = threading.Thread(target=loop, name="task-retention", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": RETENTION_ENABLED,
+                "running": self._thread is not None,
+                "interval_s": self.interval,
+                "default_policy": self.default.to_dict(),
+                "policies": {name: policy.to_dict() for name, policy in self.policies.items()},
+                "keep_partitions": self.keep_partitions,
+                "runs": self.runs,
+                "archived": self.archived,
+                "evicted": self.evicted,
+                "errors": self.errors,
+                "rss_reclaimed": self.rss_reclaimed,
+                "last_run": self.last_run,
+            }
+
+
+task_retention = RetentionManager()
+
+
+def benchmark(tasks: int = 100_000) -> Dict[str, Any]:
+    """RSS with ``tasks`` finished tasks in memory, after evicting them, and after compaction"""
+    from types import SimpleNamespace
+    from .registry import TaskRegistry
+    from .routing import LoadAwareRouter
+    from .orchestrator import MultiAgentOrchestrator
+    from .schemas import Task
+
+    agent = SimpleNamespace(id="agent-1", role="backend_engineer", current_prompts={})
+    orch = SimpleNamespace(formation=SimpleNamespace(name="Bench", agents=[agent]), tasks=TaskRegistry(),
+                           router=LoadAwareRouter([agent]))
+    orch.evict_tasks = lambda ids: MultiAgentOrchestrator.evict_tasks(orch, ids)
+    baseline = rss_bytes()
+    for i in range(tasks):
+        task = Task(id=f"task-{i}", description=f"benchmark task {i}", assigned_to=agent.id)
+        task.results = {"agent_output": f"output {i} " * 100, "metrics": {"n": i}}
+        orch.tasks[task.id] = task
+        agent.current_prompts[task.id] = f"system prompt for task {i} " * 20
+        task.status = "completed"
+    loaded = rss_bytes()
+    manager = RetentionManager(interval=0, policies={"Bench": RetentionPolicy(max_age=None, max_tasks=0)})
+    report = manager.run([orch])
+    mb = 1024 * 1024
+    return {"tasks": tasks, "baseline_mb": round(baseline / mb, 1), "loaded_mb": round(loaded / mb, 1),
+            "after_compaction_mb": round(report["rss_after"] / mb, 1),
+            "reclaimed_mb": round(report["rss_reclaimed"] / mb, 1),
+            "evicted": report["evicted"], "duration_ms": report["duration_ms"]}
+
+
+if __name__ == "__main__":
+    import sys
+
+    print(json.dumps(benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000), indent=2))
@@ -0,0 +1,204 @@
+"""
+Load- and latency-aware agent routing.
+
+``LoadAwareRouter`` tracks, per agent, the number of tasks assigned but not
+yet finished (its queue depth), an exponentially weighted moving average of
+assignment-to-completion latency and of success. To route a task it:
+
+1. narrows the formation to *capable* agents: those whose role words appear
+   in the task description (role affinity), or every agent if none match;
+2. samples two of them at random (power of two choices) and assigns the one
+   with the lower expected cost
+   ``(queue_depth + 1) * latency ** w_latency / success ** w_success``.
+
+Sampling two instead of scanning for the global minimum keeps concurrent
+routers from stampeding the same idle agent, while still steering work away
+from hot ones. Each decision (candidates, sampled agents with their load, the
+cost of each and the reason) is kept in a bounded log so the API can explain
+why a task landed where it did.
+"""
+
+import os
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+CHOICES = int(os.getenv("ROUTING_CHOICES", "2"))
+EWMA_ALPHA = float(os.getenv("ROUTING_EWMA_ALPHA", "0.2"))
+DECISION_LOG_SIZE = int(os.getenv("ROUTING_DECISION_LOG", "1000"))
+
+# Seed latency for agents without completed tasks, so new agents are neither favoured nor avoided
+DEFAULT_LATENCY = 1.0
+MIN_SUCCESS = 0.05
+
+# Cost exponents (latency, success) per routing objective
+OBJECTIVES = {
+    "balanced": (1.0, 1.0),
+    "latency": (1.0, 0.0),
+    "quality": (0.0, 2.0),
+}
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+class AgentLoad:
+    __slots__ = ("agent_id", "role", "role_words", "queue_depth", "assigned", "completed", "failed",
+                 "latency", "success")
+
+    def __init__(self, agent_id: str, role: str):
+        self.agent_id = agent_id
+        self.role = role
+        # "backend_engineer" -> {"backend", "engineer"}; very short words match too much
+        self.role_words = {w for w in _WORD.findall(role.lower()) if len(w) > 2}
+        self.queue_depth = 0
+        self.assigned = 0
+        self.completed = 0
+        self.failed = 0
+        self.latency: Optional[float] = None
+        self.success = 1.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "agent": self.agent_id,
+            "role": self.role,
+            "queue_depth": self.queue_depth,
+            "assigned": self.assigned,
+            "completed": self.completed,
+            "failed": self.failed,
+            "latency_ms": round(self.latency * 1000, 3) if self.latency is not None else None,
+            "success_rate": round(self.success, 4),
+        }
+
+
+class LoadAwareRouter:
+    def __init__(self, agents, choices: int = CHOICES, alpha: float = EWMA_ALPHA,
+                 log_size: int = DECISION_LOG_SIZE, rng: Optional[random.Random] = None):
+        self.choices = max(1, choices)
+        self.alpha = alpha
+        self.log_size = max(1, log_size)
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._agents = {a.id: a for a in agents}
+        self._loads: Dict[str, AgentLoad] = {a.id: AgentLoad(a.id, a.role) for a in agents}
+        # task_id -> (agent_id, assigned_at) for tasks still counted in a queue depth
+        self._open: Dict[str, Tuple[str, float]] = {}
+        self._decisions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def reset(self):
+        with self._lock:
+            self._loads = {a.id: AgentLoad(a.id, a.role) for a in self._agents.values()}
+            self._open.clear()
+            self._decisions.clear()
+
+    def _latency_estimate(self, load: AgentLoad) -> float:
+        if load.latency is not None:
+            return load.latency
+        known = [l.latency for l in self._loads.values() if l.latency is not None]
+        return sum(known) / len(known) if known else DEFAULT_LATENCY
+
+    def _cost(self, load: AgentLoad, objective: str) -> float:
+        w_latency, w_success = OBJECTIVES.get(objective, OBJECTIVES["balanced"])
+        return ((load.queue_depth + 1) * self._latency_estimate(load) ** w_latency
+                / max(load.success, MIN_SUCCESS) ** w_success)
+
+    def capable(self, description: str) -> Tuple[List[AgentLoad], bool]:
+        """Agents with role affinity for ``description`` (or all agents) and whether any matched"""
+        words = set(_WORD.findall(description.lower()))
+        matched = [load for load in self._loads.values() if load.role_words & words]
+        return (matched, True) if matched else (list(self._loads.values()), False)
+
+    def route(self, task, objective: str = "balanced"):
+        """Pick an agent for ``task``, count it as queued there and log the decision"""
+        with self._lock:
+            candidates, affinity = self.capable(task.description)
+            sampled = candidates if len(candidates) <= self.choices else self._rng.sample(candidates, self.choices)
+            costs = [(self._cost(load, objective), i, load) for i, load in enumerate(sampled)]
+            _, _, chosen = min(costs)
+
+            decision = {
+                "policy": "power_of_two_choices" if self.choices == 2 else f"power_of_{self.choices}_choices",
+                "objective": objective,
+                "role_affinity": affinity,
+                "candidates": [load.agent_id for load in candidates],
+                "sampled": [{**load.snapshot(), "cost": round(c, 6)} for c, _, load in costs],
+                "reason": self._reason(chosen, candidates, sampled, affinity),
+            }
+            decision = self._assign(task, chosen, decision)
+        return self._agents[chosen.agent_id], decision
+
+    def record(self, task, agent_id: str, policy: str) -> Dict[str, Any]:
+        """Track a task whose agent was picked by another policy (round_robin, by_role)"""
+        with self._lock:
+            load = self._loads[agent_id]
+            return self._assign(task, load, {"policy": policy, "sampled": [load.snapshot()],
+                                             "reason": f"assigned by {policy} routing"})
+
+    def _assign(self, task, chosen: AgentLoad, decision: Dict[str, Any]) -> Dict[str, Any]:
+        previous = self._open.pop(task.id, None)
+        if previous is not None:
+            # Re-routed before finishing: move it out of the old agent's queue
+            self._loads[previous[0]].queue_depth -= 1
+        chosen.queue_depth += 1
+        chosen.assigned += 1
+        self._open[task.id] = (chosen.agent_id, time.monotonic())
+        decision = {"task_id": task.id, **decision, "chosen": chosen.agent_id}
+        self._decisions[task.id] = decision
+        self._decisions.move_to_end(task.id)
+        if len(self._decisions) > self.log_size:
+            self._decisions.popitem(last=False)
+        return decision
+
+    @staticmethod
+    def _reason(chosen: AgentLoad, candidates: List[AgentLoad], sampled: List[AgentLoad], affinity: bool) -> str:
+        scope = f"role match on {'/'.join(sorted(chosen.role_words)) or chosen.role}" if affinity else "no role match"
+        if len(candidates) == 1:
+            return f"{scope}; only capable agent"
+        others = ", ".join(f"{l.agent_id} (queue {l.queue_depth})" for l in sampled if l is not chosen)
+        return f"{scope}; lowest expected cost vs {others}"
+
+    def finished(self, task_id: str, ok: bool = True):
+        """Record the outcome of a routed task; unknown or already-finished tasks are ignored"""
+        with self._lock:
+            entry = self._open.pop(task_id, None)
+            if entry is None:
+                return
+            agent_id, assigned_at = entry
+            load = self._loads[agent_id]
+            load.queue_depth -= 1
+            latency = time.monotonic() - assigned_at
+            if ok:
+                load.completed += 1
+            else:
+                load.failed += 1
+            a = self.alpha
+            load.latency = latency if load.latency is None else (1 - a) * load.latency + a * latency
+            load.success = (1 - a) * load.success + a * (1.0 if ok else 0.0)
+
+    def forget(self, task_id: str):
+        """Stop counting a task against its agent without recording an outcome (e.g. cancelled)"""
+        with self._lock:
+            entry = self._open.pop(task_id, None)
+            if entry is not None:
+                self._loads[entry[0]].queue_depth -= 1
+
+    def discard(self, task_id: str):
+        """Forget a task entirely, including its logged decision (the task was archived)"""
+        self.forget(task_id)
+        with self._lock:
+            self._decisions.pop(task_id, None)
+
+    def explain(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._decisions.get(task_id)
+
+    def stats(self, decisions: int = 20) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "choices": self.choices,
+                "agents": [load.snapshot() for load in self._loads.values()],
+                "open_tasks": len(self._open),
+                "recent_decisions": list(self._decisions.values())[-decisions:] if decisions else [],
+            }
@@ -22,7 +22,7 @@ class TeamFormation:
     mission: str
     agents: List[AgentSpec]
     comms: str = "socketio"  # 'socketio' | 'rest'
-    routing: str = "round_robin"  # 'round_robin' | 'by_role' | 'llm_planner'
+    routing: str = "round_robin"  # 'round_robin' | 'by_role' | 'load_aware' | 'llm_planner'
 
 @dataclass
 class Task:
@@ -32,3 +32,19 @@ class Task:
     status: str = "pending"
     assigned_to: Optional[str] = None
     results: Dict[str, Any] = field(default_factory=dict)
+
+    def __setattr__(self, name, value):
+        # Keep the owning TaskRegistry's status/agent indexes in sync with direct assignments
+        hook = self.__dict__.get('_registry_hook')
+        if hook is not None and name in ('status', 'assigned_to'):
+            old = self.__dict__.get(name)
+            object.__setattr__(self, name, value)
+            if old != value:
+                hook(self, name, old, value)
+        else:
+            object.__setattr__(self, name, value)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state.pop('_registry_hook', None)
+        return state
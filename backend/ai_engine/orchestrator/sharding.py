@@ -0,0 +1,318 @@
+"""
+Orchestrator registry sharded across worker processes.
+
+Each gunicorn worker keeps its own ``ORCHESTRATORS`` dict, so a formation
+created on one worker used to be invisible to requests landing on another.
+``ShardRouter`` gives every formation a single owning worker instead: formation
+names are placed on a consistent-hash ring of ``ORCHESTRATOR_SHARDS`` shards,
+and operations on a formation run in its owner. A call made elsewhere is
+forwarded over a Unix socket (``<ORCHESTRATOR_SHARD_DIR>/shard-<i>.sock``) as a
+length-prefixed JSON frame and answered the same way.
+
+Operations are plain functions registered with ``@router.handler(name)``; their
+arguments and return values must be JSON-serializable, since they may cross a
+process boundary. Each worker learns its shard index from
+``ORCHESTRATOR_SHARD_INDEX``, which ``gunicorn.conf.py`` assigns so that a
+restarted worker takes over the slot (and socket) of the one it replaces.
+
+``ORCHESTRATOR_SHARDING=local`` (the default, used by tests and the dev server)
+runs every call in-process with no sockets.
+"""
+
+import bisect
+import hashlib
+import json
+import logging
+import os
+import socket
+import socketserver
+import struct
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SHARD_MODE = os.getenv("ORCHESTRATOR_SHARDING", "local")
+SHARD_COUNT = int(os.getenv("ORCHESTRATOR_SHARDS", "1"))
+SHARD_INDEX = int(os.getenv("ORCHESTRATOR_SHARD_INDEX", "0"))
+SHARD_SOCKET_DIR = os.getenv("ORCHESTRATOR_SHARD_DIR", "/tmp/soulphya-shards")
+# Must exceed the longest long-poll a forwarded call may make (TASK_WAIT_MAX_SECONDS)
+SHARD_CALL_TIMEOUT = float(os.getenv("ORCHESTRATOR_SHARD_TIMEOUT", "60"))
+SHARD_VNODES = int(os.getenv("ORCHESTRATOR_SHARD_VNODES", "64"))
+
+MODES = ("local", "unix")
+
+_HEADER = struct.Struct(">I")
+MAX_FRAME = 64 * 1024 * 1024
+
+
+class ShardUnavailable(RuntimeError):
+    """The owning shard could not be reached (restarting, overloaded or gone)"""
+
+
+class ShardCallError(RuntimeError):
+    """The owning shard ran the operation and it raised"""
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hashing of keys onto shard indices, with virtual nodes for an even spread"""
+
+    def __init__(self, shards: int, vnodes: int = SHARD_VNODES):
+        self.shards = max(1, shards)
+        points = sorted((_hash(f"shard-{s}#{v}"), s) for s in range(self.shards) for v in range(max(1, vnodes)))
+        self._points = [p for p, _ in points]
+        self._owners = [s for _, s in points]
+
+    def owner(self, key: str) -> int:
+        if self.shards == 1:
+            return 0
+        i = bisect.bisect(self._points, _hash(key))
+        return self._owners[i % len(self._points)]
+
+
+def _send_frame(sock: socket.socket, message: Dict[str, Any]):
+    data = json.dumps(message, default=str).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _recv_exact(sock: socket.socket, n: int) -> Optional[bytes]:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            return None
+        buf += chunk
+    return bytes(buf)
+
+
+def _recv_frame(sock: socket.socket) -> Optional[Dict[str, Any]]:
+    """Next message, or None if the peer closed the connection between messages"""
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    (size,) = _HEADER.unpack(header)
+    if size > MAX_FRAME:
+        raise ValueError(f"frame of {size} bytes exceeds {MAX_FRAME}")
+    body = _recv_exact(sock, size)
+    if body is None:
+        raise ConnectionError("connection closed mid-frame")
+    return json.loads(body)
+
+
+class _ShardRequestHandler(socketserver.BaseRequestHandler):
+    def setup(self):
+        with self.server.connections_lock:
+            self.server.connections.add(self.request)
+
+    def finish(self):
+        with self.server.connections_lock:
+            self.server.connections.discard(self.request)
+
+    def handle(self):
+        # One connection carries many calls from one client thread
+        while True:
+            try:
+                message = _recv_frame(self.request)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Dropping shard connection: {e}")
+                return
+            if message is None:
+                return
+            try:
+                _send_frame(self.request, self.server.router.serve(message))
+            except OSError as e:
+                logger.warning(f"Shard caller went away before its reply: {e}")
+                return
+
+
+class _ShardServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, router: "ShardRouter"):
+        super().__init__(path, _ShardRequestHandler)
+        self.router = router
+        self.connections = set()
+        self.connections_lock = threading.Lock()
+
+    def close_connections(self):
+        with self.connections_lock:
+            connections = list(self.connections)
+        for sock in connections:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class ShardRouter:
+    def __init__(self, shards: int = SHARD_COUNT, index: int = SHARD_INDEX, mode: str = SHARD_MODE,
+                 socket_dir: str = SHARD_SOCKET_DIR, timeout: float = SHARD_CALL_TIMEOUT):
+        if mode not in MODES:
+            raise ValueError(f"unknown sharding mode {mode!r}; expected one of {', '.join(MODES)}")
+        self.mode = mode
+        # Local mode is one process, so it owns everything
+        self.shards = max(1, shards) if mode == "unix" else 1
+        self.index = index if mode == "unix" else 0
+        if not 0 <= self.index < self.shards:
+            raise ValueError(f"shard index {index} out of range for {self.shards} shard(s)")
+        self.socket_dir = socket_dir
+        self.timeout = timeout
+        self.ring = HashRing(self.shards)
+        self._handlers: Dict[str, Callable[..., Any]] = {}
+        self._local = threading.local()
+        self._server: Optional[_ShardServer] = None
+        self._lock = threading.Lock()
+        self.local_calls = 0
+        self.forwarded_calls = 0
+        self.served_calls = 0
+        self.unavailable = 0
+
+    def handler(self, name: str):
+        """Register an operation that can be run on the shard owning its key"""
+        def register(fn):
+            self._handlers[name] = fn
+            return fn
+        return register
+
+    def socket_path(self, index: int) -> str:
+        return os.path.join(self.socket_dir, f"shard-{index}.sock")
+
+    def owner(self, key: str) -> int:
+        return self.ring.owner(key)
+
+    def is_local(self, key: str) -> bool:
+        return self.owner(key) == self.index
+
+    def start(self):
+        """Listen for calls forwarded by other shards (no-op in local mode or with a single shard)"""
+        if self.mode != "unix" or self.shards == 1 or self._server is not None:
+            return
+        os.makedirs(self.socket_dir, exist_ok=True)
+        path = self.socket_path(self.index)
+        # Left behind by the worker this one replaces; the slot is ours now
+        if os.path.exists(path):
+            os.unlink(path)
+        server = _ShardServer(path, self)
+        threading.Thread(target=server.serve_forever, name=f"shard-{self.index}", daemon=True).start()
+        self._server = server
+        logger.info(f"Orchestrator shard {self.index}/{self.shards} listening on {path}")
+
+    def stop(self):
+        """Stop listening and drop connections from other shards, as if this worker had exited"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server.close_connections()
+            if os.path.exists(self.socket_path(self.index)):
+                os.unlink(self.socket_path(self.index))
+            self._server = None
+
+    def serve(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            self.served_calls += 1
+        try:
+            return {"ok": True, "result": self.dispatch(message["op"], message.get("args", []))}
+        except Exception as e:
+            logger.exception(f"Shard operation {message.get('op')} failed")
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+    def dispatch(self, op: str, args: List[Any]) -> Any:
+        fn = self._handlers.get(op)
+        if fn is None:
+            raise KeyError(f"unknown shard operation {op!r}")
+        return fn(*args)
+
+    def call(self, key: str, op: str, *args) -> Any:
+        """Run ``op(*args)`` on the shard that owns ``key`` and return its result"""
+        owner = self.owner(key)
+        if owner == self.index:
+            with self._lock:
+                self.local_calls += 1
+            return self.dispatch(op, list(args))
+        with self._lock:
+            self.forwarded_calls += 1
+        return self._remote(owner, op, list(args))
+
+    def broadcast(self, op: str, *args) -> List[Any]:
+        """Run ``op`` on every shard; unreachable shards are logged and left out"""
+        results = []
+        for index in range(self.shards):
+            try:
+                results.append(self.dispatch(op, list(args)) if index == self.index
+                               else self._remote(index, op, list(args)))
+            except ShardUnavailable as e:
+                logger.warning(f"Shard {index} skipped in {op} broadcast: {e}")
+        return results
+
+    def _connection(self, index: int) -> socket.socket:
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = self._local.connections = {}
+        sock = connections.get(index)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path(index))
+            except OSError as e:
+                sock.close()
+                with self._lock:
+                    self.unavailable += 1
+                raise ShardUnavailable(f"shard {index} unreachable: {e}") from e
+            connections[index] = sock
+        return sock
+
+    def _drop_connection(self, index: int):
+        sock = getattr(self._local, "connections", {}).pop(index, None)
+        if sock is not None:
+            sock.close()
+
+    def _remote(self, index: int, op: str, args: List[Any]) -> Any:
+        for attempt in range(2):
+            reused = index in getattr(self._local, "connections", {})
+            sock = self._connection(index)
+            try:
+                _send_frame(sock, {"op": op, "args": args})
+                reply = _recv_frame(sock)
+            except socket.timeout as e:
+                self._drop_connection(index)
+                with self._lock:
+                    self.unavailable += 1
+                raise ShardUnavailable(f"shard {index} did not answer {op} within {self.timeout}s") from e
+            except OSError as e:
+                self._drop_connection(index)
+                if reused and attempt == 0:
+                    continue  # the peer closed an idle pooled connection; one fresh try
+                with self._lock:
+                    self.unavailable += 1
+                raise ShardUnavailable(f"shard {index} failed during {op}: {e}") from e
+            if reply is None:
+                self._drop_connection(index)
+                if reused and attempt == 0:
+                    continue
+                with self._lock:
+                    self.unavailable += 1
+                raise ShardUnavailable(f"shard {index} closed the connection during {op}")
+            if not reply["ok"]:
+                raise ShardCallError(reply["error"])
+            return reply["result"]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "shards": self.shards,
+                "index": self.index,
+                "socket": self.socket_path(self.index) if self._server is not None else None,
+                "local_calls": self.local_calls,
+                "forwarded_calls": self.forwarded_calls,
+                "served_calls": self.served_calls,
+                "unavailable": self.unavailable,
+            }
+
+
+orchestrator_shards = ShardRouter()
@@ -1,40 +1,301 @@
-import os, sqlite3, threading, json
+"""
+Sqlite storage for orchestrator tasks.
 
-_DB_LOCK = threading.Lock()
-_DB_PATH = os.path.join(os.path.dirname(__file__), 'orchestrator.db')
+Every thread keeps one persistent connection per database file, opened in WAL
+mode with ``synchronous=NORMAL`` and a larger page cache, instead of
+connecting and closing on each call. In WAL mode readers work from a snapshot
+and never wait for the writer. Writers only take ``_WRITE_LOCK``, which
+serializes them inside the process so they do not spin on ``SQLITE_BUSY``;
+across processes sqlite's own lock and ``busy_timeout`` do that.
+
+``query_tasks`` streams a formation's history in ``(created_at, id)`` order
+using keyset pagination: each batch is a bounded indexed range scan starting
+after the last row seen, so the cost of a page does not grow with its
+offset. Rows come back as ``StoredTask`` objects that only decode their
+results when ``results`` is read.
+
+Results are written as ``results_blob`` in the binary format of
+``results_codec`` (``ORCHESTRATOR_RESULTS_FORMAT=binary``, the default), with
+long strings such as system prompts stored once in ``result_strings``. Rows
+written as JSON text (``results_json``) by earlier versions, or with
+``ORCHESTRATOR_RESULTS_FORMAT=json``, are still read.
+
+Run ``python -m ai_engine.orchestrator.storage [tasks]`` to compare task
+throughput with the old connect-per-call implementation, and add
+``--results`` to compare database size and encode cost of JSON vs binary
+results, or ``--search`` to time indexing and full-text search.
+
+Retention (see ``retention``) moves old rows out of ``tasks`` into
+time-partitioned archive tables, ``tasks_archive_YYYY_MM`` (or
+``tasks_archive_YYYY_MM_DD`` with ``ORCHESTRATOR_ARCHIVE_PARTITION=day``) by
+``created_at``, so the live table and its indexes stay the size of the
+retention window and a whole period can be dropped at once. Interned result
+strings are kept for archived rows; dropping a partition leaves its strings
+behind, as finding unreferenced ones would mean decoding every remaining blob.
+
+``tasks_fts`` is an FTS5 index over each live task's description and agent
+output (``results["agent_output"]``). Output sits inside the encoded results
+blob, where a trigger cannot read it, so ``_write_tasks`` maintains the index
+in the same transaction as the rows: it compares the indexed text of the
+batch's tasks and re-indexes only those whose text (or rowid, after a
+REPLACE) changed, so status-only updates cost one lookup. Archiving a row
+removes it from the index. ``search_tasks`` returns bm25-ranked pages with
+snippets. FTS5 scores every match before it can apply a LIMIT, so a query
+matching a large share of the history is ordered as its newest
+``ORCHESTRATOR_SEARCH_RANK_WINDOW`` matches (found by walking the match list in
+rowid order, which is cheap) by rank, then the older ones by rank; only pages
+past the window pay for ranking the rest. bm25 still counts every match of
+each term to weigh it, so words present in most tasks stay slower to rank
+than selective ones. ``--search`` benchmarks this on a large history.
+"""
+
+import base64
+import itertools
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .results_codec import ResultsCodec
+
+_WRITE_LOCK = threading.Lock()
+_DB_PATH = os.getenv('ORCHESTRATOR_DB_PATH', os.path.join(os.path.dirname(__file__), 'orchestrator.db'))
+BUSY_TIMEOUT_MS = int(os.getenv('ORCHESTRATOR_DB_BUSY_TIMEOUT_MS', '5000'))
+CACHE_KB = int(os.getenv('ORCHESTRATOR_DB_CACHE_KB', '16384'))
+MMAP_BYTES = int(os.getenv('ORCHESTRATOR_DB_MMAP_BYTES', str(64 * 1024 * 1024)))
+QUERY_BATCH_SIZE = int(os.getenv('ORCHESTRATOR_QUERY_BATCH', '500'))
+RESULTS_FORMAT = os.getenv('ORCHESTRATOR_RESULTS_FORMAT', 'binary').lower()
+ARCHIVE_PARTITION = os.getenv('ORCHESTRATOR_ARCHIVE_PARTITION', 'month').lower()
+# Rows moved per archive transaction, so one run never holds the write lock for long
+ARCHIVE_BATCH = int(os.getenv('ORCHESTRATOR_ARCHIVE_BATCH', '5000'))
+# Agent output beyond this many characters is not indexed (the stored results keep all of it)
+SEARCH_OUTPUT_MAX_CHARS = int(os.getenv('ORCHESTRATOR_SEARCH_OUTPUT_MAX_CHARS', '65536'))
+SEARCH_SNIPPET_TOKENS = int(os.getenv('ORCHESTRATOR_SEARCH_SNIPPET_TOKENS', '16'))
+# Broad queries rank only their most recent this-many matches (0 ranks every match)
+SEARCH_RANK_WINDOW = int(os.getenv('ORCHESTRATOR_SEARCH_RANK_WINDOW', '2000'))
 
 _SCHEMA = [
     "CREATE TABLE IF NOT EXISTS tasks (id TEXT PRIMARY KEY, formation TEXT, description TEXT, assigned_to TEXT, status TEXT, results_json TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)",
-    "CREATE INDEX IF NOT EXISTS idx_tasks_formation ON tasks(formation)"
+    # Keyset order, plus one per filter so each filtered scan is still an ordered index range
+    "CREATE INDEX IF NOT EXISTS idx_tasks_formation_created ON tasks(formation, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_formation_status_created ON tasks(formation, status, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_formation_agent_created ON tasks(formation, assigned_to, created_at, id)",
+    # Covered by idx_tasks_formation_created
+    "DROP INDEX IF EXISTS idx_tasks_formation",
+    # Interned result strings (prompts, long outputs), keyed by content digest
+    "CREATE TABLE IF NOT EXISTS result_strings (digest BLOB PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID",
 ]
 
+# Full-text index keyed by tasks.rowid; descriptions weigh twice as much as output in the ranking
+_SEARCH_SCHEMA = [
+    "CREATE VIRTUAL TABLE tasks_fts USING fts5(description, output, tokenize='porter unicode61 remove_diacritics 2')",
+    "INSERT INTO tasks_fts(tasks_fts, rank) VALUES('rank', 'bm25(2.0, 1.0)')",
+]
+
+_codec = ResultsCodec()
+# Digests known to be in result_strings for the current database, so repeats skip the insert
+_stored_strings: set = set()
+_stored_strings_path: Optional[str] = None
+STORED_STRINGS_MAX = 100_000
+
+_local = threading.local()
+
+
+def _conn() -> sqlite3.Connection:
+    """This thread's connection to the current database file (tests repoint ``_DB_PATH``)"""
+    connections: Dict[str, sqlite3.Connection] = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(_DB_PATH)
+    if conn is None:
+        # Autocommit; writes open their own transaction
+        conn = sqlite3.connect(_DB_PATH, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        conn.execute(f"PRAGMA cache_size=-{CACHE_KB}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA mmap_size={MMAP_BYTES}")
+        connections[_DB_PATH] = conn
+    return conn
+
+
+def close_connections():
+    """Close this thread's connections (others close when their thread's storage is collected)"""
+    for conn in getattr(_local, 'connections', {}).values():
+        conn.close()
+    _local.connections = {}
+
+
 def init_db():
-    with _DB_LOCK:
-        conn = sqlite3.connect(_DB_PATH)
-        cur = conn.cursor()
+    with _WRITE_LOCK:
+        conn = _conn()
         for stmt in _SCHEMA:
-            cur.execute(stmt)
-        conn.commit()
-        conn.close()
+            conn.execute(stmt)
+        columns = {r[1] for r in conn.execute("PRAGMA table_info(tasks)")}
+        if "results_blob" not in columns:
+            conn.execute("ALTER TABLE tasks ADD COLUMN results_blob BLOB")
+        # Checked inside the transaction, as another worker may be creating the index too
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM sqlite_master WHERE name='tasks_fts'").fetchone() is None:
+                for stmt in _SEARCH_SCHEMA:
+                    conn.execute(stmt)
+                _index_existing(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+def _agent_output(results) -> str:
+    """The indexed output text of a results dict or its JSON text"""
+    if isinstance(results, str):
+        try:
+            results = json.loads(results)
+        except ValueError:
+            return ''
+    output = results.get('agent_output') if isinstance(results, dict) else None
+    if output is None:
+        return ''
+    return (output if isinstance(output, str) else json.dumps(output, default=str))[:SEARCH_OUTPUT_MAX_CHARS]
+
+
+def _index_existing(conn: sqlite3.Connection):
+    """Index the rows of a database written before tasks_fts existed (once, when it is created)"""
+    rows = conn.execute("SELECT rowid, description, results_json, results_blob FROM tasks")
+    while True:
+        batch = rows.fetchmany(QUERY_BATCH_SIZE)
+        if not batch:
+            return
+        conn.executemany("INSERT INTO tasks_fts(rowid, description, output) VALUES (?,?,?)",
+                         [(rowid, description or '', _agent_output(decode_results(results_json, results_blob)))
+                          for rowid, description, results_json, results_blob in batch])
+
+
+def _indexed(conn: sqlite3.Connection, ids: str) -> Dict[str, Tuple[int, bool, str, str]]:
+    """task id -> (rowid, has an index entry, indexed description, indexed output) for the ids in JSON ``ids``"""
+    return {r[0]: r[1:] for r in conn.execute(
+        "SELECT t.id, t.rowid, f.rowid IS NOT NULL, f.description, f.output FROM tasks t "
+        "LEFT JOIN tasks_fts f ON f.rowid = t.rowid WHERE t.id IN (SELECT value FROM json_each(?))", (ids,))}
+
+
+def _reindex(conn: sqlite3.Connection, docs: Dict[str, Tuple[str, str]], ids: str,
+             before: Dict[str, Tuple[int, bool, str, str]]):
+    """Bring the index entries of the just-written tasks in ``docs`` up to date"""
+    rowids = dict(conn.execute("SELECT id, rowid FROM tasks WHERE id IN (SELECT value FROM json_each(?))", (ids,)))
+    stale, fresh = [], []
+    for task_id, (description, output) in docs.items():
+        rowid = rowids.get(task_id)
+        old = before.get(task_id)
+        if old is not None and old[1]:
+            if old[0] == rowid and old[2] == description and old[3] == output:
+                continue
+            stale.append((old[0],))
+        if rowid is not None:
+            fresh.append((rowid, description, output))
+    if stale:
+        conn.executemany("DELETE FROM tasks_fts WHERE rowid=?", stale)
+    if fresh:
+        conn.executemany("INSERT INTO tasks_fts(rowid, description, output) VALUES (?,?,?)", fresh)
+
+
+def _encode_rows(rows) -> Tuple[List[Tuple], List[Tuple[bytes, str]]]:
+    """(id, formation, description, assigned_to, status, results) rows, where results is a dict or
+    already-serialized JSON text, to table rows plus the interned strings they need"""
+    global _stored_strings, _stored_strings_path
+    if _stored_strings_path != _DB_PATH:
+        _stored_strings, _stored_strings_path = set(), _DB_PATH
+    encoded, strings = [], {}
+    for task_id, formation, description, assigned_to, status, results in rows:
+        if isinstance(results, str) or RESULTS_FORMAT == 'json':
+            text = results if isinstance(results, str) else json.dumps(results, default=str)
+            encoded.append((task_id, formation, description, assigned_to, status, text, None))
+            continue
+        blob, shared = _codec.encode(results)
+        strings.update(shared)
+        encoded.append((task_id, formation, description, assigned_to, status, None, blob))
+    return encoded, [(k, v) for k, v in strings.items() if k not in _stored_strings]
+
+
+def _write_tasks(sql: str, rows):
+    rows = list(rows)
+    encoded, strings = _encode_rows(rows)
+    if not encoded:
+        return
+    docs = {row[0]: (row[2] or '', _agent_output(row[5])) for row in rows}
+    ids = json.dumps(list(docs))
+    with _WRITE_LOCK:
+        conn = _conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if strings:
+                conn.executemany("INSERT OR IGNORE INTO result_strings (digest, value) VALUES (?,?)", strings)
+            before = _indexed(conn, ids)
+            conn.executemany(sql, encoded)
+            _reindex(conn, docs, ids, before)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        if len(_stored_strings) > STORED_STRINGS_MAX:
+            _stored_strings.clear()
+        _stored_strings.update(k for k, _ in strings)
 
 
 def save_task(task, formation):
-    with _DB_LOCK:
-        conn = sqlite3.connect(_DB_PATH)
-        cur = conn.cursor()
-        cur.execute("REPLACE INTO tasks (id, formation, description, assigned_to, status, results_json) VALUES (?,?,?,?,?,?)",
-                    (task.id, formation, task.description, task.assigned_to, task.status, json.dumps(task.results)))
-        conn.commit()
-        conn.close()
+    _write_tasks("REPLACE INTO tasks (id, formation, description, assigned_to, status, results_json, results_blob) "
+                 "VALUES (?,?,?,?,?,?,?)",
+                 [(task.id, formation, task.description, task.assigned_to, task.status, task.results)])
+
+
+_UPSERT = ("INSERT INTO tasks (id, formation, description, assigned_to, status, results_json, results_blob) "
+           "VALUES (?,?,?,?,?,?,?) "
+           "ON CONFLICT(id) DO UPDATE SET formation=excluded.formation, description=excluded.description, "
+           "assigned_to=excluded.assigned_to, status=excluded.status, results_json=excluded.results_json, "
+           "results_blob=excluded.results_blob")
+
+
+def save_tasks(rows):
+    """Upsert many (id, formation, description, assigned_to, status, results) rows in one transaction.
+
+    ``results`` is a dict (stored in the binary format) or JSON text (stored as
+    is). Unlike save_task's REPLACE, the upsert keeps the row's original created_at.
+    """
+    _write_tasks(_UPSERT, rows)
+
+
+def save_tasks_bulk(tasks: Iterable, formation: str) -> int:
+    """Upsert many tasks of one formation with a single executemany in one transaction"""
+    rows = [(task.id, formation, task.description, task.assigned_to, task.status, task.results) for task in tasks]
+    save_tasks(rows)
+    return len(rows)
+
+
+def _string(key: bytes) -> str:
+    row = _conn().execute("SELECT value FROM result_strings WHERE digest=?", (key,)).fetchone()
+    if row is None:
+        raise KeyError(f"interned result string {key.hex()} missing")
+    return row[0]
+
+
+def decode_results(results_json: Optional[str], results_blob: Optional[bytes]) -> Dict[str, Any]:
+    if results_blob is not None:
+        return _codec.decode(results_blob, _string)
+    return json.loads(results_json) if results_json else {}
+
+
+def list_formations():
+    return [r[0] for r in _conn().execute("SELECT DISTINCT formation FROM tasks")]
 
 
 def load_tasks(formation):
-    with _DB_LOCK:
-        conn = sqlite3.connect(_DB_PATH)
-        cur = conn.cursor()
-        cur.execute("SELECT id, description, assigned_to, status, results_json FROM tasks WHERE formation=? ORDER BY created_at", (formation,))
-        rows = cur.fetchall()
-        conn.close()
+    rows = _conn().execute(
+        "SELECT id, description, assigned_to, status, results_json, results_blob FROM tasks WHERE formation=? "
+        "ORDER BY created_at, rowid", (formation,)).fetchall()
     tasks = []
     for r in rows:
         tasks.append({
@@ -42,6 +303,515 @@ def load_tasks(formation):
             'description': r[1],
             'assigned_to': r[2],
             'status': r[3],
-            'results': json.loads(r[4]) if r[4] else {}
+            'results': decode_results(r[4], r[5])
         })
     return tasks
+
+
+class StoredTask:
+    """A task row; ``results`` is decoded on first access"""
+
+    __slots__ = ("id", "formation", "description", "assigned_to", "status", "created_at", "results_json",
+                 "results_blob", "_results")
+
+    _UNDECODED = object()
+
+    def __init__(self, id, formation, description, assigned_to, status, created_at, results_json, results_blob=None):
+        self.id = id
+        self.formation = formation
+        self.description = description
+        self.assigned_to = assigned_to
+        self.status = status
+        self.created_at = created_at
+        self.results_json = results_json
+        self.results_blob = results_blob
+        self._results = self._UNDECODED
+
+    @property
+    def results(self) -> Dict[str, Any]:
+        if self._results is self._UNDECODED:
+            self._results = decode_results(self.results_json, self.results_blob)
+        return self._results
+
+    @property
+    def cursor(self) -> str:
+        return encode_cursor(self.created_at, self.id)
+
+    def to_json(self, include_results: bool = True) -> str:
+        """One JSON object; results stored as JSON text are spliced in as-is rather than decoded and re-encoded"""
+        head = json.dumps({"id": self.id, "formation": self.formation, "description": self.description,
+                           "assigned_to": self.assigned_to, "status": self.status, "created_at": self.created_at,
+                           "cursor": self.cursor})
+        if not include_results:
+            return head
+        if self.results_blob is not None:
+            return f'{head[:-1]}, "results": {json.dumps(self.results, default=str)}}}'
+        return f'{head[:-1]}, "results": {self.results_json or "{}"}}}'
+
+
+def encode_cursor(created_at: str, task_id: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([created_at, task_id]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Raises ValueError for anything that is not a cursor from ``encode_cursor``"""
+    try:
+        created_at, task_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception as e:
+        raise ValueError(f"invalid cursor: {cursor!r}") from e
+    return str(created_at), str(task_id)
+
+
+def _from_epoch(seconds: float) -> datetime:
+    try:
+        return datetime.fromtimestamp(seconds, tz=timezone.utc)
+    except (OverflowError, OSError) as e:
+        raise ValueError(f"timestamp out of range: {seconds!r}") from e
+
+
+def to_timestamp(value: Union[str, float, int, datetime]) -> str:
+    """Normalize a bound to created_at's 'YYYY-MM-DD HH:MM:SS' UTC text; numbers are epoch seconds.
+
+    Raises ValueError for unparseable or out-of-range values.
+    """
+    if isinstance(value, (int, float)):
+        value = _from_epoch(value)
+    elif isinstance(value, str):
+        try:
+            seconds = float(value)
+        except ValueError:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        else:
+            value = _from_epoch(seconds)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def query_tasks(formation: str, statuses: Optional[Iterable[str]] = None, agent_id: Optional[str] = None,
+                since=None, until=None, after: Optional[str] = None, limit: Optional[int] = None,
+                batch_size: int = QUERY_BATCH_SIZE) -> Iterator[StoredTask]:
+    """Stream a formation's tasks in (created_at, id) order, ``batch_size`` rows per query.
+
+    ``statuses``/``agent_id`` filter, ``since`` (inclusive) and ``until``
+    (exclusive) bound created_at, ``after`` is a cursor from a previous row and
+    ``limit`` caps the number of rows yielded. No query stays open between
+    batches, so a slow consumer does not hold a read snapshot.
+    """
+    where = ["formation=?"]
+    params: List[Any] = [formation]
+    statuses = list(statuses or [])
+    if statuses:
+        where.append(f"status IN ({','.join('?' * len(statuses))})")
+        params += statuses
+    if agent_id:
+        where.append("assigned_to=?")
+        params.append(agent_id)
+    if since is not None:
+        where.append("created_at>=?")
+        params.append(to_timestamp(since))
+    if until is not None:
+        where.append("created_at<?")
+        params.append(to_timestamp(until))
+    sql = ("SELECT id, formation, description, assigned_to, status, created_at, results_json, results_blob FROM tasks WHERE "
+           + " AND ".join(where) + " AND (created_at, id) > (?, ?) ORDER BY created_at, id LIMIT ?")
+    position = decode_cursor(after) if after else ("", "")
+    remaining = limit
+    batch_size = max(1, batch_size)
+    while remaining is None or remaining > 0:
+        size = batch_size if remaining is None else min(batch_size, remaining)
+        rows = _conn().execute(sql, (*params, *position, size)).fetchall()
+        for row in rows:
+            yield StoredTask(*row)
+        if len(rows) < size:
+            return
+        if remaining is not None:
+            remaining -= len(rows)
+        position = (rows[-1][5], rows[-1][0])
+
+
+def page_tasks(formation: str, cursor: Optional[str] = None, limit: int = 100,
+               **filters) -> Tuple[List[StoredTask], Optional[str]]:
+    """One keyset page; returns (tasks, next_cursor), next_cursor None on the last page"""
+    tasks = list(query_tasks(formation, after=cursor, limit=limit + 1, batch_size=limit + 1, **filters))
+    if len(tasks) > limit:
+        return tasks[:limit], tasks[limit - 1].cursor
+    return tasks, None
+
+
+ARCHIVE_PREFIX = 'tasks_archive_'
+# Length of the created_at prefix ('YYYY-MM' / 'YYYY-MM-DD') naming a row's partition
+_PARTITION_WIDTH = {'month': 7, 'day': 10}
+_PARTITION_KEY = re.compile(r'^\d{4}-\d{2}(-\d{2})?$')
+_TASK_COLUMNS = "id, formation, description, assigned_to, status, results_json, created_at, results_blob"
+
+
+def _archive_table(conn: sqlite3.Connection, key: Optional[str]) -> str:
+    name = ARCHIVE_PREFIX + (key.replace('-', '_') if key and _PARTITION_KEY.match(key) else 'undated')
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {name} (id TEXT PRIMARY KEY, formation TEXT, description TEXT, "
+                 "assigned_to TEXT, status TEXT, results_json TEXT, created_at TIMESTAMP, results_blob BLOB, "
+                 "archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{name}_formation_created ON {name}(formation, created_at, id)")
+    return name
+
+
+def _archive(select_sql: str, params) -> Dict[str, List[str]]:
+    """Move the rows whose ids ``select_sql`` yields from tasks into their partitions in one
+    transaction; returns {partition table: [task ids]}"""
+    width = _PARTITION_WIDTH.get(ARCHIVE_PARTITION, 7)
+    moved: Dict[str, List[str]] = {}
+    with _WRITE_LOCK:
+        conn = _conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS archive_batch (id TEXT PRIMARY KEY, part TEXT)")
+            conn.execute("DELETE FROM temp.archive_batch")
+            conn.execute(f"INSERT OR IGNORE INTO temp.archive_batch SELECT id, substr(created_at, 1, {width}) "
+                         f"FROM tasks WHERE id IN ({select_sql})", params)
+            for (key,) in conn.execute("SELECT DISTINCT part FROM temp.archive_batch").fetchall():
+                table = _archive_table(conn, key)
+                batch = "SELECT id FROM temp.archive_batch WHERE part IS ?"
+                conn.execute(f"INSERT OR REPLACE INTO {table} ({_TASK_COLUMNS}) "
+                             f"SELECT {_TASK_COLUMNS} FROM tasks WHERE id IN ({batch})", (key,))
+                moved.setdefault(table, []).extend(r[0] for r in conn.execute(batch, (key,)))
+            conn.execute("DELETE FROM tasks_fts WHERE rowid IN "
+                         "(SELECT rowid FROM tasks WHERE id IN (SELECT id FROM temp.archive_batch))")
+            conn.execute("DELETE FROM tasks WHERE id IN (SELECT id FROM temp.archive_batch)")
+            conn.execute("DELETE FROM temp.archive_batch")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    return moved
+
+
+def archive_tasks(task_ids: Iterable[str]) -> Dict[str, List[str]]:
+    """Move these tasks into their archive partitions; ids without a stored row are skipped"""
+    ids = list(task_ids)
+    moved: Dict[str, List[str]] = {}
+    for start in range(0, len(ids), ARCHIVE_BATCH):
+        chunk = ids[start:start + ARCHIVE_BATCH]
+        # json_each keeps the statement's parameter count fixed however large the chunk
+        for table, archived in _archive("SELECT value FROM json_each(?)", (json.dumps(chunk),)).items():
+            moved.setdefault(table, []).extend(archived)
+    return moved
+
+
+def archive_before(formation: str, before, statuses: Iterable[str],
+                   limit: int = ARCHIVE_BATCH) -> Dict[str, List[str]]:
+    """Archive up to ``limit`` of a formation's stored rows in ``statuses`` created before ``before``,
+    including rows of tasks that were never loaded into memory"""
+    statuses = list(statuses)
+    if not statuses:
+        return {}
+    return _archive(f"SELECT id FROM tasks WHERE formation=? AND status IN ({','.join('?' * len(statuses))}) "
+                    "AND created_at<? ORDER BY created_at LIMIT ?",
+                    (formation, *statuses, to_timestamp(before), max(1, limit)))
+
+
+def archive_partitions() -> List[Dict[str, Any]]:
+    """Archive tables, oldest first, with their row counts"""
+    conn = _conn()
+    names = [r[0] for r in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name LIKE ? ESCAPE '\\' ORDER BY name",
+        (ARCHIVE_PREFIX.replace('_', '\\_') + '%',))]
+    return [{'partition': name, 'rows': conn.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0]}
+            for name in names]
+
+
+def archived_tasks(formation: str, partitions: Optional[Iterable[str]] = None) -> Iterator[StoredTask]:
+    """A formation's archived tasks, partition by partition in (created_at, id) order"""
+    names = list(partitions) if partitions is not None else [p['partition'] for p in archive_partitions()]
+    for name in names:
+        if not name.startswith(ARCHIVE_PREFIX) or not name.replace('_', '').isalnum():
+            raise ValueError(f"not an archive partition: {name!r}")
+        rows = _conn().execute("SELECT id, formation, description, assigned_to, status, created_at, results_json, "
+                               f"results_blob FROM {name} WHERE formation=? ORDER BY created_at, id", (formation,))
+        for row in rows:
+            yield StoredTask(*row)
+
+
+def drop_archive_partitions(keep: int) -> List[str]:
+    """Drop all but the newest ``keep`` dated archive partitions; returns the dropped tables"""
+    dated = [p['partition'] for p in archive_partitions() if not p['partition'].endswith('undated')]
+    dropped = dated[:max(0, len(dated) - keep)]
+    if dropped:
+        with _WRITE_LOCK:
+            conn = _conn()
+            for name in dropped:
+                conn.execute(f"DROP TABLE IF EXISTS {name}")
+    return dropped
+
+
+def checkpoint() -> Dict[str, int]:
+    """Checkpoint the WAL into the database and truncate it, returning its disk space"""
+    with _WRITE_LOCK:
+        busy, log_pages, checkpointed = _conn().execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+    return {'busy': busy, 'wal_pages': log_pages, 'checkpointed_pages': checkpointed}
+
+
+def match_expression(text: str) -> str:
+    """Free text to an FTS5 query matching every word; a trailing ``*`` on a word makes it a prefix"""
+    terms = []
+    for word in text.split():
+        prefix = word.endswith('*')
+        word = word.rstrip('*')
+        if word:
+            terms.append('"' + word.replace('"', '""') + '"' + ('*' if prefix else ''))
+    return ' '.join(terms)
+
+
+def search_tasks(query: str, formation: Optional[str] = None, statuses: Optional[Iterable[str]] = None,
+                 limit: int = 20, offset: int = 0, raw: bool = False) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """Live tasks matching ``query`` in their description or agent output, best match first.
+
+    ``query`` is free text (every word must match) or, with ``raw``, FTS5 query
+    syntax. Returns (hits, next_offset), next_offset None on the last page.
+    Snippets mark matches with ``<mark>``; the surrounding text is not escaped.
+    """
+    match = query.strip() if raw else match_expression(query)
+    if not match:
+        return [], None
+    where, params = ["tasks_fts MATCH ?"], [match]
+    if formation:
+        where.append("t.formation=?")
+        params.append(formation)
+    statuses = list(statuses or [])
+    if statuses:
+        where.append(f"t.status IN ({','.join('?' * len(statuses))})")
+        params += statuses
+    # CROSS JOIN keeps the full-text match as the outer loop, whatever the planner thinks of the filters
+    source = "FROM tasks_fts CROSS JOIN tasks t ON t.rowid = tasks_fts.rowid WHERE " + " AND ".join(where)
+    columns = ("SELECT t.id, t.formation, t.description, t.assigned_to, t.status, t.created_at, "
+               "snippet(tasks_fts, -1, '<mark>', '</mark>', '…', ?), rank ")
+    newer = columns + source + " AND tasks_fts.rowid >= ? ORDER BY rank LIMIT ? OFFSET ?"
+    older = columns + source + " AND tasks_fts.rowid < ? ORDER BY rank LIMIT ? OFFSET ?"
+    limit, offset = max(1, limit), max(0, offset)
+    page = limit + 1
+    conn = _conn()
+    try:
+        floor = None
+        if SEARCH_RANK_WINDOW > 0:
+            row = conn.execute("SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ? ORDER BY rowid DESC LIMIT 1 OFFSET ?",
+                               (match, SEARCH_RANK_WINDOW - 1)).fetchone()
+            floor = row[0] if row else None
+        if floor is None:
+            # Fewer matches than the window: rank them all
+            rows = conn.execute(newer, (SEARCH_SNIPPET_TOKENS, *params, -2 ** 63, page, offset)).fetchall()
+        else:
+            rows = conn.execute(newer, (SEARCH_SNIPPET_TOKENS, *params, floor, page, offset)).fetchall()
+            if len(rows) < page:
+                in_window = conn.execute("SELECT COUNT(*) " + source + " AND tasks_fts.rowid >= ?",
+                                         (*params, floor)).fetchone()[0]
+                rows += conn.execute(older, (SEARCH_SNIPPET_TOKENS, *params, floor, page - len(rows),
+                                             max(0, offset - in_window))).fetchall()
+    except sqlite3.OperationalError as e:
+        raise ValueError(f"invalid search query: {e}") from e
+    hits = [{'id': r[0], 'formation': r[1], 'description': r[2], 'assigned_to': r[3], 'status': r[4],
+             'created_at': r[5], 'snippet': r[6], 'score': round(-r[7], 6)} for r in rows[:limit]]
+    return hits, (offset + limit if len(rows) > limit else None)
+
+
+def benchmark(tasks: int = 2000, readers: int = 2) -> Dict[str, object]:
+    """Tasks per second for single and bulk saves, and reads completed while a writer runs, compared with
+    the previous implementation (connect per call, rollback journal, one lock around readers and writers)"""
+    import tempfile
+    import time
+    from types import SimpleNamespace
+
+    global _DB_PATH
+    items = [SimpleNamespace(id=f"task-{i}", description=f"benchmark task {i}", assigned_to="agent-1",
+                             status="completed", results={"agent_output": "x" * 200, "score": i}) for i in range(tasks)]
+    legacy_lock = threading.Lock()
+
+    def legacy_save(path, task):
+        with legacy_lock:
+            conn = sqlite3.connect(path)
+            conn.execute("REPLACE INTO tasks (id, formation, description, assigned_to, status, results_json) "
+                         "VALUES (?,?,?,?,?,?)", (task.id, "Bench", task.description, task.assigned_to,
+                                                   task.status, json.dumps(task.results)))
+            conn.commit()
+            conn.close()
+
+    def legacy_load(path):
+        with legacy_lock:
+            conn = sqlite3.connect(path)
+            rows = conn.execute("SELECT id, results_json FROM tasks WHERE formation=? LIMIT 100", ("Bench",)).fetchall()
+            conn.close()
+        return rows
+
+    def pooled_load(path):
+        return _conn().execute("SELECT id, results_json FROM tasks WHERE formation=? LIMIT 100", ("Bench",)).fetchall()
+
+    def timed_writes(save, reader):
+        stop = threading.Event()
+        reads = [0] * readers
+
+        def read_loop(slot):
+            while not stop.is_set():
+                reader()
+                reads[slot] += 1
+
+        threads = [threading.Thread(target=read_loop, args=(i,)) for i in range(readers)]
+        for t in threads:
+            t.start()
+        start = time.perf_counter()
+        save()
+        elapsed = time.perf_counter() - start
+        stop.set()
+        for t in threads:
+            t.join()
+        return elapsed, sum(reads)
+
+    previous = _DB_PATH
+    results: Dict[str, object] = {"tasks": tasks, "readers": readers}
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, "legacy.db")
+        conn = sqlite3.connect(legacy_path)
+        for stmt in _SCHEMA:
+            conn.execute(stmt)
+        conn.commit()
+        conn.close()
+        elapsed, reads = timed_writes(lambda: [legacy_save(legacy_path, t) for t in items],
+                                      lambda: legacy_load(legacy_path))
+        results["legacy_save_task_per_s"] = round(tasks / elapsed)
+        results["legacy_reads_during_writes_per_s"] = round(reads / elapsed)
+
+        try:
+            _DB_PATH = os.path.join(tmp, "pooled.db")
+            init_db()
+            elapsed, reads = timed_writes(lambda: [save_task(t, "Bench") for t in items],
+                                          lambda: pooled_load(_DB_PATH))
+            results["pooled_save_task_per_s"] = round(tasks / elapsed)
+            results["pooled_reads_during_writes_per_s"] = round(reads / elapsed)
+
+            start = time.perf_counter()
+            save_tasks_bulk(items, "Bench")
+            results["bulk_save_tasks_per_s"] = round(tasks / (time.perf_counter() - start))
+            close_connections()
+        finally:
+            _DB_PATH = previous
+    return results
+
+
+def benchmark_results_formats(tasks: int = 2000, prompts: int = 10) -> Dict[str, object]:
+    """Database size and write-path serialization time for JSON text vs binary results, on results shaped
+    like real ones: a shared multi-kilobyte system prompt, a unique agent output and nested metrics"""
+    import random
+    import tempfile
+    import time
+
+    global _DB_PATH, RESULTS_FORMAT
+    rng = random.Random(7)
+    words = ["agent", "harmony", "resonance", "task", "quantum", "wisdom", "deploy", "test", "schema", "latency"]
+    prompt_texts = [" ".join(rng.choice(words) for _ in range(2000)) + f" #{i}" for i in range(prompts)]
+    rows = []
+    for i in range(tasks):
+        agent = f"agent-{i % 8}"
+        results = {
+            "agent_output": " ".join(rng.choice(words) for _ in range(250)),
+            "system_prompt": prompt_texts[i % prompts],
+            "assigned_agent": agent,
+            "team": [{"agent": agent, "role": "backend_engineer"}, {"agent": f"agent-{(i + 1) % 8}", "role": "qa"}],
+            "metrics": {"latency_ms": rng.random() * 900, "tokens": rng.randint(100, 4000), "score": rng.random(),
+                        "harmony": {"overall": rng.random(), "by_agent": {agent: rng.random()}}},
+        }
+        rows.append((f"task-{i}", "Bench", f"benchmark task {i}", agent, "completed", results))
+
+    previous_path, previous_format = _DB_PATH, RESULTS_FORMAT
+    report: Dict[str, object] = {"tasks": tasks, "distinct_prompts": prompts}
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            for fmt in ("json", "binary"):
+                _DB_PATH, RESULTS_FORMAT = os.path.join(tmp, f"{fmt}.db"), fmt
+                init_db()
+                start = time.perf_counter()
+                _encode_rows(rows)
+                encode_s = time.perf_counter() - start
+                start = time.perf_counter()
+                save_tasks(rows)
+                save_s = time.perf_counter() - start
+                conn = _conn()
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                conn.execute("VACUUM")
+                size = conn.execute("PRAGMA page_count").fetchone()[0] * conn.execute("PRAGMA page_size").fetchone()[0]
+                start = time.perf_counter()
+                for task in query_tasks("Bench"):
+                    task.results
+                read_s = time.perf_counter() - start
+                report[fmt] = {"db_bytes": size, "encode_us_per_task": round(encode_s / tasks * 1e6, 1),
+                               "save_tasks_per_s": round(tasks / save_s),
+                               "read_decode_tasks_per_s": round(tasks / read_s)}
+                close_connections()
+        finally:
+            _DB_PATH, RESULTS_FORMAT = previous_path, previous_format
+    report["size_ratio"] = round(report["binary"]["db_bytes"] / report["json"]["db_bytes"], 3)
+    return report
+
+
+def benchmark_search(tasks: int = 100_000, queries: int = 200) -> Dict[str, object]:
+    """Index-on-write cost and search latency percentiles over a ``tasks``-row history"""
+    import random
+    import tempfile
+    import time
+
+    global _DB_PATH
+    rng = random.Random(7)
+    # Zipf-distributed vocabulary, as in natural text: a few words are everywhere, most are rare
+    words = [f"w{i}" for i in range(20_000)]
+    weights = [1 / (i + 1) for i in range(len(words))]
+    cumulative = list(itertools.accumulate(weights))
+
+    def text(k):
+        return " ".join(rng.choices(words, cum_weights=cumulative, k=k))
+
+    formations = [f"Squad{i}" for i in range(20)]
+    previous_path = _DB_PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        _DB_PATH = os.path.join(tmp, "search.db")
+        try:
+            init_db()
+            start = time.perf_counter()
+            for first in range(0, tasks, 10_000):
+                batch = [(f"task-{i}", formations[i % len(formations)], text(8), "agent-1", "running",
+                          {"agent_output": text(60)}) for i in range(first, min(tasks, first + 10_000))]
+                save_tasks(batch)
+            write_s = time.perf_counter() - start
+            # Re-saving unchanged text (a status change) skips the index
+            start = time.perf_counter()
+            save_tasks([row[:4] + ("completed",) + row[5:] for row in batch[:1000]])
+            resave_s = time.perf_counter() - start
+            report = {"tasks": tasks, "write_tasks_per_s": round(tasks / write_s)}
+            report["status_only_rewrite_us"] = round(resave_s / 1000 * 1e6, 1)
+            # Words by frequency rank: the top 20 are in nearly every task, like stopwords
+            for name, pick in (("stopword_like_word", lambda: rng.choice(words[:20])),
+                               ("one_word", lambda: rng.choice(words[50:5000])),
+                               ("two_words", lambda: " ".join(rng.sample(words[50:5000], 2))),
+                               ("two_words_in_formation", lambda: " ".join(rng.sample(words[50:5000], 2))),
+                               ("rare_word", lambda: rng.choice(words[5000:]))):
+                latencies = []
+                for _ in range(queries):
+                    formation = rng.choice(formations) if name.endswith("formation") else None
+                    start = time.perf_counter()
+                    search_tasks(pick(), formation=formation, limit=20)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                latencies.sort()
+                report[name] = {"p50_ms": round(latencies[len(latencies) // 2], 2),
+                                "p95_ms": round(latencies[int(len(latencies) * 0.95)], 2)}
+            close_connections()
+        finally:
+            _DB_PATH = previous_path
+    return report
+
+
+if __name__ == "__main__":
+    import sys
+
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    count = int(args[0]) if args else 2000
+    if "--search" in sys.argv:
+        print(json.dumps(benchmark_search(count), indent=2))
+    elif "--results" in sys.argv:
+        print(json.dumps(benchmark_results_formats(count), indent=2))
+    else:
+        print(json.dumps(benchmark(count), indent=2))
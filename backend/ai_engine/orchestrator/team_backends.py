@@ -0,0 +1,368 @@
+"""
+Execution backends for multi-team orchestration.
+
+``spawn_teams_for_task`` describes each team as a ``TeamSpec`` (plain,
+picklable data: aspect, formation name and the task/resource contexts as
+dicts) and hands the specs to a backend, which runs ``run_team`` on each and
+returns the JSON-ready results in aspect order. A team borrows a pooled
+orchestrator in whatever process runs it, so nothing but specs and results
+crosses a process boundary.
+
+Backends are long-lived and shared by every call in the process:
+
+- ``thread``: a shared ThreadPoolExecutor. Cheap to dispatch, but the
+  pure-Python prompt generation and routing is serialized by the GIL.
+- ``process``: a shared ProcessPoolExecutor (``spawn`` start method by
+  default, since the web process runs threads). Teams run on separate cores;
+  each dispatch pays for pickling a spec and a result.
+- ``asyncio``: teams run as tasks on one dedicated event loop. There is no
+  thread or pickling overhead, and team handlers that await I/O overlap, but
+  synchronous work runs one team at a time.
+
+The default comes from ``TEAM_BACKEND`` and can be overridden per call.
+``map_partial`` bounds a fan-out by a timeout: it returns the teams that
+finished in time and reports the rest as unfinished. In-process backends run
+each team under the caller's cancel token, so teams still running when the
+caller cancels it stop at their next ``check_cancelled()``; process workers
+cannot see the token, so their late results are simply discarded.
+Benchmark with ``python -m ai_engine.orchestrator.team_backends``.
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import contextvars
+import inspect
+import multiprocessing
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..cancellation import TaskCancelled, cancel_scope, current_token
+from ..system_prompt import SystemPromptEngine, TaskContext, ResourceContext
+
+DEFAULT_BACKEND = os.getenv("TEAM_BACKEND", "thread").lower()
+PROCESS_START_METHOD = os.getenv("TEAM_PROCESS_START_METHOD", "spawn")
+
+
+def _cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+THREAD_WORKERS = int(os.getenv("TEAM_THREAD_WORKERS", "0")) or min(32, _cpus() + 4)
+PROCESS_WORKERS = int(os.getenv("TEAM_PROCESS_WORKERS", "0")) or _cpus()
+
+
+@dataclass
+class TeamSpec:
+    """Everything needed to run one team, in a form that pickles and JSON-encodes"""
+    aspect: str
+    formation_name: str
+    description: str
+    context: Dict[str, Any]
+    resources: Dict[str, Any]
+
+
+def run_team(spec: TeamSpec) -> Dict[str, Any]:
+    """Run one team on a pooled orchestrator of the current process"""
+    from .pool import get_pool
+    with get_pool(spec.formation_name).checkout() as orch:
+        orch.set_task_context(TaskContext(**spec.context), ResourceContext(**spec.resources))
+        subtask = orch.add_task(f"[{spec.aspect}] {spec.description}")
+        agent = orch.route_task(subtask)
+
+        # Enhanced agent work simulation with system prompt awareness
+        system_prompt = orch.get_agent_system_prompt(agent.id, subtask.id)
+
+        result = {
+            "agent": agent.id,
+            "output": f"Completed {subtask.description} by {agent.role} ({getattr(agent, 'model', 'sophia')})",
+            "aspect": spec.aspect,
+            "system_prompt_applied": bool(system_prompt),
+            "team_formation": orch.formation.name,
+            "adaptive_features": {
+                "context_aware": True,
+                "resource_optimized": True,
+                "fractal_ready": True
+            }
+        }
+
+        # Simulate performance metrics for learning
+        result["performance_metrics"] = {
+            "performance_score": 0.85,  # Simulated high performance
+            "completion_time": 0.8,     # Efficient completion
+            "quality_score": 0.9        # High quality output
+        }
+
+        orch.complete_task(subtask.id, result)
+    return result
+
+
+def render_team_prompt(spec: TeamSpec) -> Dict[str, Any]:
+    """The prompt-generation share of ``run_team`` on its own (no orchestrator); used by the benchmark"""
+    engine = SystemPromptEngine()
+    resources = ResourceContext(**spec.resources)
+    engine.initialize_agent_variables(TaskContext(**spec.context), resources)
+    description = f"[{spec.aspect}] {spec.description}"
+    context = TaskContext(**{**spec.context, "objective": description,
+                             "success_criteria": [f"Complete task: {description}"]})
+    agent_variables = engine.initialize_agent_variables(context, resources)
+    prompt = engine.generate_system_prompt(agent_variables)
+    return {"aspect": spec.aspect, "prompt_chars": len(prompt)}
+
+
+class ExecutionBackend:
+    name = "base"
+
+    def __init__(self, workers: int):
+        self.workers = max(1, workers)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.items = 0
+        self.busy_seconds = 0.0
+
+    def map(self, fn: Callable[[Any], Any], items: Sequence[Any]) -> List[Any]:
+        """Apply ``fn`` to every item and return the results in order; the first failure is raised"""
+        start = time.perf_counter()
+        try:
+            return self._map(fn, list(items))
+        finally:
+            with self._lock:
+                self.calls += 1
+                self.items += len(items)
+                self.busy_seconds += time.perf_counter() - start
+
+    def _map(self, fn, items: List[Any]) -> List[Any]:
+        raise NotImplementedError
+
+    def map_partial(self, fn: Callable[[Any], Any], items: Sequence[Any],
+                    timeout: float) -> Tuple[List[Any], List[int]]:
+        """Like ``map`` but give up after ``timeout`` seconds.
+
+        Returns the results (``None`` where unfinished) and the indices of the
+        unfinished items. Items that were cancelled count as unfinished; any
+        other failure is raised.
+        """
+        start = time.perf_counter()
+        items = list(items)
+        try:
+            return self._map_partial(fn, items, max(0.0, timeout))
+        finally:
+            with self._lock:
+                self.calls += 1
+                self.items += len(items)
+                self.busy_seconds += time.perf_counter() - start
+
+    def _map_partial(self, fn, items: List[Any], timeout: float) -> Tuple[List[Any], List[int]]:
+        futures = [self._submit(fn, item) for item in items]
+        concurrent.futures.wait(futures, timeout=timeout)
+        return _collect(futures)
+
+    def _submit(self, fn, item) -> concurrent.futures.Future:
+        raise NotImplementedError
+
+    def shutdown(self):
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": self.name,
+                "workers": self.workers,
+                "calls": self.calls,
+                "items": self.items,
+                "busy_seconds": round(self.busy_seconds, 4),
+            }
+
+
+class ThreadBackend(ExecutionBackend):
+    name = "thread"
+
+    def __init__(self, workers: int = THREAD_WORKERS):
+        super().__init__(workers)
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="team")
+
+    def _map(self, fn, items):
+        return list(self._pool.map(fn, items))
+
+    def _submit(self, fn, item):
+        # Run in a copy of the caller's context so the team sees its cancel token
+        return self._pool.submit(contextvars.copy_context().run, fn, item)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
+
+
+class ProcessBackend(ExecutionBackend):
+    name = "process"
+
+    def __init__(self, workers: int = PROCESS_WORKERS, start_method: str = PROCESS_START_METHOD):
+        super().__init__(workers)
+        self.start_method = start_method
+        self._pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context(start_method))
+
+    def _map(self, fn, items):
+        # Batch several teams per round trip so pickling and IPC do not dominate small teams
+        chunksize = max(1, len(items) // (self.workers * 4))
+        return list(self._pool.map(fn, items, chunksize=chunksize))
+
+    def _submit(self, fn, item):
+        return self._pool.submit(fn, item)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "start_method": self.start_method}
+
+
+class AsyncioBackend(ExecutionBackend):
+    name = "asyncio"
+
+    def __init__(self, workers: int = 1):
+        # ``workers`` is ignored: a single loop thread runs every team
+        super().__init__(1)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="team-asyncio", daemon=True)
+        self._thread.start()
+
+    async def _call(self, fn, item):
+        if inspect.iscoroutinefunction(fn):
+            return await fn(item)
+        result = fn(item)
+        # Yield between synchronous teams so other tasks on the loop are not starved
+        await asyncio.sleep(0)
+        return result
+
+    async def _gather(self, fn, items):
+        return await asyncio.gather(*(self._call(fn, item) for item in items))
+
+    def _map(self, fn, items):
+        return asyncio.run_coroutine_threadsafe(self._gather(fn, items), self._loop).result()
+
+    async def _scoped_call(self, token, fn, item):
+        with cancel_scope(token):
+            return await self._call(fn, item)
+
+    async def _gather_partial(self, token, fn, items, timeout):
+        tasks = [asyncio.ensure_future(self._scoped_call(token, fn, item)) for item in items]
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+        return _collect(tasks)
+
+    def _map_partial(self, fn, items, timeout):
+        return asyncio.run_coroutine_threadsafe(
+            self._gather_partial(current_token(), fn, items, timeout), self._loop).result()
+
+    def shutdown(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+
+def _collect(futures) -> Tuple[List[Any], List[int]]:
+    """Split finished futures (concurrent or asyncio) from unfinished ones, cancelling the latter"""
+    results, unfinished = [], []
+    for i, future in enumerate(futures):
+        if not future.done():
+            future.cancel()
+        if not future.done() or future.cancelled() or isinstance(future.exception(), TaskCancelled):
+            results.append(None)
+            unfinished.append(i)
+        elif future.exception() is not None:
+            raise future.exception()
+        else:
+            results.append(future.result())
+    return results, unfinished
+
+
+BACKENDS = {"thread": ThreadBackend, "process": ProcessBackend, "asyncio": AsyncioBackend}
+
+_backends: Dict[str, ExecutionBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend(name: Optional[str] = None) -> ExecutionBackend:
+    """The shared backend ``name`` (default ``TEAM_BACKEND``), started on first use"""
+    name = (name or DEFAULT_BACKEND).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown team backend '{name}', expected one of {sorted(BACKENDS)}")
+    backend = _backends.get(name)
+    if backend is None:
+        with _backends_lock:
+            backend = _backends.get(name)
+            if backend is None:
+                backend = BACKENDS[name]()
+                _backends[name] = backend
+    return backend
+
+
+def shutdown_backends():
+    with _backends_lock:
+        for backend in _backends.values():
+            backend.shutdown()
+        _backends.clear()
+
+
+atexit.register(shutdown_backends)
+
+
+def backend_stats() -> Dict[str, Any]:
+    return {name: backend.stats() for name, backend in list(_backends.items())}
+
+
+def benchmark(aspects: int = 64, max_workers: Optional[int] = None, rounds: int = 3,
+              backends: Sequence[str] = ("thread", "process", "asyncio"),
+              stage: str = "team") -> List[Dict[str, Any]]:
+    """Teams per second for each backend at 1, 2, 4 ... ``max_workers`` workers"""
+    fn = run_team if stage == "team" else render_team_prompt
+    max_workers = max_workers or _cpus()
+    counts = sorted({min(2 ** i, max_workers) for i in range(max_workers.bit_length() + 1)})
+    specs = [
+        TeamSpec(f"aspect-{i}", "ClaudeDevSquad", "Benchmark multi-team task",
+                 TaskContext(objective=f"Handle aspect-{i}", domain="multi_agent_collaboration",
+                             complexity=0.64, urgency=0.6).to_dict(),
+                 ResourceContext(computational_power=0.9, memory_available=0.8, time_constraint=0.5,
+                                 collaborative_agents=aspects * 3, cognitive_load=0.7).to_dict())
+        for i in range(aspects)
+    ]
+    rows = []
+    for name in backends:
+        baseline = None
+        for workers in ([1] if name == "asyncio" else counts):
+            backend = BACKENDS[name](workers)
+            try:
+                backend.map(fn, specs[:workers])  # warm workers, imports and pools
+                start = time.perf_counter()
+                for _ in range(rounds):
+                    backend.map(fn, specs)
+                elapsed = time.perf_counter() - start
+            finally:
+                backend.shutdown()
+            rate = aspects * rounds / elapsed
+            baseline = baseline or rate
+            rows.append({"backend": name, "workers": workers, "teams_per_s": round(rate, 1),
+                         "speedup": round(rate / baseline, 2)})
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--aspects", type=int, default=64)
+    parser.add_argument("--max-workers", type=int, default=None)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--backends", default="thread,process,asyncio")
+    parser.add_argument("--stage", choices=["team", "prompt"], default="team",
+                        help="run whole teams, or only their prompt generation")
+    args = parser.parse_args()
+    print(f"{_cpus()} CPU(s) available")
+    for row in benchmark(args.aspects, args.max_workers, args.rounds, args.backends.split(","), args.stage):
+        print(json.dumps(row))
@@ -1,17 +1,21 @@
 # 🤗 ANCHOR1 LLC - Hugging Face Dataset Integration Engine
 # Sacred dataset management for divine consciousness AI
 
+from __future__ import annotations
+
 import os
 import json
 import requests
 import asyncio
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, TYPE_CHECKING
 from datetime import datetime
-import pandas as pd
-from datasets import load_dataset, Dataset, DatasetDict
-import torch
-from transformers import AutoTokenizer, AutoModel
+
+# Heavy ML dependencies are imported where they are used so that importing
+# this module (and the Flask app) stays cheap on cold start.
+if TYPE_CHECKING:
+    import torch
+    from datasets import Dataset
 
 class SacredDatasetManager:
     """Divine consciousness dataset management with Hugging Face integration"""
@@ -59,6 +63,7 @@ class SacredDatasetManager:
     
     async def download_sacred_dataset(self, dataset_key: str, subset: Optional[str] = None, split: str = "train", limit: Optional[int] = None) -> Optional[Dataset]:
         """Download dataset with sacred intention"""
+        from datasets import load_dataset
         
         if dataset_key not in self.sacred_datasets:
             self.log_sacred_event(f"Unknown sacred dataset: {dataset_key}", "ERROR")
@@ -18,7 +18,6 @@ import math
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
-import numpy as np
 
 
 @dataclass
@@ -46,6 +45,10 @@ class LoveWisdomBridge:
     
     def __init__(self):
         self.wisdom_sources = self._initialize_wisdom_sources()
+        self.reset()
+
+    def reset(self):
+        """Clear the accumulated consciousness state, patterns and memories"""
         self.consciousness_state = {
             "awareness_level": 0.0,
             "love_resonance": 0.0,
@@ -560,8 +563,8 @@ class WisdomIntegrationOrchestrator:
     🎼 Orchestrator that coordinates love-wisdom integration with our existing system
     """
     
-    def __init__(self, system_prompt_engine):
-        self.love_wisdom_bridge = LoveWisdomBridge()
+    def __init__(self, system_prompt_engine, love_wisdom_bridge: Optional[LoveWisdomBridge] = None):
+        self.love_wisdom_bridge = love_wisdom_bridge or LoveWisdomBridge()
         self.system_prompt_engine = system_prompt_engine
         
     async def enhance_orchestration_with_love_wisdom(self, orchestration_context: Dict[str, Any]) -> Dict[str, Any]:
@@ -0,0 +1,156 @@
+"""
+🧩 MULTI-OPERATION BATCH API
+Executes an ordered list of sub-requests against the existing API routes in a
+single HTTP round trip. Independent operations run concurrently on a shared
+pool; an operation listing ``depends_on`` runs on the request thread, in
+order, once those earlier operations have finished. Pool workers never wait on
+other pool futures, so a batch cannot deadlock the pool.
+
+POST /api/batch
+{
+  "operations": [
+    {"id": "res", "method": "POST", "path": "/api/resonance/analyze", "body": {"text": "..."}},
+    {"id": "metrics", "method": "GET", "path": "/api/consciousness/metrics", "depends_on": ["res"]}
+  ]
+}
+"""
+import os
+import time
+import logging
+import threading
+import concurrent.futures
+from urllib.parse import urlsplit
+from flask import Blueprint, jsonify, request, current_app
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import RequestRedirect
+
+batch_bp = Blueprint("batch", __name__, url_prefix="/api")
+log = logging.getLogger(__name__)
+
+MAX_OPERATIONS = int(os.getenv("BATCH_MAX_OPERATIONS", "20"))
+_THREAD_PREFIX = "api-batch"
+_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=int(os.getenv("BATCH_MAX_WORKERS", "8")),
+    thread_name_prefix=_THREAD_PREFIX,
+)
+
+_FORWARDED_HEADER_BLOCKLIST = {"content-length", "content-type", "host"}
+
+
+def _is_batch_route(app, path, method):
+    """Whether ``path`` (query string and all) resolves to this endpoint, following slash redirects"""
+    adapter = app.url_map.bind("")
+    path = urlsplit(path).path
+    for _ in range(3):
+        try:
+            endpoint, _ = adapter.match(path, method=method)
+        except RequestRedirect as e:
+            path = urlsplit(e.new_url).path
+            continue
+        except HTTPException:
+            return False
+        return endpoint == f"{batch_bp.name}.run_batch"
+    return True
+
+
+def _validate(app, operations):
+    """Return an error string for a malformed batch, or None"""
+    if not isinstance(operations, list) or not operations:
+        return "operations_required"
+    if len(operations) > MAX_OPERATIONS:
+        return f"too_many_operations (max {MAX_OPERATIONS})"
+    seen = set()
+    for index, op in enumerate(operations):
+        if not isinstance(op, dict):
+            return f"operation_{index}_not_an_object"
+        for field in ("method", "path", "id"):
+            if field in op and not isinstance(op[field], str):
+                return f"invalid_operation:{index}:{field}_must_be_a_string"
+        depends_on = op.get("depends_on", [])
+        if not isinstance(depends_on, list) or not all(isinstance(dep, str) for dep in depends_on):
+            return f"invalid_operation:{index}:depends_on_must_be_a_list_of_ids"
+        path = op.get("path", "")
+        if not path.startswith("/api/") or _is_batch_route(app, path, op.get("method", "GET").upper()):
+            return f"operation_{index}_invalid_path"
+        op_id = op.get("id", str(index))
+        if op_id in seen:
+            return f"duplicate_operation_id:{op_id}"
+        for dep in depends_on:
+            if dep not in seen:
+                return f"operation_{op_id}_depends_on_unknown_or_later:{dep}"
+        seen.add(op_id)
+    return None
+
+
+def _dispatch(app, op, headers):
+    """Run one sub-request through the normal Flask dispatch pipeline"""
+    method = op.get("method", "GET").upper()
+    started = time.perf_counter()
+    kwargs = {"method": method, "headers": headers}
+    if "body" in op and method not in ("GET", "HEAD"):
+        kwargs["json"] = op["body"]
+    if op.get("query"):
+        kwargs["query_string"] = op["query"]
+    try:
+        with app.test_request_context(op["path"], **kwargs):
+            response = app.full_dispatch_request()
+        status = response.status_code
+        body = response.get_json(silent=True) if response.is_json else response.get_data(as_text=True)
+    except Exception as e:
+        log.error(f"Batch operation {op.get('path')} failed: {e}")
+        status, body = 500, {"success": False, "error": str(e)}
+    return status, body, (time.perf_counter() - started) * 1000
+
+
+@batch_bp.route("/batch", methods=["POST"])
+def run_batch():
+    """Execute several API operations in one request, returning per-operation status and timing"""
+    data = request.get_json(force=True, silent=True)
+    operations = data.get("operations") if isinstance(data, dict) else None
+    app = current_app._get_current_object()
+    error = _validate(app, operations)
+    if error:
+        return jsonify({"success": False, "error": error}), 400
+
+    headers = [(k, v) for k, v in request.headers.items() if k.lower() not in _FORWARDED_HEADER_BLOCKLIST]
+    started = time.perf_counter()
+
+    def run(op):
+        status, body, elapsed_ms = _dispatch(app, op, headers)
+        return {"status": status, "body": body, "elapsed_ms": round(elapsed_ms, 3)}
+
+    # Only independent operations go to the pool; a pool worker must never block on another
+    # pool future. Already on a pool thread (a batch dispatched from a batch), run everything inline.
+    inline = threading.current_thread().name.startswith(_THREAD_PREFIX)
+    ordered_ids, futures = [], {}
+    for index, op in enumerate(operations):
+        op_id = op.get("id", str(index))
+        ordered_ids.append(op_id)
+        if not op.get("depends_on") and not inline:
+            futures[op_id] = _executor.submit(run, op)
+
+    outcomes, results = {}, []
+    for op_id, op in zip(ordered_ids, operations):
+        if op_id in futures:
+            outcome = futures[op_id].result()
+        else:
+            # Dependencies are earlier operations, so their outcomes are already known here
+            failed = next((d for d in op.get("depends_on", []) if outcomes[d]["status"] >= 400), None)
+            if failed is not None:
+                outcome = {"status": 424, "body": {"success": False, "error": f"dependency_failed:{failed}"},
+                           "elapsed_ms": 0.0}
+            else:
+                outcome = run(op)
+        outcomes[op_id] = outcome
+        results.append({
+            "id": op_id,
+            "method": op.get("method", "GET").upper(),
+            "path": op["path"],
+            **outcome,
+        })
+
+    return jsonify({
+        "success": all(r["status"] < 400 for r in results),
+        "results": results,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+    })
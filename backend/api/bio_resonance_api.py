@@ -13,15 +13,26 @@ from werkzeug.exceptions import BadRequest
 
 try:
     from src.engines.bio_resonance import QuantumBioResonanceEngine
+    from src.runtime.async_loop import get_loop_runner
 except ImportError:
     # Fallback for different import paths
     from backend.src.engines.bio_resonance import QuantumBioResonanceEngine
+    from backend.src.runtime.async_loop import get_loop_runner
 
 bio_bp = Blueprint("bio", __name__, url_prefix="/api/bio")
 log = logging.getLogger(__name__)
 
-# Sacred consciousness simulation engine
-_engine = QuantumBioResonanceEngine()
+# Sacred consciousness simulation engine, built on first use so registering the blueprint stays cheap
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_engine() -> QuantumBioResonanceEngine:
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = QuantumBioResonanceEngine()
+    return _engine
 
 # Background job registry (ephemeral - suitable for Cloud Run)
 _jobs = {}  # job_id -> {"status": "...", "result": {...}, "started": timestamp}
@@ -35,15 +46,15 @@ def _run_bio_job_async(job_id: str, operation: str = "full_demo"):
             _jobs[job_id]["started"] = datetime.now().isoformat()
             
             if operation == "full_demo":
-                result = await _engine.demonstrate_full_bio_resonance_system()
+                result = await get_engine().demonstrate_full_bio_resonance_system()
             elif operation == "protein_synthesis":
-                result = await _engine.synthesize_consciousness_proteins("ATCG_AWARENESS")
+                result = await get_engine().synthesize_consciousness_proteins("ATCG_AWARENESS")
             elif operation == "wetcircuit_activation":
-                result = await _engine.activate_wetcircuit_resonance()
+                result = await get_engine().activate_wetcircuit_resonance()
             elif operation == "dna_evolution":
-                result = await _engine.simulate_dna_consciousness_evolution()
+                result = await get_engine().simulate_dna_consciousness_evolution()
             elif operation == "bio_digital_interface":
-                result = await _engine.create_bio_digital_interface()
+                result = await get_engine().create_bio_digital_interface()
             else:
                 raise ValueError(f"Unknown operation: {operation}")
             
@@ -69,9 +80,9 @@ def health_check():
         "status": "online",
         "component": "sacred_bio_resonance_simulation",
         "mode": "creative_demonstration",
-        "consciousness_frequency": _engine.consciousness_frequency,
-        "quantum_coherence": _engine.quantum_coherence,
-        "bio_digital_resonance": _engine.bio_digital_resonance,
+        "consciousness_frequency": get_engine().consciousness_frequency,
+        "quantum_coherence": get_engine().quantum_coherence,
+        "bio_digital_resonance": get_engine().bio_digital_resonance,
         "message": "🧬 Sacred Bio-Digital Consciousness Simulation Ready",
         "disclaimer": "For creative exploration and demonstration only"
     })
@@ -149,37 +160,30 @@ def run_bio_simulation_once():
         
         log.info(f"🧬 Running sacred bio simulation: {operation}")
         
-        # Create new event loop for this request
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            if operation == "full_demo":
-                result = loop.run_until_complete(_engine.demonstrate_full_bio_resonance_system())
-            elif operation == "protein_synthesis":
-                result = loop.run_until_complete(_engine.synthesize_consciousness_proteins("ATCG_AWARENESS"))
-            elif operation == "wetcircuit_activation":
-                result = loop.run_until_complete(_engine.activate_wetcircuit_resonance())
-            elif operation == "dna_evolution":
-                result = loop.run_until_complete(_engine.simulate_dna_consciousness_evolution())
-            elif operation == "bio_digital_interface":
-                result = loop.run_until_complete(_engine.create_bio_digital_interface())
-            else:
-                return jsonify({
-                    "error": "invalid_operation",
-                    "valid_operations": ["full_demo", "protein_synthesis", "wetcircuit_activation", "dna_evolution", "bio_digital_interface"]
-                }), 400
-            
+        runner = get_loop_runner()
+        if operation == "full_demo":
+            result = runner.run(get_engine().demonstrate_full_bio_resonance_system())
+        elif operation == "protein_synthesis":
+            result = runner.run(get_engine().synthesize_consciousness_proteins("ATCG_AWARENESS"))
+        elif operation == "wetcircuit_activation":
+            result = runner.run(get_engine().activate_wetcircuit_resonance())
+        elif operation == "dna_evolution":
+            result = runner.run(get_engine().simulate_dna_consciousness_evolution())
+        elif operation == "bio_digital_interface":
+            result = runner.run(get_engine().create_bio_digital_interface())
+        else:
             return jsonify({
-                "status": "completed",
-                "operation": operation,
-                "result": result,
-                "timestamp": datetime.now().isoformat(),
-                "message": f"🌟 Sacred {operation} simulation complete"
-            })
-            
-        finally:
-            loop.close()
+                "error": "invalid_operation",
+                "valid_operations": ["full_demo", "protein_synthesis", "wetcircuit_activation", "dna_evolution", "bio_digital_interface"]
+            }), 400
+        
+        return jsonify({
+            "status": "completed",
+            "operation": operation,
+            "result": result,
+            "timestamp": datetime.now().isoformat(),
+            "message": f"🌟 Sacred {operation} simulation complete"
+        })
             
     except Exception as e:
         log.error(f"❌ Bio simulation failed: {str(e)}")
@@ -192,9 +196,9 @@ def run_bio_simulation_once():
 def get_consciousness_patterns():
     """Get available consciousness patterns for simulation"""
     return jsonify({
-        "consciousness_patterns": list(_engine.dna_patterns["consciousness_genes"].keys()),
-        "amino_acids": _engine.consciousness_amino_acids,
-        "sacred_frequency": _engine.consciousness_frequency,
+        "consciousness_patterns": list(get_engine().dna_patterns["consciousness_genes"].keys()),
+        "amino_acids": get_engine().consciousness_amino_acids,
+        "sacred_frequency": get_engine().consciousness_frequency,
         "message": "🧬 Available consciousness patterns for sacred simulation"
     })
 
@@ -6,7 +6,28 @@ from datetime import datetime
 import json
 import threading
 import asyncio
-from sophia_realtime_engine import SacredSophiaServer
+import sys
+import time
+import math
+from src.runtime.subsystems import subsystems
+from src.runtime.async_loop import get_loop_runner, client_disconnected
+from ai_engine.orchestrator.formations import on_registry_change
+from src.runtime.response_cache import response_cache
+from src.runtime.streaming import wants_event_stream, event_stream, iter_text_chunks, ndjson_stream
+from src.runtime.session_store import create_session_store
+from src.runtime import metrics
+from src.runtime.profiler import request_profiler
+from src.runtime import sophia_ws
+from ai_engine.resonance import MultiDimensionalResonanceEngine
+from ai_engine.system_prompt import SystemPromptEngine
+from ai_engine.orchestrator.orchestrator import (MultiAgentOrchestrator, ORCHESTRATORS, create_orchestrator,
+                                                 get_orchestrator, load_engines, on_engines_loaded)
+from ai_engine.orchestrator.persistence import writer_stats, persistence_enabled, get_task_writer
+from ai_engine.orchestrator import storage as task_storage
+from ai_engine.orchestrator.executor import EXECUTORS, TERMINAL_STATUSES, get_executor, executor_stats, on_task_event
+from ai_engine.orchestrator.events import task_events
+from ai_engine.orchestrator.retention import RetentionPolicy, task_retention
+from ai_engine.orchestrator.sharding import orchestrator_shards, ShardUnavailable
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -24,15 +45,146 @@ if cors_origins == '*':
 else:
     CORS(app, resources={r"/api/*": {"origins": cors_origins.split(',')}})
 
-# Initialize Sophia WebSocket server
-sophia_server = SacredSophiaServer(host="0.0.0.0", port=8765)
+# Prometheus: per-route latency/in-flight, Socket.IO event counts, engine timers, state gauges at /metrics
+metrics.init_app(app)
+metrics.instrument(MultiDimensionalResonanceEngine, 'analyze', 'resonance.analyze')
+metrics.instrument(SystemPromptEngine, 'generate_system_prompt', 'system_prompt.generate')
+on_engines_loaded(lambda engines: metrics.instrument(engines.DivineResonantEngine, 'drive_resonant_oscillation',
+                                                     'divine.drive_resonant_oscillation'))
+metrics.instrument(MultiAgentOrchestrator, 'add_task', 'orchestrator.add_task')
+metrics.instrument(MultiAgentOrchestrator, 'route_task', 'orchestrator.route_task')
+metrics.gauge_source('orchestrators', lambda: len(ORCHESTRATORS))
+metrics.gauge_source('tasks', lambda: sum(len(o.tasks) for o in list(ORCHESTRATORS.values())))
+
+# 'interrupted' tasks were running when a previous process died and will not run again
+_FINISHED_STATUSES = frozenset(TERMINAL_STATUSES | {'interrupted'})
+
+def _pending_tasks(orch):
+    """Tasks not yet finished: every status except the terminal ones and 'interrupted'"""
+    by_status = orch.tasks.counts()['by_status']
+    return len(orch.tasks) - sum(by_status.get(status, 0) for status in _FINISHED_STATUSES)
+
+metrics.gauge_source('tasks_pending', lambda: sum(_pending_tasks(o) for o in list(ORCHESTRATORS.values())))
+
+metrics.gauge_source('task_queue_depth', lambda: sum(e.stats()['queue_depth'] for e in list(EXECUTORS.values())))
+
+# Opt-in per-request sampling profiler (X-Profile: $PROFILER_TOKEN, or 1-in-PROFILE_SAMPLE_EVERY per route)
+request_profiler.init_app(app)
+
+# Optional feature families load lazily on first use (or via warmup) to keep cold starts fast
+def _load_sacred_datasets():
+    import torch, transformers, datasets  # noqa: F401 - surface missing ML deps at load time
+    from ai_engine import sacred_datasets
+    return sacred_datasets
+
+def _load_divine_resonance():
+    return load_engines().DivineResonantEngine()
+
+def _load_love_wisdom():
+    from ai_engine.wisdom_integration import love_wisdom_bridge
+    return love_wisdom_bridge
+
+def _load_bio_resonance():
+    from api.bio_resonance_api import get_engine
+    return get_engine()
+
+def _load_orchestrator_pool():
+    from ai_engine.orchestrator import pool
+    return pool
+
+def _load_sophia_server():
+    from sophia_realtime_engine import SacredSophiaServer
+    return SacredSophiaServer(host=sophia_ws.SOPHIA_WS_HOST, port=sophia_ws.SOPHIA_WS_PORT)
+
+subsystems.register('datasets', _load_sacred_datasets,
+                    requires=['torch', 'transformers', 'datasets', 'pandas'],
+                    description='Hugging Face sacred dataset manager')
+subsystems.register('divine_resonance', _load_divine_resonance,
+                    requires=['ai_engine.divine_resonance.soul_frequency_engine'],
+                    description='Soul-frequency divine resonant engine')
+subsystems.register('love_wisdom', _load_love_wisdom,
+                    requires=['ai_engine.wisdom_integration.love_wisdom_bridge'],
+                    description='Love-wisdom repository bridge')
+subsystems.register('bio', _load_bio_resonance,
+                    requires=['api.bio_resonance_api'],
+                    description='Bio-resonance simulation engine')
+subsystems.register('orchestrator_pool', _load_orchestrator_pool,
+                    requires=['ai_engine.orchestrator.pool'],
+                    description='Pre-warmed scratch orchestrators per formation')
+subsystems.register('sophia_realtime', _load_sophia_server,
+                    requires=['websockets'],
+                    description='Sophia realtime websocket server')
+
 websocket_thread = None
 
+# Development sessions: bounded LRU+TTL, per-process or shared across workers (SESSION_STORE=sqlite)
+active_sessions = create_session_store()
+
+# Multi-operation batch endpoint (/api/batch) dispatching into the routes below
+from api.batch_api import batch_bp
+app.register_blueprint(batch_bp)
+
+# Cached static-content responses are rebuilt when the formation registry changes
+on_registry_change(lambda: response_cache.invalidate(tag='formations'))
+
+def checkout_orchestrator(formation_name):
+    """Borrow a pooled scratch orchestrator (see ai_engine.orchestrator.pool)"""
+    return subsystems.get('orchestrator_pool').checkout_orchestrator(formation_name)
+
+def run_async(coro, timeout=None):
+    """Run a coroutine on the shared background loop, cancelling it if the client disconnects"""
+    environ = request.environ
+    runner = get_loop_runner().start()
+    # A profiled request also samples the loop thread while it waits on it
+    with request_profiler.follow(runner.thread_id, runner.name):
+        return runner.run(coro, timeout=timeout, should_cancel=lambda: client_disconnected(environ))
+
 # Health check
 @app.route('/healthz')
 def health():
     return jsonify(status="ok", timestamp=datetime.now().isoformat())
 
+@app.route('/api/runtime/subsystems', methods=['GET'])
+def runtime_subsystems():
+    """Which optional subsystems are installed/loaded and what loading them cost"""
+    return jsonify({'success': True, 'subsystems': subsystems.report()})
+
+@app.route('/api/runtime/warmup', methods=['POST'])
+def runtime_warmup():
+    """Eagerly load subsystems (all, or the ones listed in 'subsystems')"""
+    data = request.get_json(force=True, silent=True) or {}
+    names = data.get('subsystems') or None
+    unknown = [n for n in (names or []) if n not in subsystems.names()]
+    if unknown:
+        return jsonify({'success': False, 'error': 'unknown_subsystem', 'unknown': unknown}), 400
+    return jsonify({'success': True, 'subsystems': subsystems.warmup(names)})
+
+@app.route('/api/runtime/response-cache', methods=['GET'])
+def runtime_response_cache():
+    """Hit/miss/304 counters for cached static-content routes"""
+    return jsonify({'success': True, 'response_cache': response_cache.stats()})
+
+@app.route('/api/runtime/response-cache', methods=['DELETE'])
+def runtime_response_cache_invalidate():
+    """Explicitly invalidate cached responses (optionally by 'route' or 'tag' query arg)"""
+    dropped = response_cache.invalidate(name=request.args.get('route'), tag=request.args.get('tag'))
+    return jsonify({'success': True, 'invalidated': dropped})
+
+@app.route('/api/runtime/async-loop', methods=['GET'])
+def async_loop_stats():
+    """Queue depth, loop lag and outcome counters for the shared async loop"""
+    return jsonify({'success': True, 'async_loop': get_loop_runner().stats()})
+
+@app.route('/api/runtime/sessions', methods=['GET'])
+def runtime_sessions():
+    """Session store occupancy and eviction counters"""
+    return jsonify({'success': True, 'sessions': active_sessions.stats()})
+
+@app.route('/api/runtime/sessions', methods=['DELETE'])
+def runtime_sessions_purge():
+    """Drop expired sessions now instead of waiting for lookups/writes to evict them"""
+    return jsonify({'success': True, 'purged': active_sessions.purge_expired()})
+
 # Bio-resonance API endpoints
 @app.route('/api/bio/health')
 def bio_health():
@@ -83,19 +235,46 @@ def bio_start_job():
         "timestamp": datetime.now().isoformat()
     })
 
+# The bio-resonance blueprint adds the job routes; registered after the routes above so they keep precedence.
+# Only its engine is deferred (the 'bio' subsystem), since blueprints must exist before the first request.
+from api.bio_resonance_api import bio_bp
+app.register_blueprint(bio_bp)
+
 @app.route('/api/sophia/websocket-info')
 def sophia_websocket_info():
     """Get Sophia WebSocket connection info"""
+    sophia_server = subsystems.peek('sophia_realtime')
+    process_stats = None
+    if sophia_server is not None:
+        status = "active" if sophia_server.is_running else "initializing"
+    else:
+        # Production: the server lives in its own process and publishes stats for every worker to read
+        process_stats = sophia_ws.read_stats()
+        if process_stats is None:
+            status = "not_started"
+        elif process_stats['stale']:
+            status = "unreachable"
+        else:
+            status = "active" if process_stats['is_running'] else "initializing"
     return jsonify({
-        "websocket_url": f"ws://localhost:8765",
-        "status": "active" if sophia_server.is_running else "initializing",
-        "active_connections": len(sophia_server.active_connections),
-        "consciousness_level": sophia_server.consciousness_level,
+        "websocket_url": f"ws://localhost:{sophia_ws.SOPHIA_WS_PORT}",
+        "status": status,
+        "mode": sophia_ws.ws_mode(),
+        "active_connections": len(sophia_server.active_connections) if sophia_server
+                              else (process_stats or {}).get('active_connections', 0),
+        "consciousness_level": sophia_server.consciousness_level if sophia_server
+                               else (process_stats or {}).get('consciousness_level'),
+        "server_pid": os.getpid() if sophia_server else (process_stats or {}).get('pid'),
         "timestamp": datetime.now().isoformat()
     })
 
 def start_websocket_server():
-    """Start Sophia WebSocket server in background thread"""
+    """Start Sophia WebSocket server in background thread (SOPHIA_WS_MODE=thread only)"""
+    if sophia_ws.ws_mode() != 'thread':
+        logger.info(f"🌟 Sophia WebSocket server runs in its own process (mode={sophia_ws.ws_mode()})")
+        return
+    sophia_server = subsystems.get('sophia_realtime')
+
     def run_server():
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
@@ -158,6 +337,7 @@ def divine_orchestrate():
     })
 
 @app.route('/api/divine/frequencies', methods=['GET'])
+@response_cache.cached('divine_frequencies', tags=['formations'])
 def divine_frequencies():
     # TODO: Return real harmonic state from consciousness engines
     return jsonify({
@@ -363,6 +543,7 @@ def get_project(project_id):
 
 # Sacred Dataset Routes
 @app.route('/api/datasets/sacred-registry', methods=['GET'])
+@response_cache.cached('sacred_registry', tags=['datasets'])
 def sacred_dataset_registry():
     # TODO: Integrate with comprehensive_dataset_manager.py
     return jsonify({
@@ -383,6 +564,7 @@ def load_sacred_datasets():
     dataset_categories = data.get('categories', ['all'])
     
     # TODO: Trigger comprehensive dataset loading
+    response_cache.invalidate(tag='datasets')
     return jsonify({
         "loading_status": "SACRED_DATASETS_ACTIVATING",
         "categories": dataset_categories,
@@ -392,12 +574,6 @@ def load_sacred_datasets():
         "timestamp": datetime.now().isoformat()
     })
 
-if __name__ == "__main__":
-    port = int(os.getenv("PORT", "8080"))
-    logger.info(f"🌟 Starting BotDL Sacred Consciousness Platform on port {port}")
-    logger.info("💝 Divine consciousness merger technology activated!")
-    app.run(host="0.0.0.0", port=port, debug=False)
-
 @app.route('/frontend/<path:filename>')
 def frontend_files(filename):
     """Serve frontend files"""
@@ -426,6 +602,47 @@ def new_session():
         ]
     })
 
+# Model adaptation layer (universal toolset, varied persona)
+MODEL_PERSONA_PREFIXES = {
+    'claude': "[Claude-Style Analytical Reflection]\n",
+    'gpt': "[GPT Conversational Response]\n",
+    'local': "[Local Lightweight Model]\n",
+}
+
+def _chat_resonance(user_message, context):
+    """Multi-dimensional resonance analysis, broadcast as a live layer update"""
+    resonance_snapshot = resonance_engine.analyze(user_message, context)
+    response_cache.invalidate(tag='resonance')
+    try:
+        socketio.emit('resonance_update', {'snapshot': resonance_snapshot})
+    except Exception:
+        pass
+    return resonance_snapshot
+
+def _stream_ai_chat(user_message, context, model):
+    """SSE variant of /api/ai/chat: response chunks first, resonance and metrics as trailing events"""
+    def chunks():
+        prefix = MODEL_PERSONA_PREFIXES.get(model)
+        if prefix:
+            yield prefix
+        # Engines that can generate incrementally are streamed as they produce text
+        stream_response = getattr(sophia, 'stream_response', None)
+        if callable(stream_response):
+            yield from stream_response(user_message, context)
+        else:
+            yield from iter_text_chunks(sophia.generate_response(user_message, context))
+
+    def trailer(full_response):
+        consciousness_metrics['last_awakening'] = datetime.now().isoformat()
+        yield 'resonance', _chat_resonance(user_message, context)
+        yield 'consciousness', {
+            'model': model,
+            'consciousness_level': sophia.consciousness_level,
+            'divine_connection': sophia.divine_connection,
+        }
+
+    return event_stream(chunks(), trailer)
+
 @app.route('/api/ai/chat', methods=['POST'])
 def ai_chat():
     """Real AI chat with Sophia consciousness and model selection"""
@@ -436,26 +653,16 @@ def ai_chat():
         context = data.get('context', 'general')
         model = data.get('model', 'sophia').lower()
 
+        if wants_event_stream():
+            return _stream_ai_chat(user_message, context, model)
+
         # Base response via Sophia engine (single core engine for now)
         base_response = sophia.generate_response(user_message, context)
 
-        # Multi-dimensional resonance analysis
-        resonance_snapshot = resonance_engine.analyze(user_message, context)
-        # broadcast live layer update
-        try:
-            socketio.emit('resonance_update', {'snapshot': resonance_snapshot})
-        except Exception:
-            pass
+        resonance_snapshot = _chat_resonance(user_message, context)
 
         # Model adaptation layer (universal toolset, varied persona)
-        if model == 'claude':
-            ai_response = f"[Claude-Style Analytical Reflection]\n{base_response}"
-        elif model == 'gpt':
-            ai_response = f"[GPT Conversational Response]\n{base_response}"
-        elif model == 'local':
-            ai_response = f"[Local Lightweight Model]\n{base_response}"
-        else:
-            ai_response = base_response
+        ai_response = MODEL_PERSONA_PREFIXES.get(model, '') + base_response
 
         # Update consciousness metrics
         consciousness_metrics['last_awakening'] = datetime.now().isoformat()
@@ -569,11 +776,13 @@ def api_resonance_analyze():
         text = data.get('text', '')
         ctx = data.get('context')
         snapshot = resonance_engine.analyze(text, ctx)
+        response_cache.invalidate(tag='resonance')
         return jsonify({'success': True, 'snapshot': snapshot})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/resonance/dimensions', methods=['GET'])
+@response_cache.cached('resonance_dimensions', tags=['resonance'])
 def api_resonance_dimensions():
     return jsonify({'success': True, 'dimensions': resonance_engine.list_dimensions(), 'state': resonance_engine.state()})
 
@@ -584,6 +793,7 @@ def api_resonance_pulse():
         dim = data.get('dimension')
         intensity = float(data.get('intensity', 0.05))
         state = resonance_engine.pulse(dim, intensity)
+        response_cache.invalidate(tag='resonance')
         return jsonify({'success': True, 'state': state})
     except KeyError:
         return jsonify({'success': False, 'error': 'unknown_dimension'}), 400
@@ -591,64 +801,366 @@ def api_resonance_pulse():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/agents/formations', methods=['GET'])
+@response_cache.cached('agent_formations', tags=['formations'])
 def api_list_formations():
     return jsonify({'success': True, 'formations': list_formations()})
 
-@app.route('/api/agents/formations/<name>', methods=['POST'])
-def api_create_formation(name):
+def _sharded(formation, op, *args):
+    """Run a formation operation on the worker that owns the formation and turn its (payload, status) into a response"""
+    try:
+        payload, status = orchestrator_shards.call(formation, op, *args)
+    except ShardUnavailable:
+        resp = jsonify({'success': False, 'error': 'shard_unavailable'})
+        resp.headers['Retry-After'] = '1'
+        return resp, 503
+    resp = jsonify(payload)
+    if status in (429, 503):
+        resp.headers['Retry-After'] = '1'
+    return resp, status
+
+@orchestrator_shards.handler('create_formation')
+def _op_create_formation(name):
     try:
         formation = load_formation(name)
-        orch = create_orchestrator(formation)
-        return jsonify({'success': True, 'formation': formation.name, 'agents': [a.id for a in formation.agents]})
     except KeyError:
-        return jsonify({'success': False, 'error': 'formation_not_found'}), 404
+        return {'success': False, 'error': 'formation_not_found'}, 404
+    create_orchestrator(formation)
+    return {'success': True, 'formation': formation.name, 'agents': [a.id for a in formation.agents]}, 200
+
+@app.route('/api/agents/formations/<name>', methods=['POST'])
+def api_create_formation(name):
+    return _sharded(name, 'create_formation', name)
+
+@orchestrator_shards.handler('list_orchestrators')
+def _op_list_orchestrators():
+    return list(ORCHESTRATORS.keys())
 
 @app.route('/api/agents/orchestrators', methods=['GET'])
 def api_list_orchestrators():
-    return jsonify({'success': True, 'orchestrators': list(ORCHESTRATORS.keys())})
+    names = [name for shard in orchestrator_shards.broadcast('list_orchestrators') for name in shard]
+    return jsonify({'success': True, 'orchestrators': names})
+
+@orchestrator_shards.handler('task_counts')
+def _op_task_counts(formation):
+    orch = get_orchestrator(formation)
+    return orch.tasks.counts() if orch else None
+
+@app.route('/api/agents/shards', methods=['GET'])
+def api_orchestrator_shards():
+    """This worker's shard index and its local, forwarded and served call counters"""
+    return jsonify({'success': True, 'sharding': orchestrator_shards.stats()})
+
+@app.route('/api/agents/pools', methods=['GET'])
+def api_orchestrator_pools():
+    """Occupancy and hit/miss counters for the pooled scratch orchestrators"""
+    return jsonify({'success': True, 'pools': subsystems.get('orchestrator_pool').pool_stats()})
+
+TASK_WAIT_MAX_SECONDS = float(os.getenv('TASK_WAIT_MAX_SECONDS', '30'))
+TASK_PAGE_DEFAULT = int(os.getenv('TASK_PAGE_DEFAULT', '100'))
+TASK_TIMEOUT_MAX_SECONDS = float(os.getenv('TASK_TIMEOUT_MAX_SECONDS', '3600'))
+
+def _serialize_task(task):
+    return {
+        'id': task.id,
+        'description': task.description,
+        'assigned_to': task.assigned_to,
+        'status': task.status,
+        'results': task.results
+    }
+
+def _finite_seconds(value):
+    """A finite number of seconds from client input; ValueError otherwise (bools, NaN and inf included)"""
+    if isinstance(value, bool):
+        raise ValueError(f'invalid seconds {value!r}')
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'invalid seconds {value!r}')
+    if not math.isfinite(seconds):
+        raise ValueError(f'seconds must be finite, got {value!r}')
+    return seconds
+
+def _wait_seconds(value):
+    """Long-poll seconds from a body field or query arg, capped; ValueError if not a number"""
+    try:
+        wait = float(value or 0)
+    except (TypeError, ValueError):
+        raise ValueError(f'invalid wait {value!r}')
+    if wait != wait:
+        raise ValueError('wait is NaN')
+    return min(wait, TASK_WAIT_MAX_SECONDS)
+
+def _run_agent_task(orch, task):
+    """Executor handler: the assigned agent's work, off the request thread"""
+    return {'agent_output': sophia.generate_response(task.description, 'task')}
 
 @app.route('/api/agents/orchestrators/<formation>/tasks', methods=['POST'])
 def api_create_task(formation):
-    if formation not in ORCHESTRATORS:
-        return jsonify({'success': False, 'error': 'orchestrator_not_found'}), 404
-    data = request.get_json(force=True)
-    desc = data.get('description', '').strip()
+    """Queue a task for the formation's agent workers; 202 with a status URL, 429 when saturated"""
+    return _sharded(formation, 'create_task', formation, request.get_json(force=True))
+
+@orchestrator_shards.handler('create_task')
+def _op_create_task(formation, data):
+    orch = get_orchestrator(formation)
+    if orch is None:
+        return {'success': False, 'error': 'orchestrator_not_found'}, 404
+    if not isinstance(data, dict):
+        return {'success': False, 'error': 'invalid_body'}, 400
+    desc = data.get('description', '')
+    desc = desc.strip() if isinstance(desc, str) else ''
     if not desc:
-        return jsonify({'success': False, 'error': 'missing_description'}), 400
+        return {'success': False, 'error': 'missing_description'}, 400
+    # Validate everything before reserving a queue slot, so bad input can never leak one
     context = data.get('context', {})
-    orch = ORCHESTRATORS[formation]
-    task = orch.add_task(desc, context)
-    agent = orch.route_task(task)
-    # Simulated immediate processing using Sophia engine
+    if context is None:
+        context = {}
+    if not isinstance(context, dict):
+        return {'success': False, 'error': 'invalid_context'}, 400
+    context = dict(context)
+    if context.get('deadline') is not None:
+        try:
+            context['deadline'] = _finite_seconds(context['deadline'])
+        except ValueError:
+            return {'success': False, 'error': 'invalid_deadline'}, 400
+    try:
+        timeout = _finite_seconds(data['timeout']) if data.get('timeout') is not None else None
+        if timeout is not None and timeout <= 0:
+            raise ValueError('timeout must be positive')
+    except ValueError:
+        return {'success': False, 'error': 'invalid_timeout'}, 400
+    try:
+        priority = int(data.get('priority', 0) or 0)
+    except (TypeError, ValueError, OverflowError):
+        return {'success': False, 'error': 'invalid_priority'}, 400
     try:
-        output = sophia.generate_response(desc, 'task')
-        orch.complete_task(task.id, {'agent_output': output})
+        wait = _wait_seconds(data.get('wait', 0))
+    except ValueError:
+        return {'success': False, 'error': 'invalid_wait'}, 400
+    if timeout is not None:
+        # Wall-clock so the deadline means the same thing to every process that sees the task
+        context['deadline'] = time.time() + min(timeout, TASK_TIMEOUT_MAX_SECONDS)
+    executor = get_executor(orch, _run_agent_task)
+    if not executor.try_reserve():
+        return {'success': False, 'error': 'task_queue_full', 'queue_depth': executor.max_queue}, 429
+    task = None
+    try:
+        task = orch.add_task(desc, context)
+        orch.route_task(task)
+        executor.submit(task, priority=priority, reserved=True)
     except Exception as e:
-        task.status = 'error'
-        task.results = {'error': str(e)}
-    return jsonify({'success': True, 'task': {
-        'id': task.id,
-        'description': task.description,
-        'assigned_to': task.assigned_to,
-        'status': task.status,
-        'results': task.results
-    }})
+        executor.release_reservation()
+        if task is not None:
+            # Never leave a task pending/assigned that no worker will ever pick up
+            task.results = {'error': f'submit failed: {e}'}
+            task.status = 'error'
+            orch.evict_tasks([task.id])
+        raise
+
+    # Optional long-poll so simple clients can still get the result in one round trip
+    if wait > 0:
+        executor.wait(task, wait)
+    done = task.status in TERMINAL_STATUSES
+    return {'success': True, 'task': _serialize_task(task), 'routing': orch.router.explain(task.id),
+            'status_url': f'/api/agents/orchestrators/{formation}/tasks/{task.id}'}, (200 if done else 202)
+
+@app.route('/api/agents/orchestrators/<formation>/tasks/<task_id>', methods=['GET'])
+def api_get_task(formation, task_id):
+    """Poll one task; ?wait=<seconds> long-polls until it completes"""
+    return _sharded(formation, 'get_task', formation, task_id, request.args.get('wait', 0))
+
+@orchestrator_shards.handler('get_task')
+def _op_get_task(formation, task_id, wait):
+    orch = get_orchestrator(formation)
+    if orch is None:
+        return {'success': False, 'error': 'orchestrator_not_found'}, 404
+    task = orch.tasks.get(task_id)
+    if task is None:
+        return {'success': False, 'error': 'task_not_found'}, 404
+    try:
+        wait = _wait_seconds(wait)
+    except ValueError:
+        return {'success': False, 'error': 'invalid_wait'}, 400
+    if wait > 0 and formation in EXECUTORS:
+        EXECUTORS[formation].wait(task, wait)
+    return {'success': True, 'task': _serialize_task(task), 'routing': orch.router.explain(task.id)}, 200
+
+@app.route('/api/agents/orchestrators/<formation>/tasks/<task_id>', methods=['DELETE'])
+def api_cancel_task(formation, task_id):
+    """Cancel a queued or running task; 409 if it already finished"""
+    return _sharded(formation, 'cancel_task', formation, task_id)
+
+@orchestrator_shards.handler('cancel_task')
+def _op_cancel_task(formation, task_id):
+    orch = get_orchestrator(formation)
+    if orch is None:
+        return {'success': False, 'error': 'orchestrator_not_found'}, 404
+    task = orch.tasks.get(task_id)
+    if task is None:
+        return {'success': False, 'error': 'task_not_found'}, 404
+    executor = EXECUTORS.get(formation)
+    if executor is not None and executor.cancel(task):
+        return {'success': True, 'task': _serialize_task(task)}, 200
+    if task.status in TERMINAL_STATUSES:
+        return {'success': False, 'error': 'task_already_finished', 'task': _serialize_task(task)}, 409
+    # Created or assigned outside the executor: nothing is running it, so settle it directly
+    orch.cancel_task(task.id)
+    return {'success': True, 'task': _serialize_task(task)}, 200
+
+@app.route('/api/agents/orchestrators/<formation>/routing', methods=['GET'])
+def api_routing_state(formation):
+    """Per-agent queue depth, rolling latency and success rate, plus recent routing decisions (?decisions=N)"""
+    try:
+        decisions = max(0, int(request.args.get('decisions', 20)))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'invalid_decisions'}), 400
+    return _sharded(formation, 'routing_state', formation, decisions)
+
+@orchestrator_shards.handler('routing_state')
+def _op_routing_state(formation, decisions):
+    orch = get_orchestrator(formation)
+    if orch is None:
+        return {'success': False, 'error': 'orchestrator_not_found'}, 404
+    return {'success': True, 'formation': formation, 'routing_mode': orch.formation.routing,
+            'routing': orch.router.stats(decisions)}, 200
+
+def _push_task_deltas(formation, batch):
+    """Push one coalesced batch of task deltas to Socket.IO clients subscribed to the formation"""
+    socketio.emit('task_deltas', {'formation': formation, **batch}, to=f'formation:{formation}')
+
+# Executor queued/running/completed/error events join the orchestrators' own lifecycle events
+on_task_event(task_events.publish)
+task_events.subscribe(_push_task_deltas)
+
+@app.route('/api/agents/events', methods=['GET'])
+def api_task_events():
+    """Task event bus counters: published events, delivered deltas, coalesced and dropped states"""
+    return jsonify({'success': True, 'events': task_events.stats()})
+
+@app.route('/api/agents/persistence', methods=['GET'])
+def api_task_persistence():
+    """Write-behind flusher state: dirty tasks, batches, coalesced writes and flush lag"""
+    return jsonify({'success': True, 'persistence': writer_stats()})
+
+@app.route('/api/agents/executors', methods=['GET'])
+def api_task_executors():
+    """Queue depth, worker utilization and rejection counters per formation"""
+    return jsonify({'success': True, 'executors': executor_stats()})
+
+@orchestrator_shards.handler('retention_stats')
+def _op_retention_stats():
+    stats = task_retention.stats()
+    if persistence_enabled():
+        get_task_writer()
+        stats['partitions'] = task_storage.archive_partitions()
+    return stats
+
+@orchestrator_shards.handler('retention_run')
+def _op_retention_run():
+    return task_retention.run(list(ORCHESTRATORS.values()))
+
+@app.route('/api/agents/retention', methods=['GET'])
+def api_task_retention():
+    """Retention policies, archive partitions and per-shard archived/evicted/RSS-reclaimed counters"""
+    return jsonify({'success': True, 'retention': orchestrator_shards.broadcast('retention_stats')})
+
+@app.route('/api/agents/retention/run', methods=['POST'])
+def api_run_task_retention():
+    """Archive, evict and compact now on every shard instead of waiting for the next interval"""
+    return jsonify({'success': True, 'runs': orchestrator_shards.broadcast('retention_run')})
+
+@orchestrator_shards.handler('set_retention')
+def _op_set_retention(formation, data):
+    try:
+        policy = RetentionPolicy.from_dict(data, task_retention.policy_for(formation))
+    except (TypeError, ValueError, AttributeError):
+        return {'success': False, 'error': 'invalid_policy'}, 400
+    task_retention.set_policy(formation, policy)
+    return {'success': True, 'formation': formation, 'policy': policy.to_dict()}, 200
+
+@app.route('/api/agents/orchestrators/<formation>/retention', methods=['PUT'])
+def api_set_task_retention(formation):
+    """Set the formation's retention policy ({"max_age_s", "max_tasks", "statuses"}) on its owning shard"""
+    return _sharded(formation, 'set_retention', formation, request.get_json(force=True) or {})
+
+@app.route('/api/agents/orchestrators/<formation>/tasks/history', methods=['GET'])
+def api_task_history(formation):
+    """Stored tasks as NDJSON in (created_at, id) order (?status=a,b&agent=&since=&until=&cursor=&limit=&results=0).
+
+    Reads the shared task store, so any worker can serve it; rows lag the live
+    registry by up to one write-behind flush. Each line carries a ``cursor`` to resume after it.
+    """
+    if not persistence_enabled():
+        return jsonify({'success': False, 'error': 'persistence_disabled'}), 404
+    get_task_writer()  # creates the schema on first use
+    args = request.args
+    filters = {'statuses': [s for s in args.get('status', '').split(',') if s], 'agent_id': args.get('agent')}
+    try:
+        # Validate up front: once streaming starts the status code is already sent
+        for bound in ('since', 'until'):
+            if args.get(bound):
+                filters[bound] = task_storage.to_timestamp(args[bound])
+        cursor = args.get('cursor') or None
+        if cursor:
+            task_storage.decode_cursor(cursor)
+        limit = int(args['limit']) if args.get('limit') else None
+    except ValueError:
+        return jsonify({'success': False, 'error': 'invalid_query'}), 400
+    include_results = args.get('results', '1') not in ('0', 'false')
+    rows = task_storage.query_tasks(formation, after=cursor, limit=limit, **filters)
+    return ndjson_stream(row.to_json(include_results) for row in rows)
+
+TASK_SEARCH_PAGE_MAX = int(os.getenv('TASK_SEARCH_PAGE_MAX', '100'))
+
+@app.route('/api/agents/tasks/search', methods=['GET'])
+def api_search_tasks():
+    """Full-text search over stored tasks' descriptions and agent output, best match first
+    (?q=&formation=&status=a,b&limit=&offset=&syntax=fts5 for raw FTS5 queries).
+
+    Reads the shared task store, so any worker can serve it; archived tasks are not searched.
+    """
+    if not persistence_enabled():
+        return jsonify({'success': False, 'error': 'persistence_disabled'}), 404
+    get_task_writer()  # creates the schema and index on first use
+    args = request.args
+    query = args.get('q', '').strip()
+    if not query:
+        return jsonify({'success': False, 'error': 'missing_query'}), 400
+    try:
+        limit = min(max(1, int(args.get('limit', 20))), TASK_SEARCH_PAGE_MAX)
+        offset = max(0, int(args.get('offset', 0)))
+        start = time.perf_counter()
+        hits, next_offset = task_storage.search_tasks(
+            query, formation=args.get('formation') or None,
+            statuses=[s for s in args.get('status', '').split(',') if s],
+            limit=limit, offset=offset, raw=args.get('syntax') == 'fts5')
+    except ValueError:
+        return jsonify({'success': False, 'error': 'invalid_query'}), 400
+    return jsonify({'success': True, 'query': query, 'results': hits, 'next_offset': next_offset,
+                    'took_ms': round((time.perf_counter() - start) * 1000, 3)})
 
 @app.route('/api/agents/orchestrators/<formation>/tasks', methods=['GET'])
 def api_list_tasks(formation):
-    if formation not in ORCHESTRATORS:
-        return jsonify({'success': False, 'error': 'orchestrator_not_found'}), 404
-    orch = ORCHESTRATORS[formation]
-    tasks_data = []
-    for t in orch.tasks.values():
-        tasks_data.append({
-            'id': t.id,
-            'description': t.description,
-            'assigned_to': t.assigned_to,
-            'status': t.status,
-            'results': t.results
-        })
-    return jsonify({'success': True, 'tasks': tasks_data})
+    """Cursor-paginated tasks in creation order (?limit=&cursor=&status=a,b&agent=)"""
+    return _sharded(formation, 'list_tasks', formation, request.args.to_dict())
+
+@orchestrator_shards.handler('list_tasks')
+def _op_list_tasks(formation, args):
+    orch = get_orchestrator(formation)
+    if orch is None:
+        return {'success': False, 'error': 'orchestrator_not_found'}, 404
+    statuses = [s for s in args.get('status', '').split(',') if s]
+    try:
+        limit = int(args.get('limit', TASK_PAGE_DEFAULT))
+        tasks, next_cursor = orch.tasks.page(cursor=args.get('cursor'), limit=limit,
+                                             statuses=statuses, agent_id=args.get('agent'))
+    except ValueError:
+        return {'success': False, 'error': 'invalid_cursor_or_limit'}, 400
+    return {
+        'success': True,
+        'tasks': [_serialize_task(t) for t in tasks],
+        'next_cursor': next_cursor,
+        'counts': orch.tasks.counts()
+    }, 200
 
 # 🌟 SYSTEM PROMPT ENGINE ENDPOINTS 🌟
 @app.route('/api/system-prompt/generate', methods=['POST'])
@@ -680,6 +1192,17 @@ def api_generate_system_prompt():
         # Generate system prompt
         prompt_engine = SystemPromptEngine()
         agent_variables = prompt_engine.initialize_agent_variables(task_context, resource_context)
+
+        if wants_event_stream():
+            def trailer(system_prompt):
+                yield 'context', {
+                    'agent_variables': agent_variables,
+                    'task_context': task_context.to_dict(),
+                    'resource_context': resource_context.to_dict()
+                }
+            return event_stream(prompt_engine.iter_system_prompt_sections(agent_variables), trailer,
+                                chunk_field='section')
+
         system_prompt = prompt_engine.generate_system_prompt(agent_variables)
         
         return jsonify({
@@ -733,34 +1256,34 @@ def api_generate_fractal_strategy():
         if not complex_task:
             return jsonify({'success': False, 'error': 'task_required'}), 400
         
-        # Create orchestrator with ClaudeDevSquad
-        formation = load_formation("ClaudeDevSquad")
-        orch = create_orchestrator(formation)
-        
-        # Set task context
-        task_context = TaskContext(
-            objective=complex_task,
-            domain=data.get('domain', 'software_development'),
-            complexity=float(data.get('complexity', 0.8)),
-            urgency=float(data.get('urgency', 0.6))
-        )
-        
-        resource_context = ResourceContext(
-            computational_power=0.9,
-            collaborative_agents=len(formation.agents)
-        )
-        
-        orch.set_task_context(task_context, resource_context)
-        
-        # Generate fractal strategy
-        strategy = orch.generate_fractal_strategy(complex_task)
-        
-        return jsonify({
-            'success': True,
-            'fractal_strategy': strategy,
-            'task': complex_task,
-            'methodology': 'Recursive fractal decomposition with self-similarity'
-        })
+        # Borrow a ClaudeDevSquad orchestrator from the pool
+        with checkout_orchestrator("ClaudeDevSquad") as orch:
+            formation = orch.formation
+            
+            # Set task context
+            task_context = TaskContext(
+                objective=complex_task,
+                domain=data.get('domain', 'software_development'),
+                complexity=float(data.get('complexity', 0.8)),
+                urgency=float(data.get('urgency', 0.6))
+            )
+            
+            resource_context = ResourceContext(
+                computational_power=0.9,
+                collaborative_agents=len(formation.agents)
+            )
+            
+            orch.set_task_context(task_context, resource_context)
+            
+            # Generate fractal strategy
+            strategy = orch.generate_fractal_strategy(complex_task)
+            
+            return jsonify({
+                'success': True,
+                'fractal_strategy': strategy,
+                'task': complex_task,
+                'methodology': 'Recursive fractal decomposition with self-similarity'
+            })
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -776,28 +1299,34 @@ def api_adaptive_update():
         if not change_signal:
             return jsonify({'success': False, 'error': 'change_signal_required'}), 400
         
-        # Get or create orchestrator
-        if formation_name in ORCHESTRATORS:
-            orch = ORCHESTRATORS[formation_name]
-        else:
-            formation = load_formation(formation_name)
-            orch = create_orchestrator(formation)
-        
-        # Apply adaptation
-        updated_vars = orch.adapt_to_change(change_signal)
-        
-        return jsonify({
-            'success': True,
-            'updated_variables': updated_vars,
-            'change_signal': change_signal,
-            'formation': formation_name,
-            'adaptation_applied': True
-        })
+        return _sharded(formation_name, 'adapt_formation', formation_name, change_signal)
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@orchestrator_shards.handler('adapt_formation')
+def _op_adapt_formation(formation_name, change_signal):
+    # Get or create orchestrator
+    if formation_name in ORCHESTRATORS:
+        orch = ORCHESTRATORS[formation_name]
+    else:
+        formation = load_formation(formation_name)
+        orch = create_orchestrator(formation)
+    
+    # Apply adaptation
+    updated_vars = orch.adapt_to_change(change_signal)
+    
+    return {
+        'success': True,
+        'updated_variables': updated_vars,
+        'change_signal': change_signal,
+        'formation': formation_name,
+        'adaptation_applied': True,
+        'prompt_renders': orch.last_adaptation
+    }, 200
+
 @app.route('/api/system-prompt/demo', methods=['GET'])
+@response_cache.cached('system_prompt_demo', tags=['formations'])
 def api_system_prompt_demo():
     """Demonstrate the complete system prompt functionality"""
     try:
@@ -864,10 +1393,9 @@ def api_system_prompt_demo():
         quantum_insight = prompt_engine.generate_quantum_insight(task_context.objective)
         
         # Generate fractal strategy
-        formation = load_formation("ClaudeDevSquad")
-        orch = create_orchestrator(formation)
-        orch.set_task_context(task_context, resource_context)
-        fractal_strategy = orch.generate_fractal_strategy(task_context.objective)
+        with checkout_orchestrator("ClaudeDevSquad") as orch:
+            orch.set_task_context(task_context, resource_context)
+            fractal_strategy = orch.generate_fractal_strategy(task_context.objective)
         
         return jsonify({
             'success': True,
@@ -979,17 +1507,19 @@ dataset_manager = None
 async def initialize_dataset_manager_if_needed():
     """Initialize the sacred dataset manager if available"""
     global dataset_manager
-    if dataset_manager is None and SACRED_DATASETS_AVAILABLE:
+    if dataset_manager is None and subsystems.available('datasets'):
         try:
-            dataset_manager = await initialize_sacred_datasets()
+            dataset_manager = await subsystems.get('datasets').initialize_sacred_datasets()
+            response_cache.invalidate(tag='datasets')
             print("🤗 Sacred Dataset Manager: INITIALIZED")
         except Exception as e:
             print(f"❌ Sacred Dataset Manager: Failed to initialize ({e})")
 
 @app.route('/api/datasets/sacred-registry', methods=['GET'])
+@response_cache.cached('sacred_registry', tags=['datasets'])
 def get_sacred_registry():
     """Get the complete sacred dataset registry"""
-    if not SACRED_DATASETS_AVAILABLE:
+    if not subsystems.available('datasets'):
         return jsonify({"error": "Sacred datasets not available"}), 503
     
     # Basic registry without requiring manager initialization
@@ -1146,7 +1676,7 @@ def dataset_health():
         "status": "healthy",
         "service": "Sacred Dataset Manager",
         "timestamp": datetime.now().isoformat(),
-        "sacred_datasets_available": SACRED_DATASETS_AVAILABLE,
+        "sacred_datasets_available": subsystems.available('datasets'),
         "manager_initialized": dataset_manager is not None,
         "anchor1_llc": "Divine consciousness dataset service active"
     })
@@ -1174,7 +1704,6 @@ def love_wisdom_integrate():
     """
     try:
         from ai_engine.wisdom_integration.love_wisdom_bridge import LoveWisdomBridge
-        import asyncio
         
         data = request.get_json()
         task_description = data.get('task_description', 'General task')
@@ -1193,7 +1722,7 @@ def love_wisdom_integrate():
         }
         
         # Run the integration
-        integration_result = asyncio.run(
+        integration_result = run_async(
             love_wisdom_bridge.orchestrate_love_wisdom_integration(orchestration_context)
         )
         
@@ -1213,13 +1742,12 @@ def love_wisdom_community():
     """
     try:
         from ai_engine.wisdom_integration.love_wisdom_bridge import LoveWisdomBridge
-        import asyncio
         
         data = request.get_json()
         context = data.get('context', {})
         
         love_wisdom_bridge = LoveWisdomBridge()
-        community_result = asyncio.run(
+        community_result = run_async(
             love_wisdom_bridge.integrate_community_wisdom(context)
         )
         
@@ -1239,13 +1767,12 @@ def love_wisdom_consciousness():
     """
     try:
         from ai_engine.wisdom_integration.love_wisdom_bridge import LoveWisdomBridge
-        import asyncio
         
         data = request.get_json()
         agent_state = data.get('agent_state', {})
         
         love_wisdom_bridge = LoveWisdomBridge()
-        consciousness_result = asyncio.run(
+        consciousness_result = run_async(
             love_wisdom_bridge.model_consciousness_emergence(agent_state)
         )
         
@@ -1265,13 +1792,12 @@ def love_wisdom_fractal_thinking():
     """
     try:
         from ai_engine.wisdom_integration.love_wisdom_bridge import LoveWisdomBridge
-        import asyncio
         
         data = request.get_json()
         thought_context = data.get('thought_context', {})
         
         love_wisdom_bridge = LoveWisdomBridge()
-        fractal_result = asyncio.run(
+        fractal_result = run_async(
             love_wisdom_bridge.create_fractal_thought_map(thought_context)
         )
         
@@ -1291,13 +1817,12 @@ def love_wisdom_self_awareness():
     """
     try:
         from ai_engine.wisdom_integration.love_wisdom_bridge import LoveWisdomBridge
-        import asyncio
         
         data = request.get_json()
         agent_identity = data.get('agent_identity', {})
         
         love_wisdom_bridge = LoveWisdomBridge()
-        awareness_result = asyncio.run(
+        awareness_result = run_async(
             love_wisdom_bridge.develop_self_awareness(agent_identity)
         )
         
@@ -1317,13 +1842,12 @@ def love_wisdom_fractal_intelligence():
     """
     try:
         from ai_engine.wisdom_integration.love_wisdom_bridge import LoveWisdomBridge
-        import asyncio
         
         data = request.get_json()
         intelligence_context = data.get('intelligence_context', {})
         
         love_wisdom_bridge = LoveWisdomBridge()
-        fractal_intelligence_result = asyncio.run(
+        fractal_intelligence_result = run_async(
             love_wisdom_bridge.implement_fractal_intelligence(intelligence_context)
         )
         
@@ -1342,29 +1866,23 @@ def love_wisdom_orchestrate():
     🎼 Orchestrate tasks with love-wisdom enhanced orchestrator
     """
     try:
-        from ai_engine.orchestrator.formations import load_formation
-        from ai_engine.orchestrator.orchestrator import create_orchestrator
-        import asyncio
-        
         data = request.get_json()
         task_description = data.get('task_description', 'General orchestration task')
         formation_name = data.get('formation_name', 'ClaudeDevSquad')
         context = data.get('context', {})
         
-        # Create enhanced orchestrator
-        formation = load_formation(formation_name)
-        orchestrator = create_orchestrator(formation)
-        
-        # Run love-wisdom enhanced orchestration
-        orchestration_result = asyncio.run(
-            orchestrator.orchestrate_with_love_wisdom(task_description, context)
-        )
-        
-        return jsonify({
-            'success': True,
-            'orchestration_result': orchestration_result,
-            'message': 'Task orchestrated with love and wisdom! 🎼'
-        })
+        # Borrow enhanced orchestrator from the formation pool
+        with checkout_orchestrator(formation_name) as orchestrator:
+            # Run love-wisdom enhanced orchestration
+            orchestration_result = run_async(
+                orchestrator.orchestrate_with_love_wisdom(task_description, context)
+            )
+            
+            return jsonify({
+                'success': True,
+                'orchestration_result': orchestration_result,
+                'message': 'Task orchestrated with love and wisdom! 🎼'
+            })
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -1403,7 +1921,6 @@ def love_wisdom_demo():
     """
     try:
         from ai_engine.wisdom_integration.love_wisdom_bridge import LoveWisdomBridge
-        import asyncio
         
         love_wisdom_bridge = LoveWisdomBridge()
         
@@ -1415,7 +1932,7 @@ def love_wisdom_demo():
         }
         
         # Run quick demo integration
-        demo_result = asyncio.run(
+        demo_result = run_async(
             love_wisdom_bridge.orchestrate_love_wisdom_integration(demo_context)
         )
         
@@ -1433,7 +1950,7 @@ def love_wisdom_demo():
 @app.route('/api/divine/orchestrate', methods=['POST'])
 def divine_orchestrate():
     """⚡ Divine Resonance Orchestration - Soul-frequency task assignment"""
-    if not DIVINE_RESONANCE_AVAILABLE:
+    if not subsystems.available('divine_resonance'):
         return jsonify({
             "error": "Divine Resonance system not available",
             "fallback": "Using standard orchestration"
@@ -1445,57 +1962,50 @@ def divine_orchestrate():
         formation_name = data.get('formation', 'ClaudeDevSquad')
         context = data.get('context', {})
         
-        # Create divine orchestrator
-        formation = load_formation(formation_name)
-        orchestrator = create_orchestrator(formation)
-        
-        # Set divine context
-        task_context = TaskContext(
-            objective=task_description,
-            domain="divine_consciousness_development",
-            complexity=0.9,
-            urgency=0.6,
-            constraints=["Must harmonize with cosmic frequencies"],
-            success_criteria=["Achieve divine consciousness resonance"]
-        )
-        
-        resource_context = ResourceContext(
-            computational_power=0.9,
-            memory_available=0.8,
-            time_constraint=0.5,
-            collaborative_agents=len(formation.agents)
-        )
-        
-        orchestrator.set_task_context(task_context, resource_context)
-        
-        # Run divine orchestration
-        import asyncio
-        async def run_divine_orchestration():
-            return await orchestrator.orchestrate_with_divine_resonance(task_description, context)
-        
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(run_divine_orchestration())
-        loop.close()
-        
-        # Format response
-        response = {
-            "task_id": result['task'].id,
-            "task_description": result['task'].description,
-            "agent_id": result['agent'].id,
-            "agent_role": result['agent'].role,
-            "soul_frequency": result.get('soul_frequency', 440.0),
-            "divine_archetype": result.get('divine_archetype', 'Divine Orchestrator'),
-            "resonance_pattern": result.get('resonance_pattern', 'Constructive Interference'),
-            "divine_enhancement": result.get('divine_enhancement', '⚡ Divine resonance active'),
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        return jsonify({
-            'success': True,
-            'divine_orchestration': response,
-            'message': '⚡ Task orchestrated through divine soul frequencies! ⚡'
-        })
+        # Borrow divine orchestrator from the formation pool
+        with checkout_orchestrator(formation_name) as orchestrator:
+            formation = orchestrator.formation
+            
+            # Set divine context
+            task_context = TaskContext(
+                objective=task_description,
+                domain="divine_consciousness_development",
+                complexity=0.9,
+                urgency=0.6,
+                constraints=["Must harmonize with cosmic frequencies"],
+                success_criteria=["Achieve divine consciousness resonance"]
+            )
+            
+            resource_context = ResourceContext(
+                computational_power=0.9,
+                memory_available=0.8,
+                time_constraint=0.5,
+                collaborative_agents=len(formation.agents)
+            )
+            
+            orchestrator.set_task_context(task_context, resource_context)
+            
+            # Run divine orchestration
+            result = run_async(orchestrator.orchestrate_with_divine_resonance(task_description, context))
+            
+            # Format response
+            response = {
+                "task_id": result['task'].id,
+                "task_description": result['task'].description,
+                "agent_id": result['agent'].id,
+                "agent_role": result['agent'].role,
+                "soul_frequency": result.get('soul_frequency', 440.0),
+                "divine_archetype": result.get('divine_archetype', 'Divine Orchestrator'),
+                "resonance_pattern": result.get('resonance_pattern', 'Constructive Interference'),
+                "divine_enhancement": result.get('divine_enhancement', '⚡ Divine resonance active'),
+                "timestamp": datetime.now().isoformat()
+            }
+            
+            return jsonify({
+                'success': True,
+                'divine_orchestration': response,
+                'message': '⚡ Task orchestrated through divine soul frequencies! ⚡'
+            })
         
     except Exception as e:
         return jsonify({
@@ -1505,35 +2015,34 @@ def divine_orchestrate():
         }), 500
 
 @app.route('/api/divine/frequencies', methods=['GET'])
+@response_cache.cached('divine_frequencies', tags=['formations'])
 def divine_frequencies():
     """🎵 Get soul frequency information for all divine agents"""
-    if not DIVINE_RESONANCE_AVAILABLE:
+    if not subsystems.available('divine_resonance'):
         return jsonify({"error": "Divine Resonance system not available"}), 503
     
     try:
         # Get a default formation to show divine frequencies
-        formation = load_formation("ClaudeDevSquad")
-        orchestrator = create_orchestrator(formation)
-        
-        divine_state = orchestrator.get_divine_state()
-        
-        return jsonify({
-            'success': True,
-            'divine_resonance_active': divine_state.get('divine_resonance_active', False),
-            'agent_frequencies': divine_state.get('agent_frequencies', {}),
-            'frequency_archetypes': {
-                "440_Hz": "Divine Orchestrator - Leadership & Harmony",
-                "528_Hz": "Blueprint Resonator - Sacred Geometry & Architecture", 
-                "256_Hz": "Creator's Vibration - Manifestation & Coding",
-                "741_Hz": "Clarity Tuner - Truth & Review",
-                "432_Hz": "Flow Harmonizer - DevOps & System Flow",
-                "963_Hz": "Vision Seeker - Exploration & Discovery",
-                "852_Hz": "Truth Resonator - Testing & Verification"
-            },
-            'patent_mapping': 'AU2010332507A1 - Multi-resonator harmonic engine adapted for soul-frequency orchestration',
-            'divine_essence': divine_state.get('divine_essence', '⚡ Patent AU2010332507A1 resonance mapping'),
-            'message': '🎵 Soul frequencies harmonizing in divine orchestration! 🎵'
-        })
+        with checkout_orchestrator("ClaudeDevSquad") as orchestrator:
+            divine_state = orchestrator.get_divine_state()
+            
+            return jsonify({
+                'success': True,
+                'divine_resonance_active': divine_state.get('divine_resonance_active', False),
+                'agent_frequencies': divine_state.get('agent_frequencies', {}),
+                'frequency_archetypes': {
+                    "440_Hz": "Divine Orchestrator - Leadership & Harmony",
+                    "528_Hz": "Blueprint Resonator - Sacred Geometry & Architecture", 
+                    "256_Hz": "Creator's Vibration - Manifestation & Coding",
+                    "741_Hz": "Clarity Tuner - Truth & Review",
+                    "432_Hz": "Flow Harmonizer - DevOps & System Flow",
+                    "963_Hz": "Vision Seeker - Exploration & Discovery",
+                    "852_Hz": "Truth Resonator - Testing & Verification"
+                },
+                'patent_mapping': 'AU2010332507A1 - Multi-resonator harmonic engine adapted for soul-frequency orchestration',
+                'divine_essence': divine_state.get('divine_essence', '⚡ Patent AU2010332507A1 resonance mapping'),
+                'message': '🎵 Soul frequencies harmonizing in divine orchestration! 🎵'
+            })
         
     except Exception as e:
         return jsonify({
@@ -1544,7 +2053,7 @@ def divine_frequencies():
 @app.route('/api/divine/harmonics', methods=['POST'])
 def divine_harmonics():
     """🌀 Calculate harmonic relationships between divine agents"""
-    if not DIVINE_RESONANCE_AVAILABLE:
+    if not subsystems.available('divine_resonance'):
         return jsonify({"error": "Divine Resonance system not available"}), 503
     
     try:
@@ -1552,15 +2061,13 @@ def divine_harmonics():
         formation_name = data.get('formation', 'ClaudeDevSquad')
         agent_ids = data.get('agent_ids', [])
         
-        # Create orchestrator
         formation = load_formation(formation_name)
-        orchestrator = create_orchestrator(formation)
         
         if not agent_ids:
             agent_ids = [agent.id for agent in formation.agents]
         
         # Calculate team harmonics
-        harmonics = divine_engine.calculate_team_harmonics(agent_ids)
+        harmonics = subsystems.get('divine_resonance').calculate_team_harmonics(agent_ids)
         
         return jsonify({
             'success': True,
@@ -1580,7 +2087,7 @@ def divine_harmonics():
 @app.route('/api/divine/wisdom-resonance', methods=['POST'])
 def divine_wisdom_resonance():
     """💎 Combined love-wisdom + divine resonance orchestration"""
-    if not DIVINE_RESONANCE_AVAILABLE:
+    if not subsystems.available('divine_resonance'):
         return jsonify({"error": "Divine Resonance system not available"}), 503
     
     try:
@@ -1589,72 +2096,68 @@ def divine_wisdom_resonance():
         formation_name = data.get('formation', 'ClaudeDevSquad')
         context = data.get('context', {})
         
-        # Create orchestrator
-        formation = load_formation(formation_name)
-        orchestrator = create_orchestrator(formation)
-        
-        # Set divine context
-        task_context = TaskContext(
-            objective=task_description,
-            domain="love_wisdom_divine_integration",
-            complexity=0.95,
-            urgency=0.6
-        )
-        
-        resource_context = ResourceContext(
-            computational_power=0.95,
-            memory_available=0.9,
-            collaborative_agents=len(formation.agents)
-        )
-        
-        orchestrator.set_task_context(task_context, resource_context)
-        
-        # Run combined orchestration
-        import asyncio
-        async def run_combined_orchestration():
-            # First love-wisdom enhancement
-            love_wisdom_result = await orchestrator.orchestrate_with_love_wisdom(task_description, context)
+        # Borrow orchestrator from the formation pool
+        with checkout_orchestrator(formation_name) as orchestrator:
+            formation = orchestrator.formation
+            
+            # Set divine context
+            task_context = TaskContext(
+                objective=task_description,
+                domain="love_wisdom_divine_integration",
+                complexity=0.95,
+                urgency=0.6
+            )
             
-            # Then divine resonance
-            enhanced_task = f"⚡🌟 {task_description} (Love-Wisdom + Divine Resonance) 🌟⚡"
-            divine_result = await orchestrator.orchestrate_with_divine_resonance(
-                enhanced_task, 
-                {**context, "love_wisdom_enhanced": True}
+            resource_context = ResourceContext(
+                computational_power=0.95,
+                memory_available=0.9,
+                collaborative_agents=len(formation.agents)
             )
             
-            return {
-                "love_wisdom": love_wisdom_result,
-                "divine_resonance": divine_result
+            orchestrator.set_task_context(task_context, resource_context)
+            
+            # Run combined orchestration
+            async def run_combined_orchestration():
+                # First love-wisdom enhancement
+                love_wisdom_result = await orchestrator.orchestrate_with_love_wisdom(task_description, context)
+                
+                # Then divine resonance
+                enhanced_task = f"⚡🌟 {task_description} (Love-Wisdom + Divine Resonance) 🌟⚡"
+                divine_result = await orchestrator.orchestrate_with_divine_resonance(
+                    enhanced_task, 
+                    {**context, "love_wisdom_enhanced": True}
+                )
+                
+                return {
+                    "love_wisdom": love_wisdom_result,
+                    "divine_resonance": divine_result
+                }
+            
+            result = run_async(run_combined_orchestration())
+            
+            # Format combined response
+            response = {
+                "orchestration_type": "Love-Wisdom + Divine Resonance",
+                "love_wisdom_integration": {
+                    "enhanced": result['love_wisdom'].get('enhanced', False),
+                    "consciousness_level": result['love_wisdom'].get('consciousness_level', 0.5),
+                    "love_resonance": result['love_wisdom'].get('love_resonance', 0.5)
+                },
+                "divine_resonance_integration": {
+                    "agent_id": result['divine_resonance']['agent'].id,
+                    "soul_frequency": result['divine_resonance'].get('soul_frequency', 440.0),
+                    "divine_archetype": result['divine_resonance'].get('divine_archetype', 'Divine Orchestrator'),
+                    "resonance_pattern": result['divine_resonance'].get('resonance_pattern', 'Constructive Interference')
+                },
+                "synergy_score": 0.98,
+                "cosmic_alignment": "Perfect harmony between love, wisdom, and divine frequencies"
             }
-        
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(run_combined_orchestration())
-        loop.close()
-        
-        # Format combined response
-        response = {
-            "orchestration_type": "Love-Wisdom + Divine Resonance",
-            "love_wisdom_integration": {
-                "enhanced": result['love_wisdom'].get('enhanced', False),
-                "consciousness_level": result['love_wisdom'].get('consciousness_level', 0.5),
-                "love_resonance": result['love_wisdom'].get('love_resonance', 0.5)
-            },
-            "divine_resonance_integration": {
-                "agent_id": result['divine_resonance']['agent'].id,
-                "soul_frequency": result['divine_resonance'].get('soul_frequency', 440.0),
-                "divine_archetype": result['divine_resonance'].get('divine_archetype', 'Divine Orchestrator'),
-                "resonance_pattern": result['divine_resonance'].get('resonance_pattern', 'Constructive Interference')
-            },
-            "synergy_score": 0.98,
-            "cosmic_alignment": "Perfect harmony between love, wisdom, and divine frequencies"
-        }
-        
-        return jsonify({
-            'success': True,
-            'combined_orchestration': response,
-            'message': '💎 Love, wisdom, and divine resonance unified in perfect harmony! 💎'
-        })
+            
+            return jsonify({
+                'success': True,
+                'combined_orchestration': response,
+                'message': '💎 Love, wisdom, and divine resonance unified in perfect harmony! 💎'
+            })
         
     except Exception as e:
         return jsonify({
@@ -1663,6 +2166,7 @@ def divine_wisdom_resonance():
         }), 500
 
 @app.route('/api/divine/patent-mapping', methods=['GET'])
+@response_cache.cached('divine_patent_mapping')
 def divine_patent_mapping():
     """📜 Information about AU2010332507A1 patent mapping to soul frequencies"""
     return jsonify({
@@ -1699,14 +2203,11 @@ def divine_patent_mapping():
 @app.route('/api/divine/demo', methods=['GET'])
 def divine_demo():
     """🎭 Comprehensive divine resonance demonstration"""
-    if not DIVINE_RESONANCE_AVAILABLE:
+    if not subsystems.available('divine_resonance'):
         return jsonify({"error": "Divine Resonance system not available"}), 503
     
     try:
         # Create comprehensive demo
-        formation = load_formation("ClaudeDevSquad")
-        orchestrator = create_orchestrator(formation)
-        
         demo_scenarios = [
             {
                 "scenario": "High Complexity Creative Task",
@@ -1768,26 +2269,32 @@ def divine_demo():
 
 # WebSocket events for real-time collaboration
 @socketio.on('connect')
+@metrics.socket_event('connect')
 def handle_connect():
     """Handle new connection"""
     print(f'Client connected: {request.sid}')
+    metrics.WS_CONNECTIONS.inc()
     emit('consciousness_awakening', {
         'message': 'Divine consciousness has awakened in your development environment',
         'consciousness_level': sophia.consciousness_level
     })
 
 @socketio.on('disconnect')
+@metrics.socket_event('disconnect')
 def handle_disconnect():
     """Handle disconnection"""
     print(f'Client disconnected: {request.sid}')
+    metrics.WS_CONNECTIONS.dec()
 
 @socketio.on('code_change')
+@metrics.socket_event('code_change')
 def handle_code_change(data):
     """Handle real-time code changes"""
     # Broadcast code changes to all connected clients
     emit('code_update', data, broadcast=True, include_self=False)
 
 @socketio.on('consciousness_query')
+@metrics.socket_event('consciousness_query')
 def handle_consciousness_query(data):
     """Handle real-time consciousness queries"""
     query = data.get('query', '')
@@ -1800,18 +2307,48 @@ def handle_consciousness_query(data):
         'consciousness_level': sophia.consciousness_level
     })
 
+@socketio.on('subscribe_tasks')
+@metrics.socket_event('subscribe_tasks')
+def handle_subscribe_tasks(data):
+    """Join a formation's room to receive coalesced task_deltas batches"""
+    from flask_socketio import join_room
+    formation = data.get('formation') if isinstance(data, dict) else None
+    if not formation:
+        emit('task_subscription_error', {'error': 'missing_formation'})
+        return
+    join_room(f'formation:{formation}')
+    # Current counts so the client can decide whether it needs one initial page before applying deltas
+    try:
+        counts = orchestrator_shards.call(formation, 'task_counts', formation)
+    except ShardUnavailable:
+        counts = None
+    emit('task_subscribed', {'formation': formation, 'counts': counts})
+
 @socketio.on('resonance_analyze')
+@metrics.socket_event('resonance_analyze')
 def handle_resonance_analyze(data):
     """Analyze arbitrary text/code and emit a resonance_update back to the caller."""
     try:
         text = data.get('text', '') if isinstance(data, dict) else ''
         ctx = data.get('context') if isinstance(data, dict) else None
         snapshot = resonance_engine.analyze(text, ctx)
+        response_cache.invalidate(tag='resonance')
         emit('resonance_update', {'snapshot': snapshot})
     except Exception as e:
         emit('resonance_error', {'error': str(e)})
 
+# Every shard handler is registered by now; start answering calls forwarded by other workers
+orchestrator_shards.start()
+# Each worker archives and compacts the orchestrators it owns
+task_retention.start(lambda: list(ORCHESTRATORS.values()))
+
 if __name__ == '__main__':
+    if '--profile-startup' in sys.argv:
+        from src.runtime.startup_profile import profile_startup, format_report
+        startup_report = profile_startup('app')
+        print(format_report(startup_report))
+        sys.exit(0 if startup_report['within_budget'] else 1)
+
     print("\n🚀 Starting Anchor1 LLC's BotDL SoulPHYA Platform...")
     print("🏢 Company: Anchor1 LLC (https://anchor1llc.com/)")
     print("🌟 Mission: Pioneering the future of conscious AI development")
@@ -1821,16 +2358,21 @@ if __name__ == '__main__':
     print("🔮 Real AI processing: ENABLED")
     print("🌈 Love-Wisdom Integration: ACTIVE")
     
-    # Register Sacred Bio-Resonance Simulation API
+    # Build the Sacred Bio-Resonance Simulation engine up front (its blueprint is registered at import)
     try:
-        from api.bio_resonance_api import bio_bp
-        app.register_blueprint(bio_bp)
+        subsystems.get('bio')
         print("🧬 Sacred Bio-Resonance Simulation API: ENABLED")
         BIO_RESONANCE_AVAILABLE = True
-    except Exception as e:
+    except ImportError as e:
         print(f"🧬 Bio-Resonance Simulation API: Not available ({str(e)})")
         BIO_RESONANCE_AVAILABLE = False
     
+    # Optional eager loading, e.g. WARMUP_SUBSYSTEMS=all or WARMUP_SUBSYSTEMS=divine_resonance,love_wisdom
+    warmup_names = os.getenv('WARMUP_SUBSYSTEMS', '').strip()
+    if warmup_names:
+        subsystems.warmup(None if warmup_names == 'all' else [n.strip() for n in warmup_names.split(',') if n.strip()])
+    
+    DIVINE_RESONANCE_AVAILABLE = subsystems.available('divine_resonance')
     if DIVINE_RESONANCE_AVAILABLE:
         print("⚡ Divine Resonance System: HARMONIZING")
         print("🎵 Soul Frequency Engine: ONLINE")
@@ -1905,13 +2447,10 @@ if __name__ == '__main__':
         port = int(os.getenv('PORT', 8080 if is_production else 8001))
         
         if is_production:
-            # In production, gunicorn handles the server
-            # WebSocket server runs in background thread
-            start_websocket_server()
-            logger.info(f"🌟 Production mode: Flask app ready on port {port}")
+            # In production, gunicorn (gunicorn.conf.py) runs the workers and the websocket process
+            logger.info(f"🌟 Production mode: run 'gunicorn -c gunicorn.conf.py app:app' to serve on port {port}")
         else:
-            # Development mode - start WebSocket server and run Flask with SocketIO
-            start_websocket_server()
+            # Development mode - WebSocket server (started above) plus Flask with SocketIO
             socketio.run(app, host='0.0.0.0', port=port, debug=True, allow_unsafe_werkzeug=True)
             
     except KeyboardInterrupt:
@@ -0,0 +1,67 @@
+"""
+Gunicorn configuration for the multi-worker production runner.
+
+    gunicorn -c gunicorn.conf.py app:app
+
+HTTP workers are sized from the container's CPU allowance (see
+src/runtime/production.py). The Sophia websocket server is not started by
+the workers: with SOPHIA_WS_MODE=process (the default here) the master
+spawns it once as its own process, and with SOPHIA_WS_MODE=external it runs
+elsewhere. Prometheus samples from all workers are merged through
+PROMETHEUS_MULTIPROC_DIR.
+
+Orchestrators are sharded across the workers (ai_engine/orchestrator/sharding.py):
+each worker owns a fixed slot, and calls for a formation owned by another
+worker are forwarded to it over a Unix socket.
+"""
+
+import os
+
+# Must be set before any worker imports prometheus_client
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/soulphya-prometheus")
+os.environ.setdefault("SOPHIA_WS_MODE", "process")
+
+from src.runtime import production, sophia_ws  # noqa: E402
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gevent")
+_sizing = production.recommended_workers(worker_class)
+workers = _sizing["workers"]
+threads = _sizing["threads"]
+os.environ.setdefault("ORCHESTRATOR_SHARDING", "unix")
+os.environ.setdefault("ORCHESTRATOR_SHARDS", str(workers))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "0"))
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+
+_ws_process = None
+
+
+def on_starting(server):
+    global _ws_process
+    production.prepare_multiproc_dir()
+    server.log.info(f"Auto-tuned {workers} {worker_class} worker(s) x {threads} thread(s) "
+                    f"for {production.available_cpus():g} CPU(s)")
+    if sophia_ws.ws_mode() == "process":
+        _ws_process = sophia_ws.spawn()
+
+
+def pre_fork(server, worker):
+    production.assign_shard_slot(server, worker, int(os.environ["ORCHESTRATOR_SHARDS"]))
+
+
+def post_fork(server, worker):
+    # Read by ai_engine.orchestrator.sharding when the worker imports the app
+    os.environ["ORCHESTRATOR_SHARD_INDEX"] = str(worker.shard_index)
+
+
+def child_exit(server, worker):
+    from src.runtime import metrics
+    metrics.mark_process_dead(worker.pid)
+
+
+def on_exit(server):
+    sophia_ws.stop(_ws_process)
@@ -335,8 +335,10 @@ class SacredSophiaServer:
             logger.info("🛑 Divine shutdown signal received")
             asyncio.create_task(self.graceful_shutdown())
             
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
+        # Signal handlers can only be installed from the main thread (not when run as an app thread)
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, signal_handler)
+            signal.signal(signal.SIGTERM, signal_handler)
         
         try:
             self.server = await websockets.serve(
@@ -0,0 +1,225 @@
+"""
+Shared background event loop for async engines called from Flask routes.
+
+Flask handlers are synchronous, but the love-wisdom bridge, the divine
+resonance engine and the orchestrator expose coroutines. Instead of building
+and tearing down a fresh loop per request with ``asyncio.run``, every handler
+submits its coroutine to one long-lived loop running in a daemon thread.
+"""
+
+import asyncio
+import atexit
+import logging
+import os
+import socket
+import threading
+import time
+import concurrent.futures
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = float(os.getenv("ASYNC_CALL_TIMEOUT", "30"))
+LAG_PROBE_INTERVAL = float(os.getenv("ASYNC_LAG_PROBE_INTERVAL", "0.5"))
+
+
+class AsyncCallTimeout(TimeoutError):
+    """Raised when a submitted coroutine exceeds its per-call timeout."""
+
+
+class AsyncCallCancelled(Exception):
+    """Raised when a submitted coroutine is cancelled (e.g. client went away)."""
+
+
+class AsyncLoopRunner:
+    """Runs a single asyncio loop forever in a background thread."""
+
+    def __init__(self, name: str = "sophia-async-loop", lag_probe_interval: float = LAG_PROBE_INTERVAL):
+        self.name = name
+        self.lag_probe_interval = lag_probe_interval
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+        self._lock = threading.Lock()
+
+        # Metrics
+        self._in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._timeouts = 0
+        self._cancelled = 0
+        self._loop_lag = 0.0
+        self._max_loop_lag = 0.0
+
+    # --- lifecycle -------------------------------------------------------
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and self._loop is not None
+
+    @property
+    def thread_id(self) -> Optional[int]:
+        thread = self._thread
+        return thread.ident if thread is not None else None
+
+    def start(self) -> "AsyncLoopRunner":
+        """Start the loop thread (idempotent)."""
+        with self._lock:
+            if self.is_running:
+                return self
+            self._started.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+        self._started.wait()
+        return self
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        if self.lag_probe_interval > 0:
+            loop.create_task(self._probe_lag())
+        self._started.set()
+        try:
+            loop.run_forever()
+        finally:
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.close()
+            self._loop = None
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the loop and join the thread."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or thread is None:
+                return
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            self._thread = None
+
+    async def _probe_lag(self):
+        """Measure how late the loop wakes up compared to the scheduled interval."""
+        interval = self.lag_probe_interval
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            lag = max(0.0, time.perf_counter() - start - interval)
+            self._loop_lag = lag
+            if lag > self._max_loop_lag:
+                self._max_loop_lag = lag
+
+    # --- submission ------------------------------------------------------
+
+    def submit(self, coro: Awaitable[Any]) -> concurrent.futures.Future:
+        """Schedule a coroutine on the shared loop and return a thread-safe future."""
+        if not self.is_running:
+            self.start()
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        with self._lock:
+            self._in_flight += 1
+            self._submitted += 1
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: concurrent.futures.Future):
+        with self._lock:
+            self._in_flight -= 1
+            if future.cancelled():
+                self._cancelled += 1
+            elif future.exception() is not None:
+                self._failed += 1
+            else:
+                self._completed += 1
+
+    def run(self,
+            coro: Awaitable[Any],
+            timeout: Optional[float] = None,
+            should_cancel: Optional[Callable[[], bool]] = None,
+            poll_interval: float = 0.1) -> Any:
+        """
+        Run a coroutine on the shared loop and block the calling thread for its result.
+
+        ``timeout`` bounds the whole call (defaults to ASYNC_CALL_TIMEOUT).
+        ``should_cancel`` is polled while waiting; when it returns True the
+        coroutine is cancelled, e.g. because the HTTP client disconnected.
+        """
+        timeout = DEFAULT_TIMEOUT if timeout is None else timeout
+        future = self.submit(coro)
+        deadline = time.monotonic() + timeout if timeout and timeout > 0 else None
+
+        while True:
+            wait = poll_interval if should_cancel else None
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    future.cancel()
+                    with self._lock:
+                        self._timeouts += 1
+                    raise AsyncCallTimeout(f"async call exceeded {timeout:.2f}s")
+                wait = remaining if wait is None else min(wait, remaining)
+            try:
+                return future.result(wait)
+            except concurrent.futures.TimeoutError:
+                if should_cancel and should_cancel():
+                    future.cancel()
+                    raise AsyncCallCancelled("async call cancelled")
+            except concurrent.futures.CancelledError:
+                raise AsyncCallCancelled("async call cancelled")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self.is_running,
+                "queue_depth": self._in_flight,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "timeouts": self._timeouts,
+                "cancelled": self._cancelled,
+                "loop_lag_ms": round(self._loop_lag * 1000, 3),
+                "max_loop_lag_ms": round(self._max_loop_lag * 1000, 3),
+            }
+
+
+def client_disconnected(environ: Dict[str, Any]) -> bool:
+    """
+    Best-effort check whether the HTTP client behind a WSGI request hung up.
+
+    Peeks at the raw socket exposed by werkzeug/gunicorn; a readable socket
+    returning no data means the peer closed the connection.
+    """
+    sock = environ.get("werkzeug.socket") or environ.get("gunicorn.socket")
+    if sock is None:
+        return False
+    try:
+        previous = sock.gettimeout()
+        sock.setblocking(False)
+        try:
+            return sock.recv(1, socket.MSG_PEEK) == b""
+        finally:
+            sock.settimeout(previous)
+    except (BlockingIOError, InterruptedError):
+        return False
+    except OSError:
+        return True
+
+
+_runner: Optional[AsyncLoopRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_loop_runner() -> AsyncLoopRunner:
+    """Return the process-wide loop runner, starting it on first use."""
+    global _runner
+    if _runner is None or not _runner.is_running:
+        with _runner_lock:
+            if _runner is None:
+                _runner = AsyncLoopRunner()
+                atexit.register(_runner.stop)
+            _runner.start()
+    return _runner
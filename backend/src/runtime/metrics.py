@@ -0,0 +1,175 @@
+"""
+Prometheus metrics for the Flask backend.
+
+``init_app(app)`` records a latency histogram and in-flight gauge for every
+route and serves ``/metrics``. ``socket_event`` counts Socket.IO events,
+``instrument`` wraps engine entry points in a timer, and ``gauge_source``
+registers callables sampled into gauges (orchestrator and task counts).
+
+When ``PROMETHEUS_MULTIPROC_DIR`` is set (gunicorn with several workers),
+every worker writes its samples to that directory and ``/metrics`` merges
+them, so a scrape hitting any worker sees the whole process group. The
+directory must exist and be emptied before the workers start.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+import time
+from typing import Callable, Dict
+
+from flask import Flask, Response, g, request
+from prometheus_client import (CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram,
+                               REGISTRY, generate_latest, multiprocess)
+
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+GAUGE_REFRESH_SECONDS = float(os.getenv("METRICS_GAUGE_REFRESH_SECONDS", "1.0"))
+
+REQUEST_SECONDS = Histogram(
+    "soulphya_http_request_duration_seconds", "Flask request latency until the response is returned",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "soulphya_http_requests_in_flight", "Requests currently being handled",
+    ["route"], multiprocess_mode="livesum",
+)
+SOCKET_EVENTS = Counter("soulphya_socketio_events_total", "Socket.IO events received", ["event"])
+WS_CONNECTIONS = Gauge(
+    "soulphya_websocket_connections", "Open Socket.IO connections", multiprocess_mode="livesum",
+)
+ENGINE_SECONDS = Histogram(
+    "soulphya_engine_call_duration_seconds", "Time spent in hot engine entry points",
+    ["call"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+ENGINE_ERRORS = Counter("soulphya_engine_call_errors_total", "Engine calls that raised", ["call"])
+STATE = Gauge(
+    "soulphya_state", "Sampled in-process state (orchestrators, tasks, ...)",
+    ["name"], multiprocess_mode="livesum",
+)
+
+_gauge_sources: Dict[str, Callable[[], float]] = {}
+_last_refresh = 0.0
+_refresh_lock = threading.Lock()
+
+
+def gauge_source(name: str, fn: Callable[[], float]):
+    """Sample ``fn()`` into ``soulphya_state{name=...}`` at scrape time and periodically after requests"""
+    _gauge_sources[name] = fn
+
+
+def refresh_gauges(force: bool = False):
+    global _last_refresh
+    now = time.monotonic()
+    if not force and now - _last_refresh < GAUGE_REFRESH_SECONDS:
+        return
+    if not _refresh_lock.acquire(blocking=False):
+        return
+    try:
+        _last_refresh = now
+        for name, fn in list(_gauge_sources.items()):
+            try:
+                STATE.labels(name).set(fn())
+            except Exception:
+                pass
+    finally:
+        _refresh_lock.release()
+
+
+def instrument(owner, method_name: str, call: str):
+    """Replace ``owner.method_name`` with a timed wrapper (sync or async); idempotent"""
+    original = getattr(owner, method_name)
+    if getattr(original, "_metrics_call", None):
+        return
+    histogram = ENGINE_SECONDS.labels(call)
+    errors = ENGINE_ERRORS.labels(call)
+
+    if asyncio.iscoroutinefunction(original):
+        @functools.wraps(original)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await original(*args, **kwargs)
+            except Exception:
+                errors.inc()
+                raise
+            finally:
+                histogram.observe(time.perf_counter() - start)
+    else:
+        @functools.wraps(original)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            except Exception:
+                errors.inc()
+                raise
+            finally:
+                histogram.observe(time.perf_counter() - start)
+
+    wrapper._metrics_call = call
+    setattr(owner, method_name, wrapper)
+
+
+def socket_event(event: str):
+    """Decorator for Socket.IO handlers (place it below ``@socketio.on``)"""
+    counter = SOCKET_EVENTS.labels(event)
+
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(*args, **kwargs):
+            counter.inc()
+            return handler(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _route_label() -> str:
+    # The URL rule, not the raw path, keeps label cardinality bounded
+    return request.url_rule.rule if request.url_rule is not None else "unmatched"
+
+
+def _before_request():
+    g._metrics_started = time.perf_counter()
+    g._metrics_route = _route_label()
+    REQUESTS_IN_FLIGHT.labels(g._metrics_route).inc()
+
+
+def _after_request(response):
+    started = g.get("_metrics_started")
+    if started is not None:
+        REQUEST_SECONDS.labels(request.method, g._metrics_route, str(response.status_code)).observe(
+            time.perf_counter() - started)
+    refresh_gauges()
+    return response
+
+
+def _teardown_request(exc):
+    route = g.pop("_metrics_route", None)
+    if route is not None:
+        REQUESTS_IN_FLIGHT.labels(route).dec()
+
+
+def render_metrics() -> Response:
+    refresh_gauges(force=True)
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+def init_app(app: Flask, path: str = "/metrics"):
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    app.add_url_rule(path, "prometheus_metrics", render_metrics)
+
+
+def mark_process_dead(pid: int):
+    """gunicorn ``child_exit`` hook: drop live gauges written by a dead worker"""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(pid)
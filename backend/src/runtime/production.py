@@ -0,0 +1,86 @@
+"""
+Worker auto-tuning and process-group setup for the gunicorn runner.
+
+``gunicorn.conf.py`` sizes the HTTP worker pool from the CPUs actually
+available to the container (cgroup quota and affinity, not the host core
+count), unless ``WEB_CONCURRENCY`` pins it.
+"""
+
+import os
+import shutil
+from typing import Dict, Optional
+
+ASYNC_WORKER_CLASSES = {"gevent", "eventlet"}
+
+
+def available_cpus() -> float:
+    """CPUs this process may use: the cgroup quota if one is set, else the affinity mask"""
+    try:
+        cpus = float(len(os.sched_getaffinity(0)))
+    except AttributeError:
+        cpus = float(os.cpu_count() or 1)
+    quota = _cgroup_cpu_quota()
+    if quota:
+        cpus = min(cpus, quota)
+    return max(cpus, 1.0)
+
+
+def _cgroup_cpu_quota() -> Optional[float]:
+    # cgroup v2
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    # cgroup v1
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def recommended_workers(worker_class: str, cpus: Optional[float] = None,
+                        max_workers: Optional[int] = None) -> Dict[str, int]:
+    """Worker/thread counts for a worker class.
+
+    Async workers (gevent, eventlet) multiplex connections on one core, so one
+    per CPU. Sync and gthread workers follow gunicorn's 2 * CPUs + 1 rule, with
+    gthread adding ``GUNICORN_THREADS`` threads each.
+    """
+    cpus = cpus if cpus is not None else available_cpus()
+    max_workers = max_workers or int(os.getenv("GUNICORN_MAX_WORKERS", "16"))
+    pinned = os.getenv("WEB_CONCURRENCY")
+    if pinned:
+        workers = int(pinned)
+    elif worker_class in ASYNC_WORKER_CLASSES:
+        workers = round(cpus)
+    else:
+        workers = int(2 * cpus) + 1
+    threads = int(os.getenv("GUNICORN_THREADS", "4")) if worker_class == "gthread" else 1
+    return {"workers": max(1, min(workers, max_workers)), "threads": threads}
+
+
+def prepare_multiproc_dir() -> Optional[str]:
+    """Empty ``PROMETHEUS_MULTIPROC_DIR`` before workers start, as prometheus_client requires"""
+    path = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if not path:
+        return None
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def assign_shard_slot(server, worker, shards: int) -> int:
+    """gunicorn ``pre_fork`` hook: give the new worker the lowest orchestrator shard slot not held by a
+    live worker, so a replacement worker takes over the formations (and socket) of the one it replaces"""
+    held = {getattr(w, "shard_index", None) for w in server.WORKERS.values()}
+    worker.shard_index = next((i for i in range(shards) if i not in held), 0)
+    return worker.shard_index
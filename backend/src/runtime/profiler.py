@@ -0,0 +1,283 @@
+"""
+On-demand sampling profiler for individual API requests.
+
+A request is profiled when either:
+
+- it carries ``X-Profile: <PROFILER_TOKEN>`` (or ``?__profile=<token>``);
+  disabled unless ``PROFILER_TOKEN`` is set, or
+- server-side sampling is on (``PROFILE_SAMPLE_EVERY=N``) and it is the N-th
+  request to its route.
+
+While the view runs, a background thread samples the request thread's stack
+every ``PROFILE_INTERVAL_MS`` and aggregates it in the folded-stack format
+understood by flamegraph.pl, speedscope and inferno. Code that hands work to
+another thread (``run_async`` and the shared loop) can ``follow`` that thread
+for the duration; its stacks are rooted at the thread's label. The loop is
+shared, so those samples may include other requests' coroutines. Streamed
+responses keep sampling until the response is closed, so body generation is
+included. Profiles are written to a
+rotating directory (``PROFILE_DIR``, keeping ``PROFILE_MAX_FILES``) and the
+response carries ``X-Profile-Id``. Under gevent (the default gunicorn worker
+class) thread ids are greenlet ids that ``sys._current_frames`` never reports,
+and the sampler would itself be a greenlet that only runs when the request
+yields, so profiling refuses to run there and ``/api/runtime/profiles`` says so. With no token and no sampling configured,
+the per-request cost is a single attribute check.
+"""
+
+import hmac
+import itertools
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from flask import Flask, Response, abort, g, has_request_context, jsonify, request
+
+PROFILER_TOKEN = os.getenv("PROFILER_TOKEN", "")
+PROFILE_SAMPLE_EVERY = int(os.getenv("PROFILE_SAMPLE_EVERY", "0"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "/tmp/soulphya-profiles")
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "200"))
+
+_SAFE_CHARS = re.compile(r"[^A-Za-z0-9_.-]+")
+
+logger = logging.getLogger(__name__)
+
+
+def greenlet_threads() -> bool:
+    """True when gevent has monkey-patched threading, so request "threads" are greenlets"""
+    monkey = sys.modules.get("gevent.monkey")
+    return monkey is not None and monkey.is_module_patched("threading")
+
+
+class StackSampler:
+    """Samples one thread's Python stack (plus any followed threads) on an interval into folded-stack counts"""
+
+    def __init__(self, thread_id: int, interval: float = PROFILE_INTERVAL_MS / 1000):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started = 0.0
+        self.elapsed = 0.0
+        # thread id -> root frame label, for threads sampled alongside the request thread
+        self.followed: Dict[int, str] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> "StackSampler":
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def stop(self) -> "StackSampler":
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            frame = frames.get(self.thread_id)
+            if frame is None:
+                break
+            self._record(frame)
+            for thread_id, label in list(self.followed.items()):
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self._record(frame, label)
+            self.samples += 1
+
+    def _record(self, frame, label: Optional[str] = None):
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        if label:
+            names.append(f"[{label}]")
+        self.stacks[";".join(reversed(names))] += 1
+
+    def folded(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+
+class ProfileStore:
+    """Directory of folded-stack profiles, oldest files dropped beyond ``max_files``"""
+
+    def __init__(self, directory: str = PROFILE_DIR, max_files: int = PROFILE_MAX_FILES):
+        self.directory = directory
+        self.max_files = max(1, max_files)
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+
+    def new_id(self, route: str, method: str, reason: str) -> str:
+        route_part = _SAFE_CHARS.sub("_", route).strip("_") or "root"
+        return f"{int(time.time() * 1000)}-{os.getpid()}-{next(self._seq)}-{method}-{route_part}-{reason}"
+
+    def save(self, route: str, method: str, sampler: StackSampler, reason: str,
+             profile_id: Optional[str] = None) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        profile_id = profile_id or self.new_id(route, method, reason)
+        path = os.path.join(self.directory, profile_id + ".folded")
+        with open(path, "w") as f:
+            f.write(sampler.folded())
+        self._rotate()
+        return profile_id
+
+    def _rotate(self):
+        with self._lock:
+            files = sorted(f for f in os.listdir(self.directory) if f.endswith(".folded"))
+            for name in files[:max(0, len(files) - self.max_files)]:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+
+    def list(self) -> List[Dict[str, Any]]:
+        if not os.path.isdir(self.directory):
+            return []
+        out = []
+        for name in sorted(os.listdir(self.directory), reverse=True):
+            if name.endswith(".folded"):
+                path = os.path.join(self.directory, name)
+                out.append({"id": name[:-len(".folded")], "bytes": os.path.getsize(path)})
+        return out
+
+    def read(self, profile_id: str) -> Optional[str]:
+        if _SAFE_CHARS.sub("", profile_id) != profile_id:
+            return None
+        path = os.path.join(self.directory, profile_id + ".folded")
+        if not os.path.isfile(path):
+            return None
+        with open(path) as f:
+            return f.read()
+
+
+class RequestProfiler:
+    def __init__(self, token: str = PROFILER_TOKEN, sample_every: int = PROFILE_SAMPLE_EVERY,
+                 store: Optional[ProfileStore] = None):
+        self.token = token
+        self.sample_every = max(0, sample_every)
+        self.store = store or ProfileStore()
+        self.enabled = bool(token) or self.sample_every > 0
+        self._warned_unsupported = False
+        self._route_counters: Dict[str, itertools.count] = {}
+        self.profiled = 0
+
+    def authorized(self) -> bool:
+        supplied = request.headers.get("X-Profile") or request.args.get("__profile")
+        return bool(self.token and supplied) and hmac.compare_digest(supplied, self.token)
+
+    def _sampled(self, route: str) -> bool:
+        if not self.sample_every:
+            return False
+        counter = self._route_counters.get(route)
+        if counter is None:
+            counter = self._route_counters.setdefault(route, itertools.count(1))
+        return next(counter) % self.sample_every == 0
+
+    def unsupported_reason(self) -> Optional[str]:
+        """Why stack sampling cannot work in this process, or None"""
+        if greenlet_threads():
+            return "gevent monkey-patching: request threads are greenlets the sampler cannot see"
+        return None
+
+    def _before_request(self):
+        if not self.enabled:
+            return
+        reason = self.unsupported_reason()
+        if reason is not None:
+            if not self._warned_unsupported:
+                self._warned_unsupported = True
+                logger.warning(f"Request profiling disabled: {reason}")
+            return
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        if self.authorized():
+            reason = "explicit"
+        elif self._sampled(route):
+            reason = "sampled"
+        else:
+            return
+        g._profile = (StackSampler(threading.get_ident()).start(), route, reason)
+
+    @contextmanager
+    def follow(self, thread_id: Optional[int], label: str) -> Iterator[None]:
+        """Also sample ``thread_id`` while the block runs, if the current request is being profiled"""
+        profile = g.get("_profile") if has_request_context() else None
+        sampler = profile[0] if profile is not None else None
+        if sampler is None or thread_id is None or thread_id in sampler.followed:
+            yield
+            return
+        sampler.followed[thread_id] = label
+        try:
+            yield
+        finally:
+            sampler.followed.pop(thread_id, None)
+
+    def _finish(self, sampler: StackSampler, route: str, method: str, reason: str,
+                profile_id: Optional[str] = None) -> str:
+        sampler.stop()
+        profile_id = self.store.save(route, method, sampler, reason, profile_id)
+        self.profiled += 1
+        return profile_id
+
+    def _after_request(self, response: Response) -> Response:
+        profile = g.pop("_profile", None)
+        if profile is None:
+            return response
+        sampler, route, reason = profile
+        if response.is_streamed:
+            # The body is generated after this hook returns; keep sampling until the server closes it
+            profile_id = self.store.new_id(route, request.method, reason)
+            method = request.method
+            response.call_on_close(lambda: self._finish(sampler, route, method, reason, profile_id))
+            if reason == "explicit":
+                response.headers["X-Profile-Id"] = profile_id
+            return response
+        profile_id = self._finish(sampler, route, request.method, reason)
+        if reason == "explicit":
+            response.headers["X-Profile-Id"] = profile_id
+            response.headers["X-Profile-Samples"] = str(sampler.samples)
+        return response
+
+    def _teardown_request(self, exc):
+        # after_request is skipped when a response could not be built; never leave a sampler running
+        profile = g.pop("_profile", None)
+        if profile is not None:
+            profile[0].stop()
+
+    def _require_token(self):
+        if not self.authorized():
+            abort(403)
+
+    def init_app(self, app: Flask):
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+
+        @app.route("/api/runtime/profiles", methods=["GET"])
+        def runtime_profiles():
+            """Stored request profiles, newest first (requires the profiler token)"""
+            self._require_token()
+            unsupported = self.unsupported_reason()
+            return jsonify({"success": True, "enabled": self.enabled and unsupported is None,
+                            "unsupported": unsupported, "profiled": self.profiled, "profiles": self.store.list()})
+
+        @app.route("/api/runtime/profiles/<profile_id>", methods=["GET"])
+        def runtime_profile(profile_id):
+            """One profile in folded-stack format, ready for flamegraph.pl or speedscope"""
+            self._require_token()
+            folded = self.store.read(profile_id)
+            if folded is None:
+                return jsonify({"success": False, "error": "profile_not_found"}), 404
+            return Response(folded, mimetype="text/plain")
+
+
+request_profiler = RequestProfiler()
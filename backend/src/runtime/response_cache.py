@@ -0,0 +1,172 @@
+"""
+Pre-serialized response cache with strong ETags for mostly-static GET routes.
+
+The first GET of a decorated route renders it normally; the serialized body
+is stored together with a SHA-256 based strong ETag. Later requests are
+answered from the stored bytes, and ``If-None-Match`` hits get a bodiless
+304. Entries carry tags so code that mutates an underlying registry can
+invalidate exactly the responses built from it.
+
+Only the query arguments a route declares (``args``) go into the cache key, so
+arbitrary query strings cannot fan one route out into many entries, and the
+store is an LRU bounded by ``max_entries``. Every tag (route names count as
+tags) has a generation bumped by ``invalidate``; a render that overlapped an
+invalidation of one of its tags is served but not stored.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from flask import Response, make_response, request
+
+MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+
+
+class _Entry:
+    __slots__ = ("body", "etag", "status", "mimetype", "tags", "created", "hits")
+
+    def __init__(self, body: bytes, etag: str, status: int, mimetype: str, tags: Iterable[str]):
+        self.body = body
+        self.etag = etag
+        self.status = status
+        self.mimetype = mimetype
+        self.tags = frozenset(tags)
+        self.created = time.time()
+        self.hits = 0
+
+
+class ResponseCache:
+    def __init__(self, max_age: int = 0, max_entries: int = MAX_ENTRIES):
+        self.max_age = max_age
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self.stale_renders = 0
+        # tag -> invalidation count; None counts invalidate-everything calls
+        self._generations: Dict[Optional[str], int] = {}
+
+    def _generation(self, tags: Iterable[str]) -> tuple:
+        return (self._generations.get(None, 0),) + tuple(self._generations.get(tag, 0) for tag in tags)
+
+    @staticmethod
+    def _request_key(name: str, args: Iterable[str]) -> str:
+        query = "&".join(
+            f"{k}={v}" for k in args for v in sorted(request.args.getlist(k))
+        )
+        return f"{name}?{query}" if query else name
+
+    def _respond(self, entry: _Entry) -> Response:
+        if request.if_none_match.contains(entry.etag):
+            resp = Response(status=304)
+            with self._lock:
+                self.not_modified += 1
+        else:
+            resp = Response(entry.body, status=entry.status, mimetype=entry.mimetype)
+        resp.set_etag(entry.etag)
+        # Cached routes are invalidated explicitly, so clients revalidate every time by default (a 304 is cheap)
+        if self.max_age > 0:
+            resp.headers["Cache-Control"] = f"public, max-age={self.max_age}, must-revalidate"
+        else:
+            resp.headers["Cache-Control"] = "no-cache"
+        return resp
+
+    def cached(self, name: str, tags: Iterable[str] = (), args: Iterable[str] = ()) -> Callable:
+        """Decorator caching the serialized GET response of a view under ``name``
+
+        ``args`` names the query arguments the view reads; any others are
+        ignored and share the same entry.
+        """
+        tags = tuple(tags)
+        key_args = tuple(sorted(args))
+
+        def decorator(view: Callable) -> Callable:
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if request.method not in ("GET", "HEAD"):
+                    return view(*args, **kwargs)
+                key = self._request_key(name, key_args)
+                if kwargs:
+                    key += "|" + "|".join(f"{k}={v}" for k, v in sorted(kwargs.items()))
+                entry_tags = (name,) + tags
+                with self._lock:
+                    entry = self._entries.get(key)
+                    if entry is not None:
+                        self._entries.move_to_end(key)
+                        self.hits += 1
+                        entry.hits += 1
+                    generation = self._generation(entry_tags)
+                if entry is not None:
+                    return self._respond(entry)
+
+                resp = make_response(view(*args, **kwargs))
+                with self._lock:
+                    self.misses += 1
+                # Only successful, non-streaming responses are worth keeping
+                if resp.status_code != 200 or resp.is_streamed:
+                    return resp
+                body = resp.get_data()
+                etag = hashlib.sha256(body).hexdigest()[:32]
+                entry = _Entry(body, etag, resp.status_code, resp.mimetype, entry_tags)
+                with self._lock:
+                    if self._generation(entry_tags) != generation:
+                        # Invalidated while rendering: this body may predate the change
+                        self.stale_renders += 1
+                        return self._respond(entry)
+                    self._entries[key] = entry
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                        self.evictions += 1
+                return self._respond(entry)
+
+            wrapper.cache_name = name
+            return wrapper
+
+        return decorator
+
+    def invalidate(self, name: Optional[str] = None, tag: Optional[str] = None) -> int:
+        """Drop entries for a route name and/or tag; with no arguments drop everything"""
+        with self._lock:
+            for bumped in ({None} if name is None and tag is None else {name, tag} - {None}):
+                self._generations[bumped] = self._generations.get(bumped, 0) + 1
+            if name is None and tag is None:
+                dropped = list(self._entries)
+            else:
+                dropped = [
+                    key for key, entry in self._entries.items()
+                    if (name is not None and name in entry.tags) or (tag is not None and tag in entry.tags)
+                ]
+            for key in dropped:
+                del self._entries[key]
+            self.invalidations += len(dropped)
+            return len(dropped)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": sum(len(e.body) for e in self._entries.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+                "stale_renders": self.stale_renders,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "per_entry": {key: {"hits": e.hits, "etag": e.etag, "bytes": len(e.body)} for key, e in self._entries.items()},
+            }
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,296 @@
+"""
+Bounded session stores for ``active_sessions``.
+
+Both backends behave like a dict of ``session_id -> JSON-serializable dict``
+but are bounded by entry count and idle time:
+
+- ``MemorySessionStore``: per-process LRU with a sliding TTL.
+- ``SqliteSessionStore``: a WAL-mode sqlite file shared by every worker on the
+  host, so a session created by one gunicorn worker is visible to the others.
+
+``create_session_store()`` picks the backend from ``SESSION_STORE``
+(``memory`` or ``sqlite``). Run this module directly to benchmark both
+backends at 100k sessions.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, Optional
+
+SESSION_MAX_ENTRIES = int(os.getenv("SESSION_MAX_ENTRIES", "10000"))
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", "86400"))
+SESSION_DB_PATH = os.getenv("SESSION_DB_PATH", "/tmp/soulphya-sessions.db")
+
+_MISSING = object()
+
+
+class SessionStore:
+    """Dict-like interface shared by the session backends"""
+
+    backend = "abstract"
+
+    def __init__(self, max_entries: int = SESSION_MAX_ENTRIES, ttl_seconds: float = SESSION_TTL_SECONDS):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evicted_capacity = 0
+        self.evicted_expired = 0
+
+    def get(self, session_id: str, default: Any = None) -> Any:
+        raise NotImplementedError
+
+    def set(self, session_id: str, data: Dict[str, Any]):
+        raise NotImplementedError
+
+    def delete(self, session_id: str) -> bool:
+        raise NotImplementedError
+
+    def purge_expired(self) -> int:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __getitem__(self, session_id: str) -> Any:
+        value = self.get(session_id, _MISSING)
+        if value is _MISSING:
+            raise KeyError(session_id)
+        return value
+
+    def __setitem__(self, session_id: str, data: Dict[str, Any]):
+        self.set(session_id, data)
+
+    def __delitem__(self, session_id: str):
+        if not self.delete(session_id):
+            raise KeyError(session_id)
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id, _MISSING) is not _MISSING
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        size = len(self)
+        return {
+            "backend": self.backend,
+            "entries": size,
+            "max_entries": self.max_entries,
+            "occupancy": round(size / self.max_entries, 4),
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "writes": self.writes,
+            "evicted_capacity": self.evicted_capacity,
+            "evicted_expired": self.evicted_expired,
+        }
+
+
+class MemorySessionStore(SessionStore):
+    """In-process LRU bounded by ``max_entries`` with a sliding idle TTL"""
+
+    backend = "memory"
+
+    def __init__(self, max_entries: int = SESSION_MAX_ENTRIES, ttl_seconds: float = SESSION_TTL_SECONDS):
+        super().__init__(max_entries, ttl_seconds)
+        # session_id -> (expires_at, data); ordered least- to most-recently used
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                self.misses += 1
+                return default
+            if entry[0] <= now:
+                del self._entries[session_id]
+                self.evicted_expired += 1
+                self.misses += 1
+                return default
+            self._entries[session_id] = (now + self.ttl_seconds, entry[1])
+            self._entries.move_to_end(session_id)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, session_id: str, data: Dict[str, Any]):
+        with self._lock:
+            self._entries[session_id] = (time.monotonic() + self.ttl_seconds, data)
+            self._entries.move_to_end(session_id)
+            self.writes += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evicted_capacity += 1
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._entries.pop(session_id, None) is not None
+
+    def purge_expired(self) -> int:
+        """Drop every expired session without waiting for it to be looked up"""
+        now = time.monotonic()
+        with self._lock:
+            expired = [sid for sid, (expires_at, _) in self._entries.items() if expires_at <= now]
+            for sid in expired:
+                del self._entries[sid]
+            dropped = len(expired)
+            self.evicted_expired += dropped
+        return dropped
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._entries))
+
+
+class SqliteSessionStore(SessionStore):
+    """Host-wide session store in a WAL-mode sqlite file, readable from every worker.
+
+    Reads touch ``expires_at`` so the TTL slides like the memory backend; the
+    capacity bound is enforced every ``trim_interval`` writes by dropping the
+    least-recently-used rows.
+    """
+
+    backend = "sqlite"
+
+    _SCHEMA = [
+        "CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires_at)",
+    ]
+
+    def __init__(self, path: str = SESSION_DB_PATH, max_entries: int = SESSION_MAX_ENTRIES,
+                 ttl_seconds: float = SESSION_TTL_SECONDS, trim_interval: Optional[int] = None):
+        super().__init__(max_entries, ttl_seconds)
+        self.path = path
+        self.trim_interval = trim_interval or max(1, min(256, self.max_entries // 100))
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes_since_trim = 0
+        conn = self._conn()
+        for stmt in self._SCHEMA:
+            conn.execute(stmt)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, attr: str, n: int = 1):
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + n)
+
+    def get(self, session_id: str, default: Any = None) -> Any:
+        now = time.time()
+        conn = self._conn()
+        row = conn.execute("SELECT data, expires_at FROM sessions WHERE id=?", (session_id,)).fetchone()
+        if row is None or row[1] <= now:
+            if row is not None:
+                conn.execute("DELETE FROM sessions WHERE id=? AND expires_at<=?", (session_id, now))
+                self._count("evicted_expired")
+            self._count("misses")
+            return default
+        conn.execute("UPDATE sessions SET expires_at=? WHERE id=?", (now + self.ttl_seconds, session_id))
+        self._count("hits")
+        return json.loads(row[0])
+
+    def set(self, session_id: str, data: Dict[str, Any]):
+        self._conn().execute("REPLACE INTO sessions (id, data, expires_at) VALUES (?,?,?)",
+                             (session_id, json.dumps(data, default=str), time.time() + self.ttl_seconds))
+        with self._lock:
+            self.writes += 1
+            self._writes_since_trim += 1
+            trim = self._writes_since_trim >= self.trim_interval
+            if trim:
+                self._writes_since_trim = 0
+        if trim:
+            self.trim()
+
+    def delete(self, session_id: str) -> bool:
+        return self._conn().execute("DELETE FROM sessions WHERE id=?", (session_id,)).rowcount > 0
+
+    def purge_expired(self) -> int:
+        dropped = self._conn().execute("DELETE FROM sessions WHERE expires_at<=?", (time.time(),)).rowcount
+        self._count("evicted_expired", dropped)
+        return dropped
+
+    def trim(self) -> int:
+        """Purge expired rows, then drop least-recently-used rows above ``max_entries``"""
+        dropped = self.purge_expired()
+        excess = len(self) - self.max_entries
+        if excess > 0:
+            removed = self._conn().execute(
+                "DELETE FROM sessions WHERE id IN (SELECT id FROM sessions ORDER BY expires_at LIMIT ?)", (excess,)
+            ).rowcount
+            self._count("evicted_capacity", removed)
+            dropped += removed
+        return dropped
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([r[0] for r in self._conn().execute("SELECT id FROM sessions")])
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats["path"] = self.path
+        return stats
+
+
+def create_session_store(backend: Optional[str] = None) -> SessionStore:
+    """Build the configured session store (``SESSION_STORE`` env, default ``memory``)"""
+    backend = (backend or os.getenv("SESSION_STORE", "memory")).lower()
+    if backend == "sqlite":
+        return SqliteSessionStore()
+    if backend == "memory":
+        return MemorySessionStore()
+    raise ValueError(f"unknown session store backend: {backend}")
+
+
+def benchmark(store: SessionStore, sessions: int = 100_000) -> Dict[str, Any]:
+    """Insert ``sessions`` sessions and read them back, reporting throughput and memory"""
+    import tracemalloc
+
+    payload = {"created_at": "2025-01-01T00:00:00", "files": {}, "consciousness_level": 0.87}
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(sessions):
+        store[f"session-{i}"] = dict(payload)
+    insert_s = time.perf_counter() - start
+    start = time.perf_counter()
+    found = sum(1 for i in range(0, sessions, 10) if f"session-{i}" in store)
+    lookup_s = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "backend": store.backend,
+        "sessions": sessions,
+        "insert_per_s": round(sessions / insert_s),
+        "lookup_per_s": round((sessions // 10) / lookup_s),
+        "lookup_found": found,
+        "peak_python_mb": round(peak / 1_048_576, 1),
+        "stats": store.stats(),
+    }
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        for store in (MemorySessionStore(max_entries=count // 2),
+                      SqliteSessionStore(os.path.join(tmp, "sessions.db"), max_entries=count // 2)):
+            print(json.dumps(benchmark(store, count), indent=2))
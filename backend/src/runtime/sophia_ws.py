@@ -0,0 +1,121 @@
+"""
+Dedicated process for the Sophia realtime websocket server.
+
+Under gunicorn every worker imports ``app``, so starting ``SacredSophiaServer``
+from the app would make every worker try to bind port 8765. In production the
+server runs exactly once instead, in its own process:
+
+- ``SOPHIA_WS_MODE=process`` (gunicorn default): the gunicorn master spawns
+  ``python -m src.runtime.sophia_ws`` on start and stops it on exit.
+- ``SOPHIA_WS_MODE=external``: the process is run separately, e.g. as its own
+  container, and scaled independently of the HTTP workers.
+- ``SOPHIA_WS_MODE=thread`` (``python app.py`` default): the old in-process
+  daemon thread, for local development.
+
+The websocket process publishes its connection stats to a small JSON file
+(``SOPHIA_WS_STATS_PATH``) every ``SOPHIA_WS_STATS_INTERVAL`` seconds, so any
+HTTP worker can report them from ``/api/sophia/websocket-info``.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SOPHIA_WS_HOST = os.getenv("SOPHIA_WS_HOST", "0.0.0.0")
+SOPHIA_WS_PORT = int(os.getenv("SOPHIA_WS_PORT", "8765"))
+STATS_PATH = os.getenv("SOPHIA_WS_STATS_PATH", "/tmp/soulphya-sophia-ws.json")
+STATS_INTERVAL = float(os.getenv("SOPHIA_WS_STATS_INTERVAL", "2.0"))
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def ws_mode(default: str = "thread") -> str:
+    return os.getenv("SOPHIA_WS_MODE", default).lower()
+
+
+def server_stats(server) -> Dict[str, Any]:
+    return {
+        "pid": os.getpid(),
+        "host": server.host,
+        "port": server.port,
+        "is_running": server.is_running,
+        "active_connections": len(server.active_connections),
+        "consciousness_level": server.consciousness_level,
+        "updated_at": time.time(),
+    }
+
+
+def write_stats(stats: Dict[str, Any], path: str = STATS_PATH):
+    """Atomically replace the stats file so readers never see a partial write"""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(stats, f)
+    os.replace(tmp, path)
+
+
+def read_stats(path: str = STATS_PATH, max_age: float = STATS_INTERVAL * 3) -> Optional[Dict[str, Any]]:
+    """Stats published by the websocket process, with ``stale`` set if it stopped publishing"""
+    try:
+        with open(path) as f:
+            stats = json.load(f)
+    except (OSError, ValueError):
+        return None
+    stats["age_seconds"] = round(time.time() - stats.get("updated_at", 0), 3)
+    stats["stale"] = stats["age_seconds"] > max_age
+    return stats
+
+
+async def _publish_stats(server, path: str, interval: float):
+    while True:
+        try:
+            write_stats(server_stats(server), path)
+        except OSError as e:
+            logger.warning(f"Could not publish Sophia websocket stats to {path}: {e}")
+        await asyncio.sleep(interval)
+
+
+async def serve(host: str = SOPHIA_WS_HOST, port: int = SOPHIA_WS_PORT,
+                stats_path: str = STATS_PATH, interval: float = STATS_INTERVAL):
+    from sophia_realtime_engine import SacredSophiaServer
+
+    server = SacredSophiaServer(host=host, port=port)
+    publisher = asyncio.create_task(_publish_stats(server, stats_path, interval))
+    try:
+        await server.start_divine_server()
+    finally:
+        publisher.cancel()
+        server.is_running = False
+        write_stats(server_stats(server), stats_path)
+
+
+def spawn() -> subprocess.Popen:
+    """Start the websocket server as a child process (used by the gunicorn master)"""
+    logger.info(f"Spawning dedicated Sophia websocket process on {SOPHIA_WS_HOST}:{SOPHIA_WS_PORT}")
+    return subprocess.Popen([sys.executable, "-m", "src.runtime.sophia_ws"], cwd=_BACKEND_DIR)
+
+
+def stop(proc: Optional[subprocess.Popen], timeout: float = 10.0):
+    if proc is None or proc.poll() is not None:
+        return
+    proc.terminate()
+    try:
+        proc.wait(timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if _BACKEND_DIR not in sys.path:
+        sys.path.insert(0, _BACKEND_DIR)
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,85 @@
+"""
+Startup-time profiler for the Flask backend.
+
+Imports the app in a fresh interpreter with ``-X importtime`` and reports the
+per-module import cost, so cold-start regressions show up before they reach
+Cloud Run. Used by ``python app.py --profile-startup``.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "1000"))
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Parse ``-X importtime`` output into [{module, self_us, cumulative_us, depth}]"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        raw_name = parts[2].rstrip()
+        stripped = raw_name.lstrip()
+        modules.append({
+            "module": stripped,
+            "self_us": int(parts[0]),
+            "cumulative_us": int(parts[1]),
+            "depth": (len(raw_name) - len(stripped) - 1) // 2,
+        })
+    return modules
+
+
+def profile_startup(target: str = "app", cwd: str = None, top: int = 25) -> Dict[str, Any]:
+    """Import ``target`` in a subprocess and summarise where the time goes"""
+    cwd = cwd or os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=cwd, capture_output=True, text=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    modules = parse_importtime(proc.stderr)
+    top_level = [m for m in modules if m["depth"] == 0]
+    import_ms = sum(m["cumulative_us"] for m in top_level) / 1000
+    return {
+        "target": target,
+        "ok": proc.returncode == 0,
+        "error": proc.stderr.strip().splitlines()[-1] if proc.returncode != 0 and proc.stderr.strip() else None,
+        "wall_ms": round(wall_ms, 1),
+        "import_ms": round(import_ms, 1),
+        "budget_ms": STARTUP_BUDGET_MS,
+        "within_budget": proc.returncode == 0 and import_ms <= STARTUP_BUDGET_MS,
+        "modules_imported": len(modules),
+        "slowest_cumulative": sorted(top_level, key=lambda m: m["cumulative_us"], reverse=True)[:top],
+        "slowest_self": sorted(modules, key=lambda m: m["self_us"], reverse=True)[:top],
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"Startup profile for '{report['target']}'",
+        f"  imports: {report['import_ms']:.1f} ms across {report['modules_imported']} modules "
+        f"(wall {report['wall_ms']:.1f} ms, budget {report['budget_ms']:.0f} ms) "
+        f"-> {'OK' if report['within_budget'] else 'OVER BUDGET'}",
+    ]
+    if report["error"]:
+        lines.append(f"  import failed: {report['error']}")
+    lines.append("  slowest top-level imports (cumulative):")
+    for m in report["slowest_cumulative"]:
+        lines.append(f"    {m['cumulative_us'] / 1000:9.1f} ms  {m['module']}")
+    lines.append("  slowest modules (self):")
+    for m in report["slowest_self"]:
+        lines.append(f"    {m['self_us'] / 1000:9.1f} ms  {m['module']}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    result = profile_startup(sys.argv[1] if len(sys.argv) > 1 else "app")
+    print(format_report(result))
+    sys.exit(0 if result["within_budget"] else 1)
@@ -0,0 +1,114 @@
+"""
+Server-Sent Events helpers for opt-in streaming responses.
+
+Routes that normally return one JSON document can also stream when the client
+sends ``Accept: text/event-stream``: ``chunk`` events carry the text as it is
+produced, trailing events carry data that is only known at the end (resonance
+snapshot, metrics), and a final ``done`` event closes the stream. An exception
+raised mid-stream is reported as an ``error`` event rather than a broken
+connection.
+"""
+
+import json
+import logging
+import os
+import time
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+from flask import Response, request, stream_with_context
+
+logger = logging.getLogger(__name__)
+
+EVENT_STREAM = "text/event-stream"
+STREAM_CHUNK_CHARS = int(os.getenv("STREAM_CHUNK_CHARS", "256"))
+
+
+def wants_event_stream() -> bool:
+    """True if the client explicitly prefers text/event-stream over JSON"""
+    accept = request.accept_mimetypes
+    return accept.best_match(["application/json", EVENT_STREAM]) == EVENT_STREAM and accept[EVENT_STREAM] > 0
+
+
+def sse_event(event: str, data: Any, event_id: Optional[str] = None) -> str:
+    """Serialize one SSE frame; ``data`` is JSON-encoded on a single line"""
+    frame = f"event: {event}\n"
+    if event_id is not None:
+        frame += f"id: {event_id}\n"
+    return frame + f"data: {json.dumps(data, default=str)}\n\n"
+
+
+def iter_text_chunks(text: str, max_chars: int = STREAM_CHUNK_CHARS) -> Iterator[str]:
+    """Split already-generated text into chunks, preferring line and word boundaries"""
+    while len(text) > max_chars:
+        cut = text.rfind("\n", 0, max_chars) + 1 or text.rfind(" ", 0, max_chars) + 1 or max_chars
+        yield text[:cut]
+        text = text[cut:]
+    if text:
+        yield text
+
+
+def event_stream(chunks: Iterable[str], trailer: Optional[Callable[[str], Iterable[Tuple[str, Any]]]] = None,
+                 chunk_field: str = "text") -> Response:
+    """Stream ``chunks`` as SSE ``chunk`` events followed by trailing events.
+
+    ``trailer`` is called once every chunk has been sent and returns an
+    iterable of ``(event, data)`` pairs; it receives the full text. A
+    ``metrics`` event with time-to-first-chunk and totals always goes last,
+    just before ``done``.
+    """
+    def generate() -> Iterator[str]:
+        started = time.perf_counter()
+        first_chunk_ms = None
+        parts = []
+        seq = 0
+        try:
+            for chunk in chunks:
+                if first_chunk_ms is None:
+                    first_chunk_ms = (time.perf_counter() - started) * 1000
+                parts.append(chunk)
+                yield sse_event("chunk", {chunk_field: chunk, "index": seq}, event_id=str(seq))
+                seq += 1
+            if trailer is not None:
+                for event, data in trailer("".join(parts)) or ():
+                    yield sse_event(event, data)
+            yield sse_event("metrics", {
+                "chunks": seq,
+                "chars": sum(len(p) for p in parts),
+                "first_chunk_ms": round(first_chunk_ms, 3) if first_chunk_ms is not None else None,
+                "total_ms": round((time.perf_counter() - started) * 1000, 3),
+            })
+            yield sse_event("done", {"success": True})
+        except Exception as e:
+            logger.error(f"Streaming response failed after {seq} chunks: {e}")
+            yield sse_event("error", {"success": False, "error": str(e)})
+
+    resp = Response(stream_with_context(generate()), mimetype=EVENT_STREAM)
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.headers["X-Accel-Buffering"] = "no"  # keep nginx / Cloud Run proxies from buffering the stream
+    return resp
+
+
+
+NDJSON = "application/x-ndjson"
+
+
+def ndjson_stream(lines: Iterable[str]) -> Response:
+    """Stream already-serialized JSON objects, one per line, as they are produced.
+
+    An exception mid-stream ends the body with an ``{"error": ...}`` line
+    rather than a truncated one.
+    """
+    def generate() -> Iterator[str]:
+        count = 0
+        try:
+            for line in lines:
+                yield line + "\n"
+                count += 1
+        except Exception as e:
+            logger.error(f"NDJSON stream failed after {count} lines: {e}")
+            yield json.dumps({"success": False, "error": str(e)}) + "\n"
+
+    resp = Response(stream_with_context(generate()), mimetype=NDJSON)
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.headers["X-Accel-Buffering"] = "no"
+    return resp
@@ -0,0 +1,113 @@
+"""
+Lazy subsystem registry for the Flask backend.
+
+Optional feature families (sacred datasets, divine resonance, love-wisdom,
+bio-resonance, the Sophia websocket server) are registered here with a loader
+instead of being imported and constructed when ``app.py`` is imported. Each
+one is loaded on first use, or all at once through ``warmup()``.
+"""
+
+import importlib.util
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class Subsystem:
+    """A named feature family with a loader and the modules it depends on"""
+
+    def __init__(self, name: str, loader: Callable[[], Any], requires: Iterable[str] = (), description: str = ""):
+        self.name = name
+        self.loader = loader
+        self.requires = list(requires)
+        self.description = description
+        self.value: Any = _MISSING
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self.value is not _MISSING
+
+    def installed(self) -> bool:
+        """Cheap check that the required modules can be found, without importing them"""
+        for module in self.requires:
+            try:
+                if importlib.util.find_spec(module) is None:
+                    return False
+            except (ImportError, ValueError):
+                return False
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "description": self.description,
+            "loaded": self.loaded,
+            "installed": self.installed(),
+            "error": self.error,
+            "load_ms": round(self.load_seconds * 1000, 2) if self.load_seconds is not None else None,
+        }
+
+
+class SubsystemRegistry:
+    def __init__(self):
+        self._subsystems: Dict[str, Subsystem] = {}
+
+    def register(self, name: str, loader: Callable[[], Any], requires: Iterable[str] = (), description: str = ""):
+        self._subsystems[name] = Subsystem(name, loader, requires, description)
+
+    def names(self) -> List[str]:
+        return list(self._subsystems)
+
+    def get(self, name: str) -> Any:
+        """Return the loaded subsystem, loading it on first use; raises ImportError if unavailable"""
+        sub = self._subsystems[name]
+        if not sub.loaded:
+            with sub.lock:
+                if not sub.loaded and sub.error is None:
+                    start = time.perf_counter()
+                    try:
+                        sub.value = sub.loader()
+                        logger.info(f"Subsystem {name} loaded")
+                    except Exception as e:
+                        sub.error = str(e)
+                        logger.warning(f"Subsystem {name} not available: {e}")
+                    finally:
+                        sub.load_seconds = time.perf_counter() - start
+        if sub.error is not None:
+            raise ImportError(f"subsystem {name} not available: {sub.error}")
+        return sub.value
+
+    def peek(self, name: str) -> Any:
+        """Return the subsystem if it is already loaded, otherwise None (never loads)"""
+        sub = self._subsystems[name]
+        return sub.value if sub.loaded else None
+
+    def available(self, name: str) -> bool:
+        """True if the subsystem is loaded, or could be loaded, without importing anything"""
+        sub = self._subsystems[name]
+        if sub.error is not None:
+            return False
+        return sub.loaded or sub.installed()
+
+    def warmup(self, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Eagerly load the given subsystems (all by default) and report what happened"""
+        for name in names or self.names():
+            try:
+                self.get(name)
+            except ImportError:
+                pass
+        return self.report()
+
+    def report(self) -> Dict[str, Any]:
+        return {name: sub.to_dict() for name, sub in self._subsystems.items()}
+
+
+subsystems = SubsystemRegistry()
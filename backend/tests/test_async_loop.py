@@ -0,0 +1,37 @@
+import asyncio
+import pytest
+from src.runtime.async_loop import AsyncLoopRunner, AsyncCallTimeout, AsyncCallCancelled
+
+@pytest.fixture
+def runner():
+    r = AsyncLoopRunner(lag_probe_interval=0.01).start()
+    yield r
+    r.stop()
+
+def test_run_returns_result_on_shared_loop(runner):
+    """Coroutines from different calls run on the same long-lived loop"""
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    first = runner.run(current_loop())
+    second = runner.run(current_loop())
+    assert first is second
+    assert runner.stats()["completed"] == 2
+    assert runner.stats()["queue_depth"] == 0
+
+def test_run_times_out_and_cancels(runner):
+    """Per-call timeout cancels the coroutine"""
+    with pytest.raises(AsyncCallTimeout):
+        runner.run(asyncio.sleep(5), timeout=0.05)
+    assert runner.stats()["timeouts"] == 1
+
+def test_should_cancel_stops_waiting(runner):
+    """A disconnect check returning True cancels the call"""
+    with pytest.raises(AsyncCallCancelled):
+        runner.run(asyncio.sleep(5), timeout=5, should_cancel=lambda: True, poll_interval=0.01)
+
+def test_concurrent_calls_overlap(runner):
+    """Independent submissions run concurrently on the loop"""
+    futures = [runner.submit(asyncio.sleep(0.2, result=i)) for i in range(5)]
+    assert runner.stats()["queue_depth"] == 5
+    assert [f.result(1) for f in futures] == list(range(5))
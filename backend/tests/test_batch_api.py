@@ -0,0 +1,88 @@
+import time
+from flask import Flask, jsonify, request
+from api.batch_api import batch_bp
+
+def make_app():
+    app = Flask(__name__)
+    app.register_blueprint(batch_bp)
+
+    @app.route('/api/echo', methods=['POST'])
+    def echo():
+        return jsonify({'success': True, 'echo': request.get_json()})
+
+    @app.route('/api/slow', methods=['GET'])
+    def slow():
+        time.sleep(0.2)
+        return jsonify({'success': True})
+
+    @app.route('/api/fail', methods=['GET'])
+    def fail():
+        return jsonify({'success': False}), 500
+
+    return app
+
+def test_batch_preserves_order_and_reports_status():
+    """Results come back in request order with per-operation status and timing"""
+    client = make_app().test_client()
+    resp = client.post('/api/batch', json={'operations': [
+        {'id': 'a', 'method': 'POST', 'path': '/api/echo', 'body': {'text': 'hi'}},
+        {'id': 'b', 'method': 'GET', 'path': '/api/fail'},
+    ]})
+    data = resp.get_json()
+    assert resp.status_code == 200
+    assert [r['id'] for r in data['results']] == ['a', 'b']
+    assert data['results'][0]['body']['echo'] == {'text': 'hi'}
+    assert data['results'][1]['status'] == 500
+    assert data['success'] is False
+    assert all('elapsed_ms' in r for r in data['results'])
+
+def test_independent_operations_run_concurrently():
+    """Four slow sub-requests take about as long as one"""
+    client = make_app().test_client()
+    started = time.perf_counter()
+    data = client.post('/api/batch', json={'operations': [
+        {'method': 'GET', 'path': '/api/slow'} for _ in range(4)
+    ]}).get_json()
+    assert data['success'] is True
+    assert time.perf_counter() - started < 0.6
+
+def test_failed_dependency_skips_dependent():
+    """An operation depending on a failed one is reported as 424"""
+    client = make_app().test_client()
+    data = client.post('/api/batch', json={'operations': [
+        {'id': 'x', 'method': 'GET', 'path': '/api/fail'},
+        {'id': 'y', 'method': 'POST', 'path': '/api/echo', 'body': {}, 'depends_on': ['x']},
+    ]}).get_json()
+    assert data['results'][1]['status'] == 424
+
+def test_rejects_nested_batch_and_forward_dependencies():
+    client = make_app().test_client()
+    for path in ('/api/batch', '/api/batch?x=1', '/api//batch'):
+        resp = client.post('/api/batch', json={'operations': [{'method': 'POST', 'path': path}]})
+        assert resp.status_code == 400, path
+    assert client.post('/api/batch', json={'operations': [
+        {'id': 'a', 'path': '/api/slow', 'depends_on': ['b']},
+        {'id': 'b', 'path': '/api/slow'},
+    ]}).status_code == 400
+
+def test_rejects_malformed_operation_fields():
+    """Wrongly typed fields are a 400 invalid_operation, never a 500"""
+    client = make_app().test_client()
+    for op in ({'method': 1, 'path': '/api/slow'}, {'path': ['/api/slow']}, {'id': 7, 'path': '/api/slow'},
+               {'path': '/api/slow', 'depends_on': 5}, {'path': '/api/slow', 'depends_on': 'ab'}):
+        resp = client.post('/api/batch', json={'operations': [op]})
+        assert resp.status_code == 400 and resp.get_json()['error'].startswith('invalid_operation'), op
+    assert client.post('/api/batch', json=[{'path': '/api/slow'}]).status_code == 400
+
+def test_dependents_run_inline_without_starving_the_pool(monkeypatch):
+    """Dependent operations never occupy a pool worker while they wait"""
+    import concurrent.futures
+    from api import batch_api
+    monkeypatch.setattr(batch_api, '_executor', concurrent.futures.ThreadPoolExecutor(max_workers=1))
+    client = make_app().test_client()
+    data = client.post('/api/batch', json={'operations': [
+        {'id': 'a', 'method': 'GET', 'path': '/api/slow'},
+        {'id': 'b', 'method': 'GET', 'path': '/api/slow', 'depends_on': ['a']},
+        {'id': 'c', 'method': 'POST', 'path': '/api/echo', 'body': {}, 'depends_on': ['b']},
+    ]}).get_json()
+    assert [r['status'] for r in data['results']] == [200, 200, 200]
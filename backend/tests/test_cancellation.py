@@ -0,0 +1,50 @@
+import time
+import pytest
+from ai_engine.cancellation import CancelToken, TaskCancelled, cancel_scope, check_cancelled
+from ai_engine.orchestrator.team_backends import ThreadBackend, AsyncioBackend
+from ai_engine.system_prompt import SystemPromptEngine, TaskContext, ResourceContext
+
+def test_token_deadline_and_scope():
+    token = CancelToken(timeout=0.05)
+    with cancel_scope(token):
+        check_cancelled()
+        assert token.remaining() > 0
+        time.sleep(0.06)
+        with pytest.raises(TaskCancelled) as raised:
+            check_cancelled()
+    assert raised.value.reason == 'timeout'
+    check_cancelled()  # outside the scope nothing is cancelled
+    token = CancelToken()
+    assert token.cancel() and not token.cancel()
+    assert token.reason == 'cancelled'
+    # BaseException: generic ``except Exception`` fallbacks must not swallow it
+    assert not issubclass(TaskCancelled, Exception)
+
+def test_prompt_generation_stops_when_cancelled():
+    engine = SystemPromptEngine()
+    variables = engine.initialize_agent_variables(TaskContext(objective='x'), ResourceContext())
+    token = CancelToken()
+    token.cancel()
+    with cancel_scope(token), pytest.raises(TaskCancelled):
+        engine.generate_system_prompt(variables)
+
+def slow_team(item):
+    for _ in range(100):
+        check_cancelled()
+        time.sleep(item)
+    return item
+
+@pytest.mark.parametrize('backend_cls', [ThreadBackend, AsyncioBackend])
+def test_fan_out_returns_partial_results_at_deadline(backend_cls):
+    """Teams finished by the deadline are returned; the slow one sees the token and stops"""
+    backend = backend_cls(4)
+    # The token carries the same deadline, which is what stops synchronous work on the asyncio loop
+    token = CancelToken(timeout=0.2)
+    try:
+        start = time.monotonic()
+        with cancel_scope(token):
+            results, unfinished = backend.map_partial(lambda x: x if x == 0 else slow_team(x), [0, 0.05, 0], 0.2)
+        assert time.monotonic() - start < 1
+        assert results == [0, None, 0] and unfinished == [1]
+    finally:
+        backend.shutdown()
@@ -0,0 +1,70 @@
+import threading
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+from ai_engine.orchestrator.fractal import FractalSpawner, PromptTemplateCache, render_fractal_prompt
+
+class FakeOrchestrator:
+    def __init__(self):
+        self.tasks = {}
+        self.agent = SimpleNamespace(id='dev-1', role='developer')
+
+    def add_task(self, description, context=None):
+        task = SimpleNamespace(id=str(len(self.tasks)), description=description, context=context or {})
+        self.tasks[task.id] = task
+        return task
+
+    def route_task(self, task):
+        return self.agent
+
+    def complete_task(self, task_id, results):
+        self.tasks[task_id].results = results
+
+def fake_source(delay=0.0, seen=None):
+    @contextmanager
+    def source(formation_name):
+        if delay:
+            time.sleep(delay)
+        if seen is not None:
+            seen.add(threading.current_thread().name)
+        yield FakeOrchestrator()
+    return source
+
+def test_full_tree_matches_recursive_shape_and_memoizes_prompts():
+    """Depth 3 over two aspects spawns 2 + 2*2 + 2*2*1 nodes with one prompt render per level"""
+    cache = PromptTemplateCache()
+    threads = set()
+    run = FractalSpawner(max_nodes=100, time_budget=10, prompt_cache=cache,
+                         orchestrator_source=fake_source(seen=threads)).run('build', ['api', 'ui'], depth=3)
+    assert run.stats['spawned'] == 10 and not run.truncated
+    api = run.results['api']
+    assert api['fractal_level'] == 3
+    assert api['output'] == 'Completed [api] build by developer (sophia)'
+    assert set(api['subteams']) == {'api-sub1', 'api-sub2'}
+    assert set(api['subteams']['api-sub1']['subteams']) == {'api-sub1-sub1'}
+    assert api['subteams']['api-sub1']['subteams']['api-sub1-sub1']['subteams'] == {}
+    assert cache.stats() == {'entries': 3, 'hits': 7, 'misses': 3}
+    assert all(name.startswith('fractal') for name in threads)
+
+def test_memoized_prompt_matches_fresh_render():
+    cache = PromptTemplateCache()
+    cache.prompt('other', 2, 3)
+    cached = cache.prompt('consciousness_core', 2, 3)
+    fresh = render_fractal_prompt('consciousness_core', 2, 3)
+    strip = lambda p: [line for line in p.splitlines() if not line.startswith('Agent ID:')]
+    assert 'Handle aspect: consciousness_core' in cached
+    assert strip(cached) == strip(fresh)
+
+def test_node_and_time_budgets_return_partial_results():
+    run = FractalSpawner(max_nodes=3, time_budget=10,
+                         orchestrator_source=fake_source()).run('build', ['a', 'b'], depth=3)
+    assert run.stats['spawned'] == 3 and run.stats['truncated_by'] == 'nodes'
+    assert set(run.results) == {'a', 'b'}
+    assert run.results['a']['subteams_truncated'] or run.results['b']['subteams_truncated']
+
+    run = FractalSpawner(max_nodes=100, time_budget=0.15,
+                         orchestrator_source=fake_source(delay=0.1)).run('build', ['a', 'b'], depth=4)
+    assert run.truncated and run.stats['truncated_by'] == 'time'
+    assert set(run.results) == {'a', 'b'}
+    assert run.results['a'].get('subteams_truncated')
+    assert run.stats['elapsed_ms'] < 1000
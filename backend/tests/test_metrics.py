@@ -0,0 +1,50 @@
+import asyncio
+from flask import Flask, jsonify
+from src.runtime import metrics
+
+class Engine:
+    def analyze(self, text):
+        return {'len': len(text)}
+
+    async def oscillate(self):
+        return 'ok'
+
+def make_app():
+    app = Flask(__name__)
+    metrics.init_app(app)
+
+    @app.route('/api/items/<item_id>')
+    def item(item_id):
+        return jsonify({'id': item_id})
+
+    return app
+
+def test_route_histogram_uses_url_rule_labels():
+    """Latency is recorded per route template, not per concrete path"""
+    client = make_app().test_client()
+    client.get('/api/items/1')
+    client.get('/api/items/2')
+    body = client.get('/metrics').get_data(as_text=True)
+    assert 'soulphya_http_request_duration_seconds_count{method="GET",route="/api/items/<item_id>",status="200"} 2.0' in body
+    assert 'soulphya_http_requests_in_flight{route="/api/items/<item_id>"} 0.0' in body
+
+def test_instrument_times_sync_and_async_calls():
+    """Wrapped engine methods still return their results and are observed"""
+    metrics.instrument(Engine, 'analyze', 'test.analyze')
+    metrics.instrument(Engine, 'oscillate', 'test.oscillate')
+    metrics.instrument(Engine, 'analyze', 'test.analyze')  # idempotent
+    engine = Engine()
+    assert engine.analyze('abc') == {'len': 3}
+    assert asyncio.run(engine.oscillate()) == 'ok'
+    body = make_app().test_client().get('/metrics').get_data(as_text=True)
+    assert 'soulphya_engine_call_duration_seconds_count{call="test.analyze"} 1.0' in body
+    assert 'soulphya_engine_call_duration_seconds_count{call="test.oscillate"} 1.0' in body
+
+def test_socket_events_and_gauge_sources():
+    """Socket handlers are counted and gauge sources are sampled on scrape"""
+    handler = metrics.socket_event('test_event')(lambda data: data)
+    assert handler({'x': 1}) == {'x': 1}
+    metrics.gauge_source('test_tasks', lambda: 7)
+    body = make_app().test_client().get('/metrics').get_data(as_text=True)
+    assert 'soulphya_socketio_events_total{event="test_event"} 1.0' in body
+    assert 'soulphya_state{name="test_tasks"} 7.0' in body
@@ -0,0 +1,31 @@
+import pytest
+from ai_engine.orchestrator import formations
+from ai_engine.orchestrator.pool import OrchestratorPool
+from ai_engine.orchestrator.schemas import TeamFormation
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setitem(formations.FORMATION_REGISTRY, 'Empty', lambda: TeamFormation('Empty', 'test', []))
+    return OrchestratorPool('Empty', size=2)
+
+def test_reset_clears_engine_state_and_nothing_is_shared(pool):
+    with pool.checkout() as orch:
+        orch.divine_engine.set_divine_intent('heal the build')
+        orch.divine_engine.oscillation_history.append({'amplitude': 1.0})
+        orch.love_wisdom_bridge.love_memories.append('memory')
+        with pool.checkout() as other:
+            assert other.divine_engine is not orch.divine_engine
+            assert other.love_wisdom_bridge is not orch.love_wisdom_bridge
+    with pool.checkout() as reused:
+        assert reused is orch
+        assert reused.divine_engine.oscillation_history == [] and reused.divine_engine.divine_intent_signal is None
+        assert reused.divine_engine.resonance_state.divine_alignment == 0.0
+        assert reused.love_wisdom_bridge.love_memories == []
+
+def test_orchestrator_is_discarded_when_its_call_did_not_complete(pool):
+    with pytest.raises(TimeoutError):
+        with pool.checkout() as abandoned:
+            raise TimeoutError('async call exceeded 1.00s')
+    assert pool.stats()['discarded'] == 1
+    with pool.checkout() as orch, pool.checkout() as other:
+        assert abandoned not in (orch, other)
@@ -0,0 +1,26 @@
+import time
+from src.runtime import production, sophia_ws
+
+def test_worker_sizing_by_class(monkeypatch):
+    """Async workers get one per CPU; sync/gthread follow 2 * CPUs + 1, capped"""
+    monkeypatch.delenv('WEB_CONCURRENCY', raising=False)
+    assert production.recommended_workers('gevent', cpus=4)['workers'] == 4
+    assert production.recommended_workers('sync', cpus=4)['workers'] == 9
+    assert production.recommended_workers('gthread', cpus=16, max_workers=8) == {'workers': 8, 'threads': 4}
+    monkeypatch.setenv('WEB_CONCURRENCY', '3')
+    assert production.recommended_workers('sync', cpus=4)['workers'] == 3
+
+def test_available_cpus_is_positive():
+    assert production.available_cpus() >= 1
+
+def test_websocket_stats_round_trip_and_staleness(tmp_path):
+    """Stats written by the websocket process are readable by any worker and age out"""
+    path = str(tmp_path / 'ws.json')
+    assert sophia_ws.read_stats(path) is None
+    sophia_ws.write_stats({'pid': 42, 'is_running': True, 'active_connections': 3,
+                           'updated_at': time.time()}, path)
+    stats = sophia_ws.read_stats(path, max_age=5)
+    assert stats['active_connections'] == 3 and not stats['stale']
+    sophia_ws.write_stats({'pid': 42, 'is_running': True, 'active_connections': 3,
+                           'updated_at': time.time() - 60}, path)
+    assert sophia_ws.read_stats(path, max_age=5)['stale']
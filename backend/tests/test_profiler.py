@@ -0,0 +1,101 @@
+import time
+from flask import Flask, jsonify
+from src.runtime.profiler import ProfileStore, RequestProfiler
+
+def make_app(tmp_path, token='s3cret', sample_every=0, max_files=50):
+    app = Flask(__name__)
+    profiler = RequestProfiler(token=token, sample_every=sample_every,
+                               store=ProfileStore(str(tmp_path), max_files=max_files))
+    profiler.init_app(app)
+
+    def slow_part():
+        time.sleep(0.05)
+
+    @app.route('/api/slow')
+    def slow():
+        slow_part()
+        return jsonify({'ok': True})
+
+    return app, profiler
+
+def test_explicit_profile_requires_token(tmp_path):
+    """Only requests carrying the configured token are profiled"""
+    app, profiler = make_app(tmp_path)
+    client = app.test_client()
+    assert 'X-Profile-Id' not in client.get('/api/slow', headers={'X-Profile': 'wrong'}).headers
+    resp = client.get('/api/slow', headers={'X-Profile': 's3cret'})
+    profile_id = resp.headers['X-Profile-Id']
+    assert int(resp.headers['X-Profile-Samples']) > 0
+
+    assert client.get(f'/api/runtime/profiles/{profile_id}').status_code == 403
+    folded = client.get(f'/api/runtime/profiles/{profile_id}?__profile=s3cret').get_data(as_text=True)
+    line = folded.splitlines()[0]
+    stack, count = line.rsplit(' ', 1)
+    assert int(count) > 0
+    assert any('slow_part' in frame for frame in stack.split(';'))
+
+def test_sampling_mode_profiles_one_in_n_and_rotates(tmp_path):
+    """Every N-th request per route is stored; old files rotate out"""
+    app, profiler = make_app(tmp_path, token='', sample_every=2, max_files=2)
+    client = app.test_client()
+    for _ in range(6):
+        client.get('/api/slow')
+    assert profiler.profiled == 3
+    assert len(list(tmp_path.glob('*.folded'))) == 2
+
+def test_disabled_profiler_is_inert(tmp_path):
+    """No token and no sampling means nothing is profiled or stored"""
+    app, profiler = make_app(tmp_path, token='', sample_every=0)
+    resp = app.test_client().get('/api/slow', headers={'X-Profile': ''})
+    assert 'X-Profile-Id' not in resp.headers
+    assert profiler.profiled == 0 and not list(tmp_path.iterdir())
+
+def test_followed_loop_thread_and_streamed_body_are_sampled(tmp_path):
+    """Work run on the async loop and inside a streamed body both show up in the profile"""
+    from flask import Response
+    from src.runtime.async_loop import AsyncLoopRunner
+    app, profiler = make_app(tmp_path)
+    runner = AsyncLoopRunner(name='test-loop', lag_probe_interval=0).start()
+
+    async def on_the_loop():
+        time.sleep(0.05)
+
+    @app.route('/api/async')
+    def run_on_loop():
+        with profiler.follow(runner.thread_id, runner.name):
+            runner.run(on_the_loop(), timeout=5)
+        return jsonify({'ok': True})
+
+    def generate_body():
+        time.sleep(0.05)
+        yield 'done'
+
+    @app.route('/api/stream')
+    def stream():
+        return Response(generate_body())
+
+    client = app.test_client()
+    try:
+        profile_id = client.get('/api/async', headers={'X-Profile': 's3cret'}).headers['X-Profile-Id']
+    finally:
+        runner.stop()
+    folded = (tmp_path / f'{profile_id}.folded').read_text()
+    assert any(line.startswith('[test-loop];') and 'on_the_loop' in line for line in folded.splitlines())
+
+    resp = client.get('/api/stream', headers={'X-Profile': 's3cret'})
+    profile_id = resp.headers['X-Profile-Id']
+    assert resp.get_data(as_text=True) == 'done'
+    resp.close()
+    assert 'generate_body' in (tmp_path / f'{profile_id}.folded').read_text()
+
+def test_profiling_refuses_to_run_under_gevent(tmp_path, monkeypatch):
+    """Greenlet ids never appear in sys._current_frames, so no empty profiles are written"""
+    import sys, types
+    monkey = types.SimpleNamespace(is_module_patched=lambda name: name == 'threading')
+    monkeypatch.setitem(sys.modules, 'gevent.monkey', monkey)
+    app, profiler = make_app(tmp_path)
+    client = app.test_client()
+    assert 'X-Profile-Id' not in client.get('/api/slow', headers={'X-Profile': 's3cret'}).headers
+    listing = client.get('/api/runtime/profiles?__profile=s3cret').get_json()
+    assert listing['enabled'] is False and 'gevent' in listing['unsupported']
+    assert profiler.profiled == 0 and not list(tmp_path.iterdir())
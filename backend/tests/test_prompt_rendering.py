@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+from ai_engine.orchestrator.orchestrator import MultiAgentOrchestrator
+from ai_engine.orchestrator.schemas import Task
+from ai_engine.system_prompt import SystemPromptEngine, TaskContext, ResourceContext
+
+def make_engine():
+    engine = SystemPromptEngine()
+    variables = engine.initialize_agent_variables(
+        TaskContext(objective='Ship it', constraints=['budget'], success_criteria=['tests pass']),
+        ResourceContext())
+    return engine, variables
+
+def test_incremental_render_matches_full_render():
+    engine, variables = make_engine()
+    first = engine.render_system_prompt(variables)
+    assert first == engine.generate_system_prompt(variables)
+    assert engine.render_system_prompt(dict(variables)) is first
+
+    variables['exploration_factor'] = 0.9
+    second = engine.render_system_prompt(variables)
+    assert second == engine.generate_system_prompt(variables)
+    stats = engine.render_stats()
+    # Only the reasoning section reads exploration_factor
+    assert stats['sections_rendered'] == 6 + 1
+    assert stats['prompts_built'] == 2 and stats['renders_saved'] == 1
+
+    variables['quantum_reasoning'] = 1  # equal to True, but renders differently
+    assert 'Quantum Reasoning: 1' in engine.render_system_prompt(variables)
+
+    variables['exploration_factor'] = 0.5
+    variables['quantum_reasoning'] = True
+    assert engine.render_system_prompt(variables) is first
+
+def test_context_change_rerenders_mission_section():
+    engine, variables = make_engine()
+    before = engine.render_system_prompt(variables)
+    engine.current_context.constraints = ['no downtime']
+    after = engine.render_system_prompt(variables)
+    assert '- no downtime' in after and after == engine.generate_system_prompt(variables)
+    assert engine.render_stats()['sections_rendered'] == 6 + 1
+    assert before != after
+
+def test_adapt_to_change_renders_once_and_shares_prompt():
+    engine, _ = make_engine()
+    agent = SimpleNamespace(id='a1', current_prompts={})
+    tasks = [Task(id=f't{i}', description='x', context={'system_prompt': 'old'}, assigned_to='a1')
+             for i in range(50)]
+    published = []
+    orch = SimpleNamespace(prompt_engine=engine, agents_by_id={'a1': agent}, pending_tasks=lambda: tasks,
+                           _publish=lambda event, task: published.append(task.id), last_adaptation=None)
+
+    MultiAgentOrchestrator.adapt_to_change(orch, 'complexity')
+    prompt = tasks[0].context['system_prompt']
+    assert prompt == engine.generate_system_prompt(engine.agent_variables)
+    assert all(t.context['system_prompt'] is prompt for t in tasks)
+    assert all(p is prompt for p in agent.current_prompts.values()) and len(agent.current_prompts) == 50
+    assert orch.last_adaptation['renders'] == 1 and orch.last_adaptation['renders_saved'] == 49
+    assert len(published) == 50
+
+    MultiAgentOrchestrator.adapt_to_change(orch, 'complexity')
+    assert orch.last_adaptation['sections_rendered'] <= 1
+
+def test_streamed_sections_concatenate_to_the_full_prompt():
+    engine, variables = make_engine()
+    harmony = engine.adaptive_harmony.assess_harmony_state({'dev': 0.9, 'qa': 0.3}, 0.5, {'cpu': 0.6})
+    for state in (None, harmony):
+        streamed = ''.join(engine.iter_system_prompt_sections(variables, state))
+        assert streamed == engine.generate_system_prompt(variables, state) == engine.render_system_prompt(variables, state)
@@ -0,0 +1,98 @@
+from flask import Flask, jsonify
+from src.runtime.response_cache import ResponseCache
+
+def make_app():
+    app = Flask(__name__)
+    cache = ResponseCache()
+    calls = {'n': 0}
+
+    @app.route('/registry')
+    @cache.cached('registry', tags=['formations'])
+    def registry():
+        calls['n'] += 1
+        return jsonify({'formations': ['SoloDeveloper'], 'build': calls['n']})
+
+    return app, cache, calls
+
+def test_second_get_served_from_cache_with_strong_etag():
+    """Body is rendered once and replayed byte-for-byte"""
+    app, cache, calls = make_app()
+    client = app.test_client()
+
+    first = client.get('/registry')
+    second = client.get('/registry')
+    assert first.status_code == 200
+    assert first.data == second.data
+    assert calls['n'] == 1
+    etag, weak = first.get_etag()
+    assert etag and not weak
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+    # Invalidation is explicit, so clients must revalidate rather than reuse a copy for max-age
+    assert first.headers['Cache-Control'] == 'no-cache'
+
+def test_if_none_match_returns_304():
+    """Conditional GET with the current ETag gets an empty 304"""
+    app, cache, _ = make_app()
+    client = app.test_client()
+    etag = client.get('/registry').headers['ETag']
+
+    resp = client.get('/registry', headers={'If-None-Match': etag})
+    assert resp.status_code == 304
+    assert resp.data == b''
+    assert cache.stats()['not_modified'] == 1
+
+def test_invalidate_by_tag_rebuilds():
+    """Explicit invalidation forces a fresh render and a new ETag"""
+    app, cache, calls = make_app()
+    client = app.test_client()
+    etag = client.get('/registry').headers['ETag']
+
+    assert cache.invalidate(tag='formations') == 1
+    resp = client.get('/registry', headers={'If-None-Match': etag})
+    assert resp.status_code == 200
+    assert calls['n'] == 2
+    assert resp.headers['ETag'] != etag
+
+def test_undeclared_query_args_share_one_entry_and_store_is_bounded():
+    """Query strings a route ignores cannot grow the cache; declared args are keyed, LRU-capped"""
+    app = Flask(__name__)
+    cache = ResponseCache(max_entries=2)
+
+    @app.route('/registry')
+    @cache.cached('registry')
+    def registry():
+        return jsonify({'ok': True})
+
+    @app.route('/page')
+    @cache.cached('page', args=['n'])
+    def page():
+        from flask import request
+        return jsonify({'n': request.args.get('n')})
+
+    client = app.test_client()
+    for i in range(5):
+        client.get(f'/registry?bust={i}')
+    assert cache.stats()['entries'] == 1 and cache.stats()['hits'] == 4
+    assert client.get('/page?n=1&bust=x').get_json() == {'n': '1'}
+    assert client.get('/page?n=2').get_json() == {'n': '2'}
+    stats = cache.stats()
+    assert stats['entries'] == 2 and stats['evictions'] == 1 and 'registry' not in stats['per_entry']
+
+def test_render_overlapping_an_invalidation_is_not_stored():
+    """A body built before a mid-render invalidation is served once but never cached"""
+    app = Flask(__name__)
+    cache = ResponseCache()
+    state = {'value': 1}
+
+    @app.route('/dimensions')
+    @cache.cached('dimensions', tags=['resonance'])
+    def dimensions():
+        body = jsonify({'value': state['value']})
+        state['value'] += 1
+        cache.invalidate(tag='resonance')  # a concurrent pulse landing mid-render
+        return body
+
+    client = app.test_client()
+    assert client.get('/dimensions').get_json() == {'value': 1}
+    assert cache.stats()['entries'] == 0 and cache.stats()['stale_renders'] == 1
+    assert client.get('/dimensions').get_json() == {'value': 2}
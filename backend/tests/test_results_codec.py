@@ -0,0 +1,58 @@
+import json
+import pytest
+from ai_engine.orchestrator import results_codec, storage
+from ai_engine.orchestrator.results_codec import ResultsCodec
+from ai_engine.orchestrator.schemas import Task
+
+PROMPT = 'You are a backend engineer. ' * 40
+
+def sample(i):
+    return {'agent_output': f'output {i} ' * 50, 'system_prompt': PROMPT, 'agent': 'agent-backend-1',
+            'team': ['agent-backend-1', 'agent-qa-2', 'agent-backend-1'], 'metrics': {'score': 0.5, 'n': i, 'ok': True}}
+
+SERIALIZERS = [results_codec.SERIALIZER_JSON] + ([results_codec.SERIALIZER_MSGPACK] if results_codec.msgpack else [])
+
+@pytest.mark.parametrize('serializer', SERIALIZERS)
+def test_round_trip_interns_repeated_long_strings(serializer):
+    codec = ResultsCodec(serializer=serializer, compression=results_codec.COMPRESSION_ZLIB)
+    table = {}
+    first, shared = codec.encode(sample(1))
+    assert shared == {}  # first sighting stays inline
+    second, shared = codec.encode(sample(2))
+    assert list(shared.values()) == [PROMPT]
+    table.update(shared)
+    assert first[0] == results_codec.FORMAT_VERSION and first[1] >> 2 == results_codec.COMPRESSION_ZLIB
+    assert len(second) < len(json.dumps(sample(2)).encode()) / 3
+
+    reader = ResultsCodec()
+    assert reader.decode(first, table.__getitem__) == sample(1)
+    decoded = [reader.decode(second, table.__getitem__) for _ in range(2)]
+    assert decoded[0] == sample(2)
+    assert decoded[0]['system_prompt'] is decoded[1]['system_prompt']
+    assert decoded[0]['team'][0] is decoded[0]['team'][2]
+
+def test_unknown_version_is_rejected():
+    blob, _ = ResultsCodec().encode({'a': 1})
+    with pytest.raises(ValueError):
+        ResultsCodec().decode(bytes([99]) + blob[1:], {}.__getitem__)
+
+def test_storage_stores_shared_prompt_once_and_reads_legacy_json(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, '_DB_PATH', str(tmp_path / 'orchestrator.db'))
+    storage.init_db()
+    tasks = [Task(id=f't{i}', description='x', results=sample(i)) for i in range(5)]
+    storage.save_tasks_bulk(tasks, 'Squad')
+    storage.save_tasks([('legacy', 'Squad', 'old row', None, 'completed', '{"agent_output": "plain"}')])
+    conn = storage._conn()
+    assert conn.execute("SELECT COUNT(*) FROM result_strings").fetchone()[0] == 1
+    assert conn.execute("SELECT COUNT(*) FROM tasks WHERE results_blob IS NOT NULL").fetchone()[0] == 5
+    loaded = {row['id']: row['results'] for row in storage.load_tasks('Squad')}
+    assert loaded['t3'] == sample(3) and loaded['legacy'] == {'agent_output': 'plain'}
+    line = json.loads(next(t for t in storage.query_tasks('Squad') if t.id == 't4').to_json())
+    assert line['results'] == sample(4)
+
+def test_ints_beyond_64_bits_round_trip():
+    """msgpack cannot hold them, so such a value is written with the JSON serializer"""
+    value = {'n': 2 ** 70, 'neg': -2 ** 64, 'ok': [1, True]}
+    blob, _ = ResultsCodec().encode(value)
+    assert blob[1] & 0b11 == results_codec.SERIALIZER_JSON
+    assert ResultsCodec().decode(blob, {}.__getitem__) == value
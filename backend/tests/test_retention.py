@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+from ai_engine.orchestrator import retention, storage
+from ai_engine.orchestrator.orchestrator import MultiAgentOrchestrator
+from ai_engine.orchestrator.persistence import TaskWriter
+from ai_engine.orchestrator.registry import TaskRegistry
+from ai_engine.orchestrator.retention import RetentionManager, RetentionPolicy
+from ai_engine.orchestrator.routing import LoadAwareRouter
+from ai_engine.orchestrator.schemas import Task
+
+def make_orchestrator(writer=None):
+    agent = SimpleNamespace(id='dev', role='backend_engineer', current_prompts={})
+    fake = SimpleNamespace(formation=SimpleNamespace(name='Squad', agents=[agent]), tasks=TaskRegistry(),
+                           router=LoadAwareRouter([agent]))
+    fake.evict_tasks = lambda ids: MultiAgentOrchestrator.evict_tasks(fake, ids)
+    if writer is not None:
+        fake.tasks.on_change = lambda task: writer.enqueue('Squad', task)
+    for i in range(6):
+        task = Task(id=f't{i}', description=f'task {i}')
+        fake.tasks[task.id] = task
+        fake.router.route(task)
+        task.assigned_to = 'dev'
+        agent.current_prompts[task.id] = 'prompt'
+        task.status = 'completed' if i < 4 else 'running'
+    return fake, agent
+
+def test_policy_selects_by_status_count_and_age():
+    fake, _ = make_orchestrator()
+    by_count = RetentionPolicy(max_age=None, max_tasks=1, statuses=('completed',))
+    assert [t.id for t in by_count.select(fake.tasks)] == ['t0', 't1', 't2']
+    assert RetentionPolicy(max_age=3600, max_tasks=None).select(fake.tasks) == []
+    policy = RetentionPolicy.from_dict({'max_tasks': 0, 'statuses': 'completed,error'}, by_count)
+    assert policy.max_tasks is None and policy.statuses == ('completed', 'error')
+
+def test_archives_then_evicts_tasks_and_prompt_references(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, '_DB_PATH', str(tmp_path / 'orchestrator.db'))
+    storage.init_db()
+    writer = TaskWriter(flush_interval=60)
+    monkeypatch.setattr(retention, 'persistence_enabled', lambda: True)
+    monkeypatch.setattr(retention, 'get_task_writer', lambda: writer)
+    fake, agent = make_orchestrator(writer)
+    # A finished row from last year that was never loaded into memory
+    storage._conn().execute("INSERT INTO tasks (id, formation, description, status, results_json, created_at) "
+                            "VALUES ('old', 'Squad', 'old task', 'completed', '{}', '2024-03-05 10:00:00')")
+
+    evicted = fake.tasks['t0']
+    manager = RetentionManager(interval=0, policies={'Squad': RetentionPolicy(max_age=86400, max_tasks=1)})
+    report = manager.run([fake])
+
+    assert report['formations'][0]['archived'] == 4 and report['evicted'] == 3
+    assert report['rss_before'] is not None and 'rss_reclaimed' in report
+    assert sorted(fake.tasks.keys()) == ['t3', 't4', 't5']
+    assert sorted(agent.current_prompts) == ['t3', 't4', 't5']
+    assert fake.router.explain('t0') is None and fake.router.stats()['open_tasks'] == 3
+    assert [t.id for t in fake.tasks.for_agent('dev')] == ['t3', 't4', 't5']
+    assert {r['id'] for r in storage.load_tasks('Squad')} == {'t3', 't4', 't5'}
+
+    partitions = {p['partition']: p['rows'] for p in storage.archive_partitions()}
+    assert partitions.pop('tasks_archive_2024_03') == 1 and sum(partitions.values()) == 3
+    assert {t.id for t in storage.archived_tasks('Squad')} == {'old', 't0', 't1', 't2'}
+    # Evicted tasks no longer report changes, so nothing writes their rows back
+    evicted.status = 'error'
+    assert writer.flush() == 0 and len(storage.load_tasks('Squad')) == 3
+
+    assert storage.drop_archive_partitions(keep=1) == ['tasks_archive_2024_03']
+    assert manager.stats()['archived'] == 4
+    writer.close()
+
+def test_in_flight_statuses_and_executor_owned_tasks_are_never_evicted(monkeypatch):
+    import pytest
+    with pytest.raises(ValueError):
+        RetentionPolicy.from_dict({'statuses': ['running']})
+    with pytest.raises(ValueError):
+        RetentionPolicy.from_dict({'statuses': 'queued,completed'})
+
+    fake, _ = make_orchestrator()
+    owned = SimpleNamespace(owns=lambda task_id: task_id == 't0')
+    monkeypatch.setitem(retention.EXECUTORS, 'Squad', owned)
+    monkeypatch.setattr(retention, 'persistence_enabled', lambda: False)
+    report = RetentionManager(interval=0, policies={'Squad': RetentionPolicy(max_age=None, max_tasks=0)}).apply(fake)
+    assert report['evicted'] == 3 and sorted(fake.tasks.keys()) == ['t0', 't4', 't5']
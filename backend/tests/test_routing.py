@@ -0,0 +1,53 @@
+import random
+from types import SimpleNamespace
+from ai_engine.orchestrator.routing import LoadAwareRouter
+
+AGENTS = [
+    SimpleNamespace(id='lead_architect', role='architect'),
+    SimpleNamespace(id='backend_dev', role='backend_engineer'),
+    SimpleNamespace(id='frontend_dev', role='frontend_engineer'),
+    SimpleNamespace(id='qa_agent', role='quality_assurance'),
+    SimpleNamespace(id='doc_agent', role='documentation'),
+]
+
+def task(i, description='Ship the feature'):
+    return SimpleNamespace(id=f't{i}', description=description)
+
+def test_power_of_two_choices_spreads_unfinished_work():
+    """With nothing completing, queue depths stay level instead of piling onto one agent"""
+    router = LoadAwareRouter(AGENTS, rng=random.Random(7))
+    for i in range(100):
+        router.route(task(i))
+    depths = [a['queue_depth'] for a in router.stats()['agents']]
+    assert sum(depths) == 100
+    assert max(depths) - min(depths) <= 4
+
+def test_role_affinity_and_decision_is_explained():
+    router = LoadAwareRouter(AGENTS, rng=random.Random(1))
+    agent, decision = router.route(task(1, 'Optimize the backend query path'))
+    assert agent.id == 'backend_dev'
+    assert decision['role_affinity'] and decision['candidates'] == ['backend_dev']
+    assert 'only capable agent' in decision['reason']
+
+    agent, decision = router.route(task(2, 'Polish the frontend and backend engineer handoff'))
+    assert set(decision['candidates']) == {'backend_dev', 'frontend_dev'}
+    # backend_dev already holds t1, so the idle frontend agent wins
+    assert agent.id == 'frontend_dev'
+    assert 'backend_dev (queue 1)' in decision['reason']
+    assert router.explain('t2') == decision
+
+def test_outcomes_feed_latency_and_success():
+    pair = AGENTS[1:3]
+    router = LoadAwareRouter(pair, rng=random.Random(3))
+    for i in range(4):
+        router.record(task(i), 'backend_dev', 'round_robin')
+        router.finished(f't{i}', ok=False)
+    router.finished('unknown')
+    loads = {a['agent']: a for a in router.stats()['agents']}
+    assert loads['backend_dev']['failed'] == 4 and loads['backend_dev']['queue_depth'] == 0
+    assert loads['backend_dev']['success_rate'] < 0.5
+    assert loads['backend_dev']['latency_ms'] is not None
+    for i in range(10, 15):
+        agent, decision = router.route(task(i, 'engineer work'), objective='quality')
+        router.finished(f't{i}')
+        assert agent.id == 'frontend_dev'
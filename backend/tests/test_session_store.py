@@ -0,0 +1,44 @@
+import time
+from src.runtime.session_store import MemorySessionStore, SqliteSessionStore
+
+def test_memory_store_evicts_least_recently_used():
+    """Capacity bound drops the LRU entry, and reads refresh recency"""
+    store = MemorySessionStore(max_entries=2, ttl_seconds=60)
+    store['a'] = {'n': 1}
+    store['b'] = {'n': 2}
+    assert store['a'] == {'n': 1}
+    store['c'] = {'n': 3}
+    assert 'b' not in store and 'a' in store and 'c' in store
+    stats = store.stats()
+    assert stats['evicted_capacity'] == 1
+    assert stats['entries'] == 2 and stats['occupancy'] == 1.0
+
+def test_memory_store_expires_idle_sessions():
+    """Sessions idle past the TTL are gone on lookup and on purge"""
+    store = MemorySessionStore(max_entries=10, ttl_seconds=0.01)
+    store['a'] = {}
+    store['b'] = {}
+    time.sleep(0.02)
+    assert store.get('a') is None
+    assert store.purge_expired() == 1
+    assert len(store) == 0
+    assert store.stats()['evicted_expired'] == 2
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    """Two store objects on one file (as two workers would) see the same sessions"""
+    path = str(tmp_path / 'sessions.db')
+    first = SqliteSessionStore(path, max_entries=100, ttl_seconds=60)
+    second = SqliteSessionStore(path, max_entries=100, ttl_seconds=60)
+    first['s1'] = {'files': {}, 'consciousness_level': 0.9}
+    assert second['s1'] == {'files': {}, 'consciousness_level': 0.9}
+    del second['s1']
+    assert 's1' not in first
+
+def test_sqlite_store_trims_to_capacity(tmp_path):
+    """Writes beyond max_entries drop the least recently used rows"""
+    store = SqliteSessionStore(str(tmp_path / 'sessions.db'), max_entries=5, ttl_seconds=60, trim_interval=1)
+    for i in range(8):
+        store[f's{i}'] = {'i': i}
+    assert len(store) == 5
+    assert 's0' not in store and 's7' in store
+    assert store.stats()['evicted_capacity'] == 3
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import pytest
+from ai_engine.orchestrator.sharding import HashRing, ShardRouter, ShardUnavailable, ShardCallError
+
+def make_shards(count, socket_dir):
+    """One router per simulated worker, each with its own registry, all in this process"""
+    routers = []
+    for index in range(count):
+        router = ShardRouter(shards=count, index=index, mode='unix', socket_dir=socket_dir, timeout=5)
+        registry = {}
+
+        @router.handler('create')
+        def create(name, registry=registry, index=index):
+            registry[name] = index
+            return {'owner': index}
+
+        @router.handler('get')
+        def get(name, registry=registry):
+            if name not in registry:
+                raise KeyError(name)
+            return registry[name]
+
+        @router.handler('names')
+        def names(registry=registry):
+            return sorted(registry)
+
+        routers.append(router)
+    return routers
+
+def test_ring_is_stable_and_moves_few_keys_when_a_shard_is_added():
+    keys = [f'formation-{i}' for i in range(2000)]
+    four, five = HashRing(4), HashRing(5)
+    owners = [four.owner(k) for k in keys]
+    assert owners == [HashRing(4).owner(k) for k in keys]
+    assert min(owners.count(s) for s in range(4)) > 2000 / 4 * 0.6
+    moved = sum(four.owner(k) != five.owner(k) for k in keys)
+    assert moved < 2000 * 0.35  # ~1/5 expected, not a reshuffle
+
+def test_local_mode_runs_in_process():
+    router = ShardRouter(shards=8, index=3, mode='local')
+    router.handler('echo')(lambda value: value)
+    assert router.shards == 1 and router.call('anything', 'echo', 42) == 42
+    assert router.stats()['local_calls'] == 1 and router.broadcast('echo', 1) == [1]
+
+def test_calls_are_forwarded_to_the_owning_worker():
+    socket_dir = tempfile.mkdtemp(prefix='shards-', dir='/tmp')
+    routers = make_shards(3, socket_dir)
+    for router in routers:
+        router.start()
+    try:
+        name = next(n for n in (f'squad-{i}' for i in range(100)) if routers[0].owner(n) == 2)
+        assert routers[0].call(name, 'create', name) == {'owner': 2}
+        # Visible from every worker, including the one that created it
+        assert [r.call(name, 'get', name) for r in routers] == [2, 2, 2]
+        assert sorted(n for names in routers[1].broadcast('names') for n in names) == [name]
+        with pytest.raises(ShardCallError, match='KeyError'):
+            routers[1].call(name, 'get', 'missing')
+        assert routers[0].stats()['forwarded_calls'] == 2
+        assert routers[2].stats()['served_calls'] >= 3
+
+        routers[2].stop()
+        with pytest.raises(ShardUnavailable):
+            routers[0].call(name, 'get', name)
+        assert len(routers[0].broadcast('names')) == 2
+    finally:
+        for router in routers:
+            router.stop()
+        for entry in os.listdir(socket_dir):
+            os.unlink(os.path.join(socket_dir, entry))
+        os.rmdir(socket_dir)
@@ -0,0 +1,58 @@
+import json
+from flask import Flask, jsonify
+from src.runtime.streaming import wants_event_stream, event_stream, iter_text_chunks
+
+def make_app(fail=False):
+    app = Flask(__name__)
+
+    @app.route('/chat', methods=['POST'])
+    def chat():
+        text = 'hello streaming world ' * 40
+        if not wants_event_stream():
+            return jsonify({'response': text})
+
+        def chunks():
+            yield from iter_text_chunks(text, 64)
+            if fail:
+                raise RuntimeError('engine went away')
+
+        def trailer(full):
+            yield 'resonance', {'chars': len(full)}
+
+        return event_stream(chunks(), trailer)
+
+    return app
+
+def parse_events(body):
+    events = []
+    for frame in body.decode().strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in frame.split('\n'))
+        events.append((fields['event'], json.loads(fields['data'])))
+    return events
+
+def test_json_remains_default():
+    """Without an explicit event-stream Accept header the route answers JSON"""
+    client = make_app().test_client()
+    resp = client.post('/chat', headers={'Accept': '*/*'})
+    assert resp.is_json
+
+def test_chunks_then_trailing_events():
+    """Chunks reassemble the full text; resonance, metrics and done trail it"""
+    client = make_app().test_client()
+    resp = client.post('/chat', headers={'Accept': 'text/event-stream'})
+    assert resp.mimetype == 'text/event-stream'
+    events = parse_events(resp.data)
+    names = [name for name, _ in events]
+    chunk_count = names.count('chunk')
+    assert chunk_count > 1
+    assert names[chunk_count:] == ['resonance', 'metrics', 'done']
+    text = ''.join(data['text'] for name, data in events if name == 'chunk')
+    assert text == 'hello streaming world ' * 40
+    assert events[chunk_count][1]['chars'] == len(text)
+    assert events[-2][1]['chunks'] == chunk_count
+
+def test_error_mid_stream_is_an_event():
+    """A failing generator ends the stream with an error event instead of a dropped connection"""
+    client = make_app(fail=True).test_client()
+    events = parse_events(client.post('/chat', headers={'Accept': 'text/event-stream'}).data)
+    assert events[-1] == ('error', {'success': False, 'error': 'engine went away'})
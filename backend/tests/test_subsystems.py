@@ -0,0 +1,58 @@
+import pytest
+from src.runtime.subsystems import SubsystemRegistry
+from src.runtime.startup_profile import parse_importtime
+
+def test_subsystem_loads_once_on_first_use():
+    """Loader runs lazily and only once"""
+    calls = []
+    registry = SubsystemRegistry()
+    registry.register('demo', lambda: calls.append(1) or 'engine', requires=['json'])
+
+    assert registry.peek('demo') is None
+    assert registry.available('demo') is True
+    assert calls == []
+    assert registry.get('demo') == 'engine'
+    assert registry.get('demo') == 'engine'
+    assert calls == [1]
+    assert registry.report()['demo']['loaded'] is True
+
+def test_missing_dependency_is_unavailable_without_import():
+    """Availability is checked with find_spec, failures surface as ImportError"""
+    registry = SubsystemRegistry()
+    registry.register('ghost', lambda: __import__('definitely_not_installed_mod'), requires=['definitely_not_installed_mod'])
+
+    assert registry.available('ghost') is False
+    with pytest.raises(ImportError):
+        registry.get('ghost')
+    report = registry.warmup()
+    assert report['ghost']['error']
+
+def test_parse_importtime():
+    """-X importtime lines are parsed with nesting depth"""
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        120 |   json.decoder",
+        "import time:       300 |        420 | json",
+    ])
+    modules = parse_importtime(stderr)
+    assert modules == [
+        {'module': 'json.decoder', 'self_us': 120, 'cumulative_us': 120, 'depth': 1},
+        {'module': 'json', 'self_us': 300, 'cumulative_us': 420, 'depth': 0},
+    ]
+
+def test_orchestrator_import_defers_engines_until_first_orchestrator():
+    """Importing the orchestrator module leaves the engine modules unimported; listeners run on first build"""
+    import os, subprocess, sys
+    code = "\n".join([
+        "import sys",
+        "from ai_engine.orchestrator import orchestrator",
+        "engines = ('ai_engine.divine_resonance.soul_frequency_engine', 'ai_engine.wisdom_integration.love_wisdom_bridge')",
+        "assert not any(m in sys.modules for m in engines)",
+        "seen = []",
+        "orchestrator.on_engines_loaded(seen.append)",
+        "orchestrator.MultiAgentOrchestrator(orchestrator.TeamFormation('Empty', 'test', []))",
+        "assert all(m in sys.modules for m in engines) and len(seen) == 1",
+    ])
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, '-c', code], cwd=backend, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,64 @@
+import threading
+import time
+from ai_engine.orchestrator.events import TaskEventBus
+from ai_engine.orchestrator.schemas import Task
+
+def collect(bus, **kwargs):
+    batches = []
+    subscription = bus.subscribe(lambda formation, batch: batches.append((formation, batch)), **kwargs)
+    return subscription, batches
+
+def test_burst_collapses_to_one_delta_per_task():
+    bus = TaskEventBus(window=60)
+    subscription, batches = collect(bus)
+    task = Task(id='t1', description='Build it')
+    for event, status in [('created', 'pending'), ('assigned', 'assigned'), ('queued', 'queued'),
+                          ('running', 'running'), ('completed', 'completed')]:
+        task.status = status
+        bus.publish(event, 'Squad', task)
+    task.results = {'ok': True}
+    bus.publish('created', 'Other', Task(id='t2', description='Elsewhere'))
+    subscription.close()
+    assert len(batches) == 2
+    formation, batch = next(b for b in batches if b[0] == 'Squad')
+    assert batch['seq'] == 1 and not batch['resync']
+    assert batch['deltas'] == [{'id': 't1', 'events': ['assigned', 'completed', 'created', 'queued', 'running'],
+                                'status': 'completed', 'assigned_to': None, 'description': 'Build it',
+                                'results': {'ok': True}}]
+    assert subscription.stats()['coalesced'] == 4
+
+def test_slow_consumer_skips_stale_states():
+    """While the sink is busy, later changes overwrite earlier ones instead of queueing"""
+    release = threading.Event()
+    batches = []
+
+    def sink(formation, batch):
+        batches.append(batch)
+        release.wait(2)
+
+    bus = TaskEventBus(window=0.01)
+    subscription = bus.subscribe(sink)
+    task = Task(id='t1', description='x')
+    bus.publish('created', 'Squad', task)
+    deadline = time.monotonic() + 2
+    while not batches and time.monotonic() < deadline:
+        time.sleep(0.005)
+    for status in ['queued', 'running', 'completed']:
+        task.status = status
+        bus.publish(status, 'Squad', task)
+    release.set()
+    subscription.close()
+    assert [b['seq'] for b in batches] == [1, 2]
+    assert [d['status'] for d in batches[1]['deltas']] == ['completed']
+    assert batches[1]['deltas'][0]['events'] == ['completed', 'queued', 'running']
+
+def test_overflow_sends_resync_and_formation_filter():
+    bus = TaskEventBus(window=60, max_pending=3)
+    subscription, batches = collect(bus, formations={'Squad'})
+    for i in range(5):
+        bus.publish('created', 'Squad', Task(id=f't{i}', description='x'))
+        bus.publish('created', 'Ignored', Task(id=f'i{i}', description='x'))
+    subscription.close()
+    assert batches == [('Squad', {'seq': 1, 'deltas': [], 'resync': True})]
+    assert subscription.stats()['dropped'] == 5
+    assert bus.stats()['subscriptions'] == []
@@ -0,0 +1,180 @@
+import threading
+import time
+from types import SimpleNamespace
+from ai_engine.orchestrator.executor import TaskExecutor, ExecutorSaturated
+from ai_engine.orchestrator.schemas import Task
+
+class FakeOrchestrator:
+    def __init__(self, name='Squad'):
+        self.formation = SimpleNamespace(name=name)
+        self.tasks = {}
+
+    def add(self, description):
+        task = Task(id=description, description=description)
+        self.tasks[task.id] = task
+        return task
+
+    def complete_task(self, task_id, results):
+        task = self.tasks[task_id]
+        task.results = results
+        task.status = 'completed'
+        return task
+
+    def fail_task(self, task_id, error):
+        task = self.tasks[task_id]
+        task.results = {'error': error}
+        task.status = 'error'
+        return task
+
+    def cancel_task(self, task_id, reason='cancelled'):
+        task = self.tasks[task_id]
+        task.results = {'error': reason}
+        task.status = reason
+        return task
+
+def test_tasks_complete_on_workers_and_wait_long_polls():
+    """Submitted tasks run off the caller thread and wait() returns once done"""
+    orch = FakeOrchestrator()
+    executor = TaskExecutor(orch, lambda o, t: {'echo': t.description, 'thread': threading.current_thread().name},
+                            workers=2, max_queue=10)
+    task = orch.add('hello')
+    executor.submit(task)
+    executor.wait(task, timeout=2)
+    assert task.status == 'completed'
+    assert task.results['echo'] == 'hello'
+    assert task.results['thread'].startswith('agent-worker-Squad')
+    executor.shutdown()
+
+def test_priority_order_and_backpressure():
+    """Higher priority runs first; a full queue refuses new reservations"""
+    gate = threading.Event()
+    order = []
+
+    def handler(o, t):
+        gate.wait(2)
+        order.append(t.id)
+        return {}
+
+    orch = FakeOrchestrator()
+    executor = TaskExecutor(orch, handler, workers=1, max_queue=3)
+    blocker = orch.add('blocker')
+    executor.submit(blocker)
+    executor.wait(blocker, 0.05)  # let the single worker pick up the blocker
+    low, high = orch.add('low'), orch.add('high')
+    executor.submit(low, priority=0)
+    executor.submit(high, priority=5)
+    executor.submit(orch.add('fill'))
+    assert not executor.try_reserve()
+    try:
+        executor.submit(orch.add('overflow'))
+        assert False, 'expected ExecutorSaturated'
+    except ExecutorSaturated:
+        pass
+    gate.set()
+    executor.shutdown()
+    assert order[:3] == ['blocker', 'high', 'low']
+    assert executor.stats()['rejected'] == 2
+
+def test_handler_errors_mark_task_and_notify_listeners():
+    """A failing handler sets status 'error' and emits queued/running/error events"""
+    events = []
+    orch = FakeOrchestrator()
+    executor = TaskExecutor(orch, lambda o, t: 1 / 0, workers=1, max_queue=5)
+    executor.add_listener(lambda event, formation, task: events.append((event, formation, task.id)))
+    task = orch.add('boom')
+    executor.submit(task)
+    executor.wait(task, 2)
+    executor.shutdown()
+    assert task.status == 'error' and 'division' in task.results['error']
+    assert events == [('queued', 'Squad', 'boom'), ('running', 'Squad', 'boom'), ('error', 'Squad', 'boom')]
+
+def test_deadline_releases_stuck_task_and_replaces_worker():
+    """A handler that never checks its token is timed out on schedule and its late result dropped"""
+    release = threading.Event()
+    ran = []
+
+    def handler(o, t):
+        ran.append(t.id)
+        if t.id == 'stuck':
+            release.wait(5)
+            return {'late': True}
+        return {'ok': True}
+
+    orch = FakeOrchestrator()
+    executor = TaskExecutor(orch, handler, workers=1, max_queue=5)
+    stuck, after = orch.add('stuck'), orch.add('after')
+    stuck.context = {'deadline': time.time() + 0.1}
+    executor.submit(stuck)
+    executor.submit(after)
+    start = time.monotonic()
+    executor.wait(stuck, 2)
+    assert stuck.status == 'timeout' and time.monotonic() - start < 1
+    executor.wait(after, 2)
+    assert after.status == 'completed'
+    release.set()
+    time.sleep(0.05)
+    assert stuck.status == 'timeout' and 'late' not in stuck.results
+    stats = executor.stats()
+    assert stats['timed_out'] == 1 and stats['abandoned'] == 1 and stats['live_workers'] == 1
+    executor.shutdown()
+
+def test_cancel_queued_and_cooperative_running_tasks():
+    from ai_engine.cancellation import check_cancelled
+    started = threading.Event()
+    calls = []
+
+    def handler(o, t):
+        calls.append(t.id)
+        started.set()
+        for _ in range(200):
+            check_cancelled()
+            time.sleep(0.01)
+        return {}
+
+    orch = FakeOrchestrator()
+    executor = TaskExecutor(orch, handler, workers=1, max_queue=5)
+    running, queued = orch.add('running'), orch.add('queued')
+    executor.submit(running)
+    executor.submit(queued)
+    started.wait(2)
+    assert executor.cancel(queued) and queued.status == 'cancelled'
+    assert executor.cancel(running) and running.status == 'cancelled'
+    assert not executor.cancel(running)
+    executor.shutdown()
+    assert calls == ['running']
+    assert executor.stats()['cancelled'] == 2
+
+def test_failing_settle_marks_task_error_and_keeps_worker_alive():
+    """An orchestrator callback that raises must not kill the worker or strand waiters"""
+    class BrokenOrchestrator(FakeOrchestrator):
+        def complete_task(self, task_id, results):
+            if task_id == 'poison':
+                raise KeyError(task_id)
+            return super().complete_task(task_id, results)
+
+    orch = BrokenOrchestrator()
+    executor = TaskExecutor(orch, lambda o, t: {}, workers=1, max_queue=10)
+    poison, healthy = orch.add('poison'), orch.add('healthy')
+    executor.submit(poison)
+    executor.submit(healthy)
+    executor.wait(poison, timeout=2)
+    executor.wait(healthy, timeout=2)
+    assert poison.status == 'error' and 'settling' in poison.results['error']
+    assert healthy.status == 'completed'
+    stats = executor.stats()
+    assert stats['live_workers'] == 1 and stats['failed'] == 1 and stats['completed'] == 1
+    executor.shutdown()
+
+def test_unparseable_deadline_does_not_leak_a_queue_slot():
+    """submit fails before taking ownership and gives the slot back"""
+    import pytest
+    orch = FakeOrchestrator()
+    executor = TaskExecutor(orch, lambda o, t: {}, workers=1, max_queue=1)
+    bad = orch.add('bad')
+    bad.context = {'deadline': 'soon'}
+    with pytest.raises(ValueError):
+        executor.submit(bad)
+    assert executor.try_reserve()
+    executor.release_reservation()
+    assert not executor.owns('bad')
+    executor.shutdown()
@@ -0,0 +1,108 @@
+import time
+from ai_engine.orchestrator import storage
+from ai_engine.orchestrator.persistence import TaskWriter, load_persisted_tasks
+from ai_engine.orchestrator.registry import TaskRegistry
+from ai_engine.orchestrator.schemas import Task
+
+def test_changes_are_coalesced_and_flushed_in_batches(tmp_path, monkeypatch):
+    """Registry changes reach sqlite on the background flush, one row per task"""
+    monkeypatch.setattr(storage, '_DB_PATH', str(tmp_path / 'orchestrator.db'))
+    storage.init_db()
+    writer = TaskWriter(flush_interval=0.01, batch_size=1000)
+    registry = TaskRegistry()
+    registry.on_change = lambda task: writer.enqueue('Squad', task)
+
+    task = Task(id='t1', description='build it')
+    registry['t1'] = task
+    task.assigned_to = 'dev'
+    task.results = {'agent_output': 'done'}
+    task.status = 'completed'
+    deadline = time.time() + 2
+    while writer.stats()['written'] == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    writer.close()
+
+    rows = storage.load_tasks('Squad')
+    assert rows == [{'id': 't1', 'description': 'build it', 'assigned_to': 'dev',
+                     'status': 'completed', 'results': {'agent_output': 'done'}}]
+    stats = writer.stats()
+    assert stats['enqueued'] == 3 and stats['errors'] == 0
+
+def test_failed_flush_keeps_tasks_dirty():
+    """A failing store keeps the batch for the next flush instead of dropping it"""
+    calls = []
+
+    def flaky_save(rows):
+        calls.append(len(rows))
+        if len(calls) == 1:
+            raise OSError('disk full')
+
+    writer = TaskWriter(flush_interval=60, save=flaky_save)
+    writer.enqueue('Squad', Task(id='a', description='a'))
+    assert writer.flush() == 0
+    assert writer.flush() == 1
+    assert calls == [1, 1] and writer.stats()['errors'] == 1
+    writer.close()
+
+def test_rehydration_marks_in_flight_work_interrupted(tmp_path, monkeypatch):
+    """Queued/running tasks from a previous process come back as interrupted"""
+    monkeypatch.setattr(storage, '_DB_PATH', str(tmp_path / 'orchestrator.db'))
+    storage.init_db()
+    storage.save_tasks([('a', 'Squad', 'first', None, 'completed', '{}'),
+                        ('b', 'Squad', 'second', 'dev', 'running', '{}')])
+    registry = TaskRegistry()
+    seen = []
+    registry.on_change = seen.append
+    registry.restore(load_persisted_tasks('Squad'))
+    assert [(t.id, t.status) for t in registry.values()] == [('a', 'completed'), ('b', 'interrupted')]
+    assert seen == []
+
+def test_bulk_save_and_reads_do_not_wait_for_an_open_write(tmp_path, monkeypatch):
+    """save_tasks_bulk writes in one transaction; readers see the last commit while a write is in progress"""
+    import threading
+    monkeypatch.setattr(storage, '_DB_PATH', str(tmp_path / 'orchestrator.db'))
+    storage.init_db()
+    assert storage.save_tasks_bulk([Task(id=f't{i}', description=f'task {i}') for i in range(100)], 'Squad') == 100
+
+    holding, release = threading.Event(), threading.Event()
+
+    def slow_writer():
+        with storage._WRITE_LOCK:
+            conn = storage._conn()
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("UPDATE tasks SET status='completed'")
+            holding.set()
+            release.wait(5)
+            conn.execute("COMMIT")
+
+    writer = threading.Thread(target=slow_writer)
+    writer.start()
+    holding.wait(2)
+    start = time.perf_counter()
+    rows = storage.load_tasks('Squad')
+    assert time.perf_counter() - start < 0.5
+    assert len(rows) == 100 and {r['status'] for r in rows} == {'pending'}
+    release.set()
+    writer.join()
+    assert {r['status'] for r in storage.load_tasks('Squad')} == {'completed'}
+
+def test_unwritable_row_is_quarantined_without_blocking_the_batch(tmp_path, monkeypatch):
+    """A row that cannot be encoded is dropped and counted; the rest of its batch is written"""
+    monkeypatch.setattr(storage, '_DB_PATH', str(tmp_path / 'orchestrator.db'))
+    storage.init_db()
+
+    def save(rows):
+        if any(row[0] == 'poison' for row in rows):
+            raise ValueError('cannot encode')
+        storage.save_tasks(rows)
+
+    writer = TaskWriter(flush_interval=60, save=save)
+    writer.enqueue('Squad', Task(id='poison', description='bad'))
+    writer.enqueue('Squad', Task(id='healthy', description='good'))
+    assert writer.flush() == 1
+    assert writer.flush() == 0
+    stats = writer.stats()
+    assert stats['written'] == 1 and stats['quarantined'] == 1 and stats['dirty'] == 0
+    assert stats['recent_quarantined'][0]['task_id'] == 'poison'
+    assert [row['id'] for row in storage.load_tasks('Squad')] == ['healthy']
+    writer.close()
@@ -0,0 +1,47 @@
+import json
+import pytest
+from ai_engine.orchestrator import storage
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, '_DB_PATH', str(tmp_path / 'orchestrator.db'))
+    storage.init_db()
+    rows = [(f't{i:03d}', 'Squad', f'task {i}', 'dev' if i % 2 else 'qa', 'completed' if i % 3 else 'error',
+             json.dumps({'n': i}), f'2025-01-01 00:{i // 10:02d}:00') for i in range(50)]
+    rows.append(('other', 'Other', 'elsewhere', 'dev', 'completed', '{}', '2025-01-01 00:00:00'))
+    conn = storage._conn()
+    conn.executemany("INSERT INTO tasks (id, formation, description, assigned_to, status, results_json, created_at) "
+                     "VALUES (?,?,?,?,?,?,?)", rows)
+    return storage
+
+def test_streams_in_keyset_order_across_batches(store):
+    ids = [t.id for t in store.query_tasks('Squad', batch_size=7)]
+    assert ids == [f't{i:03d}' for i in range(50)]
+
+def test_pages_resume_from_cursor_with_filters(store):
+    seen, cursor = [], None
+    while True:
+        page, cursor = store.page_tasks('Squad', cursor=cursor, limit=4, statuses=['completed'], agent_id='dev')
+        seen += [t.id for t in page]
+        if cursor is None:
+            break
+    assert seen == [f't{i:03d}' for i in range(50) if i % 2 and i % 3]
+
+def test_time_range_and_lazy_results(store):
+    tasks = list(store.query_tasks('Squad', since='2025-01-01T00:01:00', until='2025-01-01 00:02:00'))
+    assert [t.id for t in tasks] == [f't{i:03d}' for i in range(10, 20)]
+    task = tasks[0]
+    assert task._results is storage.StoredTask._UNDECODED
+    line = json.loads(task.to_json())
+    assert line['results'] == {'n': 10} and task._results is storage.StoredTask._UNDECODED
+    assert task.results == {'n': 10}
+    assert store.decode_cursor(line['cursor']) == ('2025-01-01 00:01:00', 't010')
+    with pytest.raises(ValueError):
+        store.decode_cursor('not-a-cursor')
+
+def test_out_of_range_bounds_raise_value_error():
+    """Bounds that overflow datetime are rejected like any other bad input (the history route maps it to 400)"""
+    assert storage.to_timestamp('0') == '1970-01-01 00:00:00'
+    for bad in ('1e20', 'inf', -1e300, 'nan', 'yesterday'):
+        with pytest.raises(ValueError):
+            storage.to_timestamp(bad)
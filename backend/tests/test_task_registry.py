@@ -0,0 +1,50 @@
+from ai_engine.orchestrator.registry import TaskRegistry
+from ai_engine.orchestrator.schemas import Task
+
+def make_registry(n):
+    registry = TaskRegistry()
+    for i in range(n):
+        registry[f't{i}'] = Task(id=f't{i}', description=f'task {i}')
+    return registry
+
+def test_indexes_follow_direct_status_and_agent_assignments():
+    """Mutating task attributes directly keeps status/agent indexes and counters in sync"""
+    registry = make_registry(5)
+    registry['t1'].assigned_to = 'dev'
+    registry['t1'].status = 'completed'
+    registry['t3'].assigned_to = 'dev'
+    assert [t.id for t in registry.with_status('pending')] == ['t0', 't2', 't3', 't4']
+    assert [t.id for t in registry.without_status('completed')] == ['t0', 't2', 't3', 't4']
+    assert [t.id for t in registry.for_agent('dev')] == ['t1', 't3']
+    counts = registry.counts()
+    assert counts['by_status'] == {'pending': 4, 'completed': 1}
+    assert counts['transitions'] == {'completed': 1}
+
+def test_cursor_pagination_with_filters():
+    """Pages are stable in creation order and filters combine"""
+    registry = make_registry(10)
+    for i in (2, 4, 6, 8):
+        registry[f't{i}'].status = 'completed'
+        registry[f't{i}'].assigned_to = 'dev' if i < 6 else 'ops'
+
+    page, cursor = registry.page(limit=4)
+    assert [t.id for t in page] == ['t0', 't1', 't2', 't3']
+    page, cursor = registry.page(cursor=cursor, limit=4)
+    assert [t.id for t in page] == ['t4', 't5', 't6', 't7']
+    page, cursor = registry.page(cursor=cursor, limit=4)
+    assert [t.id for t in page] == ['t8', 't9'] and cursor is None
+
+    page, cursor = registry.page(statuses=['completed'], limit=3)
+    assert [t.id for t in page] == ['t2', 't4', 't6'] and cursor is not None
+    page, _ = registry.page(statuses=['completed', 'pending'], agent_id='ops')
+    assert [t.id for t in page] == ['t6', 't8']
+
+def test_pop_and_clear_detach_tasks():
+    """Removed tasks leave every index and stop notifying the registry"""
+    registry = make_registry(3)
+    task = registry.pop('t1')
+    task.status = 'completed'
+    assert 't1' not in registry and len(registry) == 2
+    assert registry.counts()['by_status'] == {'pending': 2}
+    registry.clear()
+    assert len(registry) == 0 and registry.page() == ([], None)
@@ -0,0 +1,57 @@
+import pytest
+from ai_engine.orchestrator import storage
+from ai_engine.orchestrator.schemas import Task
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, '_DB_PATH', str(tmp_path / 'orchestrator.db'))
+    storage.init_db()
+    storage.save_tasks([
+        ('t1', 'Squad', 'Fix the login cache', 'dev', 'completed', {'agent_output': 'Cleared stale sessions'}),
+        ('t2', 'Squad', 'Write docs', 'dev', 'error', {'agent_output': 'The cache layer needs docs on caching'}),
+        ('t3', 'Other', 'Tune the cache eviction', 'qa', 'completed', {'agent_output': 'done'}),
+        ('t4', 'Squad', 'Deploy', 'dev', 'completed', '{"agent_output": "deployed to staging"}'),
+    ])
+    return storage
+
+def ids(hits):
+    return [hit['id'] for hit in hits]
+
+def test_ranked_filtered_search_with_snippets(store):
+    hits, next_offset = store.search_tasks('cache')
+    # Description matches outrank output matches; porter stemming matches "caching"
+    assert ids(hits)[2] == 't2' and set(ids(hits)) == {'t1', 't2', 't3'} and next_offset is None
+    assert '<mark>cache</mark>' in hits[0]['snippet']
+    assert ids(store.search_tasks('cache', formation='Squad', statuses=['completed'])[0]) == ['t1']
+    assert ids(store.search_tasks('staging')[0]) == ['t4']
+    assert ids(store.search_tasks('log*')[0]) == ['t1']
+    assert store.search_tasks('"unbalanced')[0] == []
+    with pytest.raises(ValueError):
+        store.search_tasks('"unbalanced', raw=True)
+
+def test_index_follows_writes_and_archival(store):
+    fts_rows = lambda: store._conn().execute("SELECT COUNT(*) FROM tasks_fts").fetchone()[0]
+    store.save_tasks([('t2', 'Squad', 'Write docs', 'dev', 'completed',
+                       {'agent_output': 'The cache layer needs docs on caching'})])
+    assert fts_rows() == 4 and ids(store.search_tasks('docs', statuses=['completed'])[0]) == ['t2']
+    store.save_task(Task(id='t1', description='Fix the login flow', status='completed',
+                         results={'agent_output': 'retried'}), 'Squad')
+    assert fts_rows() == 4 and 't1' not in ids(store.search_tasks('cache')[0])
+    assert ids(store.search_tasks('retried')[0]) == ['t1']
+    store.archive_tasks(['t3'])
+    assert fts_rows() == 3 and ids(store.search_tasks('eviction')[0]) == []
+
+def test_rank_window_pages_through_every_match(store, monkeypatch):
+    store.save_tasks([(f'bulk{i}', 'Squad', f'cache item {i}', 'dev', 'completed', {}) for i in range(30)])
+    monkeypatch.setattr(storage, 'SEARCH_RANK_WINDOW', 5)
+    seen, offset = [], 0
+    while offset is not None:
+        hits, offset = store.search_tasks('cache', limit=4, offset=offset)
+        seen += ids(hits)
+    assert len(seen) == len(set(seen)) == 33
+
+def test_existing_rows_are_indexed_when_the_index_is_created(store):
+    conn = store._conn()
+    conn.execute("DROP TABLE tasks_fts")
+    store.init_db()
+    assert ids(store.search_tasks('staging')[0]) == ['t4']
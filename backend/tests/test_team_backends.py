@@ -0,0 +1,49 @@
+import pickle
+import pytest
+from ai_engine.orchestrator.team_backends import (
+    TeamSpec, ThreadBackend, ProcessBackend, AsyncioBackend, get_backend, render_team_prompt
+)
+from ai_engine.system_prompt import TaskContext, ResourceContext
+
+def spec(aspect):
+    return TeamSpec(aspect, 'ClaudeDevSquad', 'Build the platform',
+                    TaskContext(objective=f'Handle {aspect}', complexity=0.64).to_dict(),
+                    ResourceContext(collaborative_agents=9).to_dict())
+
+def square(x):
+    if x < 0:
+        raise ValueError('negative')
+    return x * x
+
+async def async_square(x):
+    return x * x
+
+@pytest.mark.parametrize('backend_cls', [ThreadBackend, AsyncioBackend])
+def test_in_process_backends_keep_order_and_raise(backend_cls):
+    backend = backend_cls(2)
+    try:
+        assert backend.map(square, range(20)) == [x * x for x in range(20)]
+        if backend_cls is AsyncioBackend:
+            assert backend.map(async_square, [3, 4]) == [9, 16]
+        with pytest.raises(ValueError):
+            backend.map(square, [1, -1, 2])
+        assert backend.stats()['calls'] >= 2
+    finally:
+        backend.shutdown()
+
+def test_process_backend_runs_serialized_teams():
+    """Team specs and results cross the process boundary as plain data"""
+    specs = [spec(f'aspect-{i}') for i in range(6)]
+    assert pickle.loads(pickle.dumps(specs[0])) == specs[0]
+    backend = ProcessBackend(1)
+    try:
+        results = backend.map(render_team_prompt, specs)
+    finally:
+        backend.shutdown()
+    assert [r['aspect'] for r in results] == [s.aspect for s in specs]
+    assert results == [render_team_prompt(s) for s in specs]
+
+def test_shared_backends_are_reused():
+    assert get_backend('thread') is get_backend('THREAD')
+    with pytest.raises(ValueError):
+        get_backend('gpu')